@@ -1,6 +1,7 @@
 import math
 import random
 from global_var import GlobalVar
+from route import ReturnRoute
 
 def euclidean_distance(point1, point2):
     """
@@ -23,19 +24,23 @@ class Ant:
 
     Atributes:
         x, y: Coordenadas da formiga.
+        rng: Sequência de números aleatórios da formiga (RandomStream ou o módulo random).
+        id: Identificador da formiga (o da sua sequência aleatória; um filho que reaproveita a formiga recebe um novo).
         has_food: Se a está ou não carregando comida.
         exploring: Se está explorando ou não o ambiente.
-        food_return_route: Posições registradas durante o retorno para a colônia.
+        food_return_route: Posições registradas durante o retorno para a colônia (buffer compacto ReturnRoute).
         ag_speed: Velocidade da formiga(Atributo genético).
         ag_pheromone_detection_range: Alcance de detecção de feromônios (Atributo genético).
         ag_pheromone_strength: Força dos feromônios liberados pela formiga (Atributo genético).
         fitness_food_collected: Quantidade de comida coletada.
         fitness_steps_count: Quantidade de passos dados.
         fitness_score: Pontuação da formiga.
+        lod_tick: Último tick em que a formiga foi atualizada pelo agendador LOD (None = sem agendador).
 
     Methods:
         calculate_fitness(): Calcula o fitness da formiga usando quantidade de comida coletada e atributos genéticos.
         move(environment): Atualiza a posição da formiga.
+        move_aggregated(environment, ticks): Aplica vários ticks de caminhada aleatória em um passo (agendador LOD).
         direction_exploration(environment): Escolhe a direção de movimento durante a exploração.
         check_for_food(environment): Verifica se a formiga encontrou comida.
         deposit_food(environment): Deposita comida na colônia e libera feromônios no caminho.
@@ -43,27 +48,31 @@ class Ant:
         get_display_position(): Retorna a posição da formiga para exibição na tela.
         mutate(): Aplica mutações aleatórias nos atributos da formiga.
     """
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
         """
         Construtor da formiga.
 
         Parameters:
             x, y: Coordenadas da formiga
+            rng (opcional): Sequência de números aleatórios da formiga (padrão = módulo random).
         """
         self.x = x
         self.y = y
+        self.rng = rng if rng is not None else random
+        self.id = getattr(self.rng, "stream_id", 0)
         
         self.has_food = False
         self.exploring = True
-        self.food_return_route = []
+        self.food_return_route = ReturnRoute()
         
-        self.ag_speed = GlobalVar.ANT_INITIAL_SPEED + random.uniform(-0.5, 0.5)
-        self.ag_pheromone_detection_range = GlobalVar.ANT_INITIAL_PHEROMONE_SENSE + random.uniform(-10, 10)
-        self.ag_pheromone_strength = GlobalVar.ANT_INITIAL_PHEROMONE_STRENGTH + random.uniform(-0.2, 0.2)
+        self.ag_speed = GlobalVar.ANT_INITIAL_SPEED + self.rng.uniform(-0.5, 0.5)
+        self.ag_pheromone_detection_range = GlobalVar.ANT_INITIAL_PHEROMONE_SENSE + self.rng.uniform(-10, 10)
+        self.ag_pheromone_strength = GlobalVar.ANT_INITIAL_PHEROMONE_STRENGTH + self.rng.uniform(-0.2, 0.2)
         
         self.fitness_food_collected = 0
         self.fitness_steps_count = 0
         self.fitness_score = 0.1
+        self.lod_tick = None
     
     @property
     def position(self):
@@ -111,20 +120,29 @@ class Ant:
         
         # Retorna para a colônia ou explora
         if self.has_food:
-            dx = environment.colony.x - self.x
-            dy = environment.colony.y - self.y
-            self.food_return_route.append((self.x, self.y))
+            if environment.navigation is not None:
+                # Contorna os obstáculos pelo campo de navegação
+                dx, dy = environment.navigation.direction(self.position)
+            else:
+                dx = environment.colony.x - self.x
+                dy = environment.colony.y - self.y
+            self.food_return_route.append(self.x, self.y)
         else:
             dx, dy = self.direction_exploration(environment)
         
         # Normaliza e aplica o movimento
+        old_x, old_y = self.x, self.y
         norm = max(abs(dx), abs(dy), 1)
         self.x += self.ag_speed * dx / norm
         self.y += self.ag_speed * dy / norm
         
-        # Mantém dentro dos limites da tela
-        self.x = max(0, min(GlobalVar.WINDOW_WIDTH, self.x))
-        self.y = max(0, min(GlobalVar.WINDOW_HEIGHT, self.y))
+        # Mantém dentro dos limites do mundo
+        self.x = max(0, min(GlobalVar.WORLD_WIDTH, self.x))
+        self.y = max(0, min(GlobalVar.WORLD_HEIGHT, self.y))
+
+        # Não entra em obstáculos
+        if environment.obstacles is not None:
+            self.x, self.y = environment.obstacles.resolve_move(old_x, old_y, self.x, self.y)
         
         if not self.has_food:
             self.check_for_food(environment)
@@ -135,6 +153,37 @@ class Ant:
             
         return False
     
+    def move_aggregated(self, environment, ticks):
+        """
+        Aplica vários ticks de caminhada aleatória de uma vez (formigas ociosas do agendador LOD): a soma dos passos é
+        aproximada por uma normal com a mesma variância, limitada ao deslocamento máximo dos ticks (a margem do teste
+        de ociosidade), e o limite do mundo e os obstáculos são verificados só no fim.
+
+        Parameters:
+            environment: Representa o ambiente da simulação.
+            ticks: Quantidade de ticks agregados.
+        """
+        from lod import RANDOM_STEP_VARIANCE, gaussian_pair, max_displacement
+
+        if ticks <= 0:
+            return
+        self.fitness_steps_count += ticks
+
+        old_x, old_y = self.x, self.y
+        scale = self.ag_speed * math.sqrt(ticks * RANDOM_STEP_VARIANCE)
+        dx, dy = gaussian_pair(self.rng)
+        dx, dy = scale * dx, scale * dy
+        # A normal não tem limite: passos além do deslocamento máximo (cerca de 0,2% com o intervalo 4) são encurtados
+        # na mesma direção
+        distance, limit = math.hypot(dx, dy), max_displacement(ticks, self.ag_speed)
+        if distance > limit:
+            dx, dy = dx * limit / distance, dy * limit / distance
+        self.x = max(0, min(GlobalVar.WORLD_WIDTH, self.x + dx))
+        self.y = max(0, min(GlobalVar.WORLD_HEIGHT, self.y + dy))
+
+        if environment.obstacles is not None:
+            self.x, self.y = environment.obstacles.resolve_move(old_x, old_y, self.x, self.y)
+
     def direction_exploration(self, environment):
         """
         Determina a direção de movimento (guiada por feromônio ou aleatório) durante a exploração.
@@ -151,12 +200,12 @@ class Ant:
         if nearest_pheromone:
             # Segue o feromônio
             return (
-                nearest_pheromone.position[0] - self.x,
-                nearest_pheromone.position[1] - self.y
+                nearest_pheromone[0] - self.x,
+                nearest_pheromone[1] - self.y
             )
         else:
             # Movimento aleatório com pequena tendência de exploração
-            return (random.uniform(-10, 10), random.uniform(-10, 10))
+            return (self.rng.uniform(-10, 10), self.rng.uniform(-10, 10))
     
     def check_for_food(self, environment):
         """
@@ -165,8 +214,8 @@ class Ant:
         Parameters:
             environment: Representa o ambiente da simulação (contêm informações sobre a colônia, fontes de comida e feromônios).
         """
-        nearest_food = environment.find_nearest_food(self.position)
-        if nearest_food and euclidean_distance(self.position, nearest_food.position) < 15:
+        nearest_food = environment.find_nearest_food(self.position, GlobalVar.FOOD_PICKUP_RADIUS)
+        if nearest_food and euclidean_distance(self.position, nearest_food.position) < GlobalVar.FOOD_PICKUP_RADIUS:
             self.has_food = True
             self.exploring = False
             environment.take_food(nearest_food)
@@ -183,12 +232,19 @@ class Ant:
         """
         self.has_food = False
         
-        # Deposita feromônios no caminho com a intensidade da formiga
-        for pos in self.food_return_route:
-            if euclidean_distance(pos, environment.colony.position) > GlobalVar.COLONY_RADIUS * 2:
-                environment.add_pheromone(pos, self.ag_pheromone_strength)
+        # Deposita feromônios no caminho com a intensidade da formiga (todos de uma vez)
+        if GlobalVar.PHEROMONE_TRAIL_SPACING:
+            route_points = self.food_return_route.resample(GlobalVar.PHEROMONE_TRAIL_SPACING)
+        else:
+            route_points = self.food_return_route.points()
+        
+        min_distance = GlobalVar.COLONY_RADIUS * 2
+        colony_position = environment.colony.position
+        trail = [pos for pos in route_points if euclidean_distance(pos, colony_position) > min_distance]
+        if trail:
+            environment.add_pheromones(trail, self.ag_pheromone_strength)
         
-        self.food_return_route = []
+        self.food_return_route.clear()
 
     def get_color(self):
         """
@@ -207,18 +263,18 @@ class Ant:
         Aplica mutações aleatórias em algum dos atributos genéticos da formiga com 
         uma probabilidade definida por AG_MUTATION_RATE.
         """
-        if random.random() < GlobalVar.AG_MUTATION_RATE:
-            attribute = random.choice(["speed", "sense", "strength"])
+        if self.rng.random() < GlobalVar.AG_MUTATION_RATE:
+            attribute = self.rng.choice(["speed", "sense", "strength"])
             
             if attribute == "speed":
                 # Mutação mais agressiva
-                self.ag_speed += random.uniform(-1.0, 1.0) * GlobalVar.AG_MUTATION_FORCE
+                self.ag_speed += self.rng.uniform(-1.0, 1.0) * GlobalVar.AG_MUTATION_FORCE
                 self.ag_speed = max(1.0, min(GlobalVar.ANT_MAX_SPEED, self.ag_speed))
                 
             elif attribute == "sense":
-                self.ag_pheromone_detection_range += random.uniform(-20, 20) * GlobalVar.AG_MUTATION_FORCE
+                self.ag_pheromone_detection_range += self.rng.uniform(-20, 20) * GlobalVar.AG_MUTATION_FORCE
                 self.ag_pheromone_detection_range = max(10.0, min(GlobalVar.ANT_MAX_PHEROMONE_SENSE, self.ag_pheromone_detection_range))
                 
             elif attribute == "strength":
-                self.ag_pheromone_strength += random.uniform(-0.5, 0.5) * GlobalVar.AG_MUTATION_FORCE
+                self.ag_pheromone_strength += self.rng.uniform(-0.5, 0.5) * GlobalVar.AG_MUTATION_FORCE
                 self.ag_pheromone_strength = max(0.5, min(GlobalVar.ANT_MAX_PHEROMONE_STRENGTH, self.ag_pheromone_strength))
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+Benchmarks de desempenho da simulação. Devem ser executados a partir da pasta `main`, por exemplo:
+
+    python -m benchmarks.pheromone_search
+"""
@@ -0,0 +1,59 @@
+import argparse
+import statistics
+import time
+
+from benchmarks.scenarios import scenario_settings
+from environment import Environment
+from global_var import GlobalVar
+
+def run(num_ants, ticks, seed, interval):
+    """
+    Executa uma simulação (loop por objeto) com ou sem o agendador LOD e retorna o tempo e as estatísticas de coleta.
+    """
+    with GlobalVar.override(**scenario_settings(num_ants, RANDOM_SEED=seed, LOD_INTERVAL=interval)):
+        environment = Environment()
+        aggregated = updates = 0
+        start = time.perf_counter()
+        for _ in range(ticks):
+            environment.update()
+            if environment.lod is not None:
+                aggregated += environment.lod.aggregated_updates
+                updates += environment.lod.aggregated_updates + environment.lod.full_updates
+        elapsed = time.perf_counter() - start
+
+    return {
+        "tick_time": elapsed / ticks,
+        "food": environment.total_food_collected,
+        "generation": environment.colony.generation,
+        "aggregated_fraction": aggregated / updates if updates else 0.0,
+    }
+
+def summarize(results, key):
+    values = [result[key] for result in results]
+    return statistics.mean(values), statistics.stdev(values) if len(values) > 1 else 0.0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compara o loop por objeto completo com o agendador LOD (tempo por tick e comida coletada)."
+    )
+    parser.add_argument("--ants", type=int, nargs="+", default=[200, 1_000])
+    parser.add_argument("--ticks", type=int, default=2_000)
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--interval", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    for num_ants in args.ants:
+        full = [run(num_ants, args.ticks, seed, 0) for seed in range(args.seeds)]
+        lod = [run(num_ants, args.ticks, seed, args.interval) for seed in range(args.seeds)]
+        full_food, full_spread = summarize(full, "food")
+        lod_food, lod_spread = summarize(lod, "food")
+        full_time, lod_time = summarize(full, "tick_time")[0], summarize(lod, "tick_time")[0]
+        print(
+            f"{num_ants} formigas: completo {full_time * 1e3:.2f}ms/tick, LOD {lod_time * 1e3:.2f}ms/tick "
+            f"({full_time / lod_time:.2f}x, {summarize(lod, 'aggregated_fraction')[0]:.0%} agregadas); "
+            f"comida {full_food:.0f} ± {full_spread:.0f} vs {lod_food:.0f} ± {lod_spread:.0f} "
+            f"({(lod_food - full_food) / max(full_food, 1):+.1%})"
+        )
+
+if __name__ == "__main__":
+    main()
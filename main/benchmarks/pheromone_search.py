@@ -0,0 +1,71 @@
+import argparse
+import time
+
+from ant import euclidean_distance
+from benchmarks.scenarios import build_environment, random_positions
+from global_var import GlobalVar
+
+def linear_find_nearest_pheromone(pheromones, position, max_distance):
+    """
+    Busca linear original (percorre a lista inteira de feromônios), usada como referência.
+    """
+    in_range_pheromones = []
+    for phero in pheromones:
+        distance = euclidean_distance(position, phero.position)
+        if distance <= max_distance:
+            in_range_pheromones.append(phero)
+
+    best_pheromone = None
+    best_attractiveness = -1
+    for pheromone in in_range_pheromones:
+        distance = max(1, euclidean_distance(position, pheromone.position))
+        attractiveness = pheromone.intensity / distance
+        if best_pheromone is None or attractiveness > best_attractiveness:
+            best_pheromone = pheromone
+            best_attractiveness = attractiveness
+    return best_pheromone
+
+def run(num_pheromones, num_queries, max_distance, seed=0):
+    """
+    Compara a busca linear com o índice espacial e retorna os tempos (em segundos) por consulta.
+    """
+    environment = build_environment(num_pheromones=num_pheromones, seed=seed)
+    queries = random_positions(num_queries, seed + 1)
+
+    start = time.perf_counter()
+    linear_results = [linear_find_nearest_pheromone(environment.pheromones, q, max_distance) for q in queries]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid_results = [environment.find_nearest_pheromone(q, max_distance) for q in queries]
+    grid_time = time.perf_counter() - start
+
+    # find_nearest_pheromone retorna a posição do feromônio escolhido
+    linear_results = [pheromone.position if pheromone is not None else None for pheromone in linear_results]
+    mismatches = sum(1 for a, b in zip(linear_results, grid_results) if a != b)
+    return {
+        "pheromones": num_pheromones,
+        "queries": num_queries,
+        "linear_per_query": linear_time / num_queries,
+        "grid_per_query": grid_time / num_queries,
+        "speedup": linear_time / grid_time if grid_time > 0 else float("inf"),
+        "mismatches": mismatches,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara a busca linear de feromônios com o índice espacial.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--range", type=float, default=GlobalVar.ANT_INITIAL_PHEROMONE_SENSE)
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        result = run(size, args.queries, args.range)
+        print(
+            f"{result['pheromones']} feromônios: linear {result['linear_per_query'] * 1e6:.1f}us, "
+            f"grade {result['grid_per_query'] * 1e6:.1f}us, {result['speedup']:.1f}x "
+            f"({result['mismatches']} resultados diferentes)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from benchmarks.scenarios import build_environment, scenario_settings
+from global_var import GlobalVar
+from renderer import Renderer
+
+def time_frames(draw, screen, frames):
+    """
+    Retorna o tempo médio (em segundos) de um quadro de desenho.
+    """
+    # Quadro de aquecimento (carimbos e camadas criados no primeiro quadro)
+    draw()
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill(GlobalVar.WINDOW_BACKGROUND_COLOR)
+        draw()
+    return (time.perf_counter() - start) / frames
+
+def compare(draw, screen, frames):
+    """
+    Mede o desenho um a um e o desenho em lote e retorna os tempos e a maior diferença entre os pixels.
+    """
+    with GlobalVar.override(RENDER_BULK=False):
+        single = time_frames(draw, screen, frames)
+    single_pixels = pygame.surfarray.array3d(screen).astype(np.int64)
+
+    with GlobalVar.override(RENDER_BULK=True):
+        bulk = time_frames(draw, screen, frames)
+    difference = int(np.abs(pygame.surfarray.array3d(screen) - single_pixels).max())
+    return single, bulk, difference
+
+def run(num_ants, num_pheromones, frames, vectorized, seed=0):
+    """
+    Compara o desenho das formigas e dos feromônios (objetos) um a um com o desenho em lote.
+    """
+    overrides = {"USE_VECTORIZED_ANTS": vectorized}
+    environment = build_environment(num_ants, num_pheromones=num_pheromones, seed=seed, **overrides)
+    # Limite 0: o desenho em lote é medido em qualquer quantidade
+    with GlobalVar.override(**scenario_settings(num_ants, RENDER_BULK_MIN_COUNT=0, **overrides)):
+        # Espalha as formigas pelo mundo (no início estão todas sobre a colônia)
+        rng = np.random.default_rng(seed)
+        ants = environment.colony.ants + environment.colony.ants_scout
+        for ant in ants:
+            ant.x = float(rng.uniform(0, GlobalVar.WORLD_WIDTH))
+            ant.y = float(rng.uniform(0, GlobalVar.WORLD_HEIGHT))
+            ant.has_food = bool(rng.random() < 0.2)
+        if environment.population_engine is not None:
+            environment.population_engine.load()
+
+        renderer = Renderer(pygame.Surface((GlobalVar.WINDOW_WIDTH, GlobalVar.WINDOW_HEIGHT)))
+        screen = renderer.screen
+        try:
+            ants_result = compare(lambda: renderer.render_ants(environment), screen, frames)
+            pheromones = environment.pheromones
+            pheromone_result = compare(lambda: renderer.render_pheromones(pheromones), screen, frames)
+        finally:
+            environment.close()
+
+    return {"ants": len(ants), "ant_frames": ants_result, "pheromone_frames": pheromone_result}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara o desenho um a um com o desenho em lote (surfarray).")
+    parser.add_argument("--ants", type=int, nargs="+", default=[200, 1_000, 5_000, 20_000, 100_000])
+    parser.add_argument("--pheromones", type=int, default=None,
+                        help="Quantidade de feromônios (padrão = a mesma quantidade de formigas).")
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--vectorized", action="store_true", help="Usa o motor vetorizado (formigas em arrays).")
+    args = parser.parse_args(argv)
+
+    for num_ants in args.ants:
+        num_pheromones = args.pheromones if args.pheromones is not None else num_ants
+        result = run(num_ants, num_pheromones, args.frames, args.vectorized)
+        single, bulk, difference = result["ant_frames"]
+        p_single, p_bulk, p_difference = result["pheromone_frames"]
+        print(
+            f"{result['ants']} formigas: um a um {single * 1e3:.1f}ms, lote {bulk * 1e3:.1f}ms "
+            f"(diferença máx. {difference}); {num_pheromones} feromônios: {p_single * 1e3:.1f}ms, "
+            f"lote {p_bulk * 1e3:.1f}ms (diferença máx. {p_difference})"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from benchmarks.scenarios import build_environment
+from global_var import GlobalVar
+from renderer import Renderer
+
+def legacy_render_pheromones(screen, pheromones):
+    """
+    Desenho original dos feromônios (cria uma Surface nova para cada feromônio), usado como referência.
+    """
+    for pheromone in pheromones:
+        size = max(1, min(3, pheromone.intensity / 5))
+        alpha = int(min(255, pheromone.intensity * 80))
+
+        pheromone_surface = pygame.Surface((int(size*2), int(size*2)), pygame.SRCALPHA)
+        pygame.draw.circle(
+            pheromone_surface,
+            (*GlobalVar.PHEROMONE_COLOR, alpha),
+            (int(size), int(size)),
+            int(size)
+        )
+        screen.blit(pheromone_surface, (
+            int(pheromone.position[0] - size),
+            int(pheromone.position[1] - size)
+        ))
+
+def time_frames(draw, screen, frames):
+    """
+    Retorna o tempo médio (em segundos) de um quadro de desenho dos feromônios.
+    """
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill(GlobalVar.WINDOW_BACKGROUND_COLOR)
+        draw()
+    return (time.perf_counter() - start) / frames
+
+def run(num_pheromones, frames, seed=0, ages=4):
+    """
+    Compara o desenho original com o cache de imagens (com e sem Surface.blits) e verifica se os pixels são iguais. Os
+    feromônios são depositados em várias idades (ver build_environment), assim as opacidades cobrem a faixa real e a
+    quantidade de imagens em cache é a de uma simulação.
+    """
+    environment = build_environment(num_pheromones=num_pheromones, seed=seed, pheromone_ages=ages)
+    renderer = Renderer(pygame.Surface((GlobalVar.WINDOW_WIDTH, GlobalVar.WINDOW_HEIGHT)))
+    screen = renderer.screen
+    pheromones = environment.pheromones
+
+    legacy = time_frames(lambda: legacy_render_pheromones(screen, pheromones), screen, frames)
+    legacy_pixels = pygame.image.tobytes(screen, "RGB")
+
+    # Mede o cache de imagens (o desenho em lote tem o seu benchmark, benchmarks/render_ants.py)
+    with GlobalVar.override(RENDER_BULK=False, RENDER_BATCH_BLITS=False):
+        cached = time_frames(lambda: renderer.render_pheromones(pheromones), screen, frames)
+
+    with GlobalVar.override(RENDER_BULK=False, RENDER_BATCH_BLITS=True):
+        batched = time_frames(lambda: renderer.render_pheromones(pheromones), screen, frames)
+    same_pixels = pygame.image.tobytes(screen, "RGB") == legacy_pixels
+
+    return {
+        "pheromones": len(pheromones),
+        "legacy_frame": legacy,
+        "cached_frame": cached,
+        "batched_frame": batched,
+        "sprites": len(renderer.pheromone_sprites),
+        "same_pixels": same_pixels,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara o tempo de quadro do desenho dos feromônios.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 50_000])
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--ages", type=int, default=4, help="Idades (em ticks) dos feromônios pré-carregados")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        result = run(size, args.frames, ages=args.ages)
+        print(
+            f"{result['pheromones']} feromônios: original {result['legacy_frame'] * 1e3:.1f}ms, "
+            f"cache {result['cached_frame'] * 1e3:.1f}ms, cache + blits {result['batched_frame'] * 1e3:.1f}ms "
+            f"({result['sprites']} imagens, pixels iguais: {result['same_pixels']})"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import random
+
+from environment import Environment
+from global_var import GlobalVar
+
+def scenario_settings(num_ants, num_food=None, **overrides):
+    """
+    Retorna as configurações globais de um cenário (formigas normais, exploradoras e fontes de comida).
+
+    Parameters:
+        num_ants: Quantidade de formigas normais (as exploradoras são 1/4 desse valor).
+        num_food (opcional): Quantidade de fontes de comida (padrão = FOOD_AVAILABLE).
+        overrides: Outras configurações globais do cenário.
+
+    Returns:
+        dict: Configurações para GlobalVar.override.
+    """
+    settings = {
+        "ANT_POPULATION_SIZE": num_ants,
+        "ANT_SCOUT_COLOR_POPULATION_SIZE": num_ants // 4,
+        "FOOD_AVAILABLE": GlobalVar.FOOD_AVAILABLE if num_food is None else num_food,
+        "PRINT_STATISTICS": False,
+    }
+    settings.update(overrides)
+    return settings
+
+def build_environment(num_ants=200, num_food=None, num_pheromones=0, seed=0, pheromone_ages=1, **overrides):
+    """
+    Cria um ambiente reprodutível (semente fixa) com tamanhos controlados.
+
+    Parameters:
+        num_ants (opcional): Quantidade de formigas normais.
+        num_food (opcional): Quantidade de fontes de comida.
+        num_pheromones (opcional): Quantidade de feromônios pré-carregados em posições aleatórias.
+        pheromone_ages (opcional): Quantidade de idades (em ticks) sorteadas para os feromônios pré-carregados. Com 1
+            todos são depositados no tick atual (intensidade máxima); com mais, os depósitos são espalhados nos ticks
+            anteriores e o decaimento cobre a faixa real de intensidades (os que decaem abaixo do limite são removidos).
+        seed (opcional): Semente dos números aleatórios.
+        overrides: Outras configurações globais usadas na criação do ambiente.
+
+    Returns:
+        Environment: O ambiente criado.
+    """
+    with GlobalVar.override(**scenario_settings(num_ants, num_food, **overrides)):
+        random.seed(seed)
+        environment = Environment()
+
+        positions = [
+            (random.uniform(0, GlobalVar.WORLD_WIDTH), random.uniform(0, GlobalVar.WORLD_HEIGHT))
+            for _ in range(num_pheromones)
+        ]
+        strengths = [random.uniform(0.5, 2.0) for _ in positions]
+        ages = [random.randrange(pheromone_ages) for _ in positions] if pheromone_ages > 1 else [0] * len(positions)
+
+        # Os mais antigos são depositados primeiro e decaem um tick a cada idade
+        for age in range(pheromone_ages - 1, -1, -1):
+            for position, strength, pheromone_age in zip(positions, strengths, ages):
+                if pheromone_age == age:
+                    environment.add_pheromone(position, strength)
+            if age > 0:
+                environment.update_pheromones()
+
+    return environment
+
+def random_positions(count, seed=1):
+    """
+    Retorna posições aleatórias (reprodutíveis) dentro da tela, usadas como consultas.
+    """
+    rng = random.Random(seed)
+    return [(rng.uniform(0, GlobalVar.WORLD_WIDTH), rng.uniform(0, GlobalVar.WORLD_HEIGHT)) for _ in range(count)]
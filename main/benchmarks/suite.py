@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from benchmarks.scenarios import build_environment, random_positions, scenario_settings
+from global_var import GlobalVar
+
+# Cenários padrão: quantidade de formigas normais (as exploradoras são 1/4 desse valor)
+DEFAULT_ANTS = [200, 1_000, 5_000, 20_000, 100_000]
+
+def measure(function, repeat):
+    """
+    Executa a função repeat vezes e retorna o tempo médio e o melhor tempo (em segundos).
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"mean": sum(times) / len(times), "best": min(times), "repeat": repeat}
+
+def bench_update(num_ants, num_food, num_pheromones, ticks, seed, overrides):
+    """
+    Mede Environment.update (inclui evolução e feromônios quando acontecem durante os ticks).
+    """
+    environment = build_environment(num_ants, num_food, num_pheromones, seed, **overrides)
+    try:
+        with GlobalVar.override(**scenario_settings(num_ants, num_food, **overrides)):
+            result = measure(environment.update, ticks)
+    finally:
+        environment.close()
+    result["ticks_per_second"] = 1 / result["mean"] if result["mean"] > 0 else None
+    return result
+
+def bench_evolve(num_ants, num_food, seed, overrides):
+    """
+    Mede uma chamada de Colony.evolve_population depois de alguns ticks (para haver fitness variado).
+    """
+    environment = build_environment(num_ants, num_food, 0, seed, **overrides)
+    try:
+        with GlobalVar.override(**scenario_settings(num_ants, num_food, **overrides)):
+            for _ in range(5):
+                environment.move_ants()
+            environment.sync_ant_views()
+            return measure(environment.colony.evolve_population, 1)
+    finally:
+        environment.close()
+
+def bench_queries(num_ants, num_food, num_pheromones, queries, seed, overrides):
+    """
+    Mede find_nearest_pheromone e find_nearest_food em posições aleatórias (tempo por consulta).
+    """
+    environment = build_environment(num_ants, num_food, num_pheromones, seed, **overrides)
+    positions = random_positions(queries, seed + 1)
+    sense = GlobalVar.ANT_INITIAL_PHEROMONE_SENSE
+
+    def pheromone_queries():
+        for position in positions:
+            environment.find_nearest_pheromone(position, sense)
+
+    def food_queries():
+        for position in positions:
+            environment.find_nearest_food(position)
+
+    try:
+        pheromone = measure(pheromone_queries, 3)
+        food = measure(food_queries, 3)
+    finally:
+        environment.close()
+    for result in (pheromone, food):
+        result["per_query"] = result["mean"] / queries
+    return {"find_nearest_pheromone": pheromone, "find_nearest_food": food}
+
+def bench_render(num_ants, num_food, num_pheromones, frames, seed, overrides):
+    """
+    Mede Renderer.render em uma superfície fora da tela (retorna None se o pygame não estiver disponível).
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+        from renderer import Renderer
+    except ImportError:
+        return None
+
+    environment = build_environment(num_ants, num_food, num_pheromones, seed, **overrides)
+    try:
+        renderer = Renderer(pygame.Surface((GlobalVar.WINDOW_WIDTH, GlobalVar.WINDOW_HEIGHT)))
+        return measure(lambda: renderer.render(environment), frames)
+    finally:
+        environment.close()
+
+def run_suite(ants, num_food, num_pheromones, ticks, queries, frames, seed=0, overrides=None, skip=()):
+    """
+    Executa todos os benchmarks para cada tamanho de população.
+
+    Returns:
+        dict: Resultados com metadados da execução.
+    """
+    overrides = overrides or {}
+    results = []
+    for num_ants in ants:
+        case = {"ants": num_ants, "food": num_food, "pheromones": num_pheromones}
+        if "update" not in skip:
+            case["update"] = bench_update(num_ants, num_food, num_pheromones, ticks, seed, overrides)
+        if "evolve" not in skip:
+            case["evolve"] = bench_evolve(num_ants, num_food, seed, overrides)
+        if "queries" not in skip:
+            case.update(bench_queries(num_ants, num_food, num_pheromones, queries, seed, overrides))
+        if "render" not in skip:
+            case["render"] = bench_render(num_ants, num_food, num_pheromones, frames, seed, overrides)
+        results.append(case)
+        print(format_case(case), file=sys.stderr)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "overrides": overrides,
+        "results": results,
+    }
+
+def format_case(case):
+    """
+    Formata o resultado de um cenário em uma linha.
+    """
+    parts = [f"{case['ants']} formigas"]
+    if "update" in case:
+        parts.append(f"update {case['update']['mean'] * 1e3:.2f}ms")
+    if "evolve" in case:
+        parts.append(f"evolve {case['evolve']['mean'] * 1e3:.1f}ms")
+    if "find_nearest_pheromone" in case:
+        parts.append(f"feromônio {case['find_nearest_pheromone']['per_query'] * 1e6:.1f}us")
+        parts.append(f"comida {case['find_nearest_food']['per_query'] * 1e6:.1f}us")
+    if case.get("render"):
+        parts.append(f"render {case['render']['mean'] * 1e3:.2f}ms")
+    return ", ".join(parts)
+
+def compare(baseline_path, current_path):
+    """
+    Imprime a razão (atual / referência) dos tempos médios de dois arquivos de resultados.
+    """
+    with open(baseline_path) as file:
+        baseline = {case["ants"]: case for case in json.load(file)["results"]}
+    with open(current_path) as file:
+        current = {case["ants"]: case for case in json.load(file)["results"]}
+
+    for ants in sorted(set(baseline) & set(current)):
+        parts = [f"{ants} formigas"]
+        for metric in ("update", "evolve", "find_nearest_pheromone", "find_nearest_food", "render"):
+            before, after = baseline[ants].get(metric), current[ants].get(metric)
+            if before and after and before["mean"] > 0:
+                parts.append(f"{metric} {after['mean'] / before['mean']:.2f}x")
+        print(", ".join(parts))
+
+def parse_overrides(items):
+    """
+    Converte argumentos NOME=valor em configurações globais (o valor é interpretado como JSON quando possível).
+    """
+    overrides = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        try:
+            overrides[name] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[name] = value
+    return overrides
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks da simulação (ticks/s, evolução, consultas e renderização).")
+    parser.add_argument("--ants", type=int, nargs="+", default=DEFAULT_ANTS)
+    parser.add_argument("--food", type=int, default=GlobalVar.FOOD_AVAILABLE)
+    parser.add_argument("--pheromones", type=int, default=1_000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", nargs="*", default=[], metavar="NOME=VALOR", help="Altera configurações do GlobalVar.")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["update", "evolve", "queries", "render"])
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão = saída padrão).")
+    parser.add_argument("--compare", nargs=2, metavar=("REFERENCIA", "ATUAL"), help="Compara dois arquivos de resultados.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    random.seed(args.seed)
+    report = run_suite(
+        args.ants, args.food, args.pheromones, args.ticks, args.queries, args.frames,
+        args.seed, parse_overrides(args.set), set(args.skip)
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+from global_var import GlobalVar
+
+class Camera:
+    """
+    Câmera do renderer: define qual parte do mundo aparece na janela (centro e zoom). Com o mundo do tamanho da janela e
+    zoom 1 a imagem é a mesma de antes da câmera existir.
+
+    Atributos:
+        width, height: Tamanho (em pixels) da área de desenho.
+        world_width, world_height: Tamanho do mundo.
+        x, y: Ponto do mundo no centro da tela.
+        zoom: Pixels da tela por unidade do mundo.
+
+    Métodos:
+        world_to_screen(position): Converte uma posição do mundo para a tela.
+        screen_to_world(position): Converte uma posição da tela para o mundo.
+        visible_rect(margin): Retorna o retângulo do mundo visível na tela.
+        pan(dx, dy): Move a câmera (deslocamento em pixels da tela).
+        zoom_at(factor, position): Aplica zoom mantendo fixo o ponto da tela informado.
+        fit(): Mostra o mundo inteiro.
+        center_on(position): Centraliza a câmera em uma posição do mundo.
+    """
+    def __init__(self, width, height, world_width=None, world_height=None):
+        """
+        Construtor da câmera (começa centralizada no mundo com zoom 1).
+
+        Parameters:
+            width, height: Tamanho (em pixels) da área de desenho.
+            world_width, world_height (opcional): Tamanho do mundo (padrão = GlobalVar.WORLD_WIDTH / WORLD_HEIGHT).
+        """
+        self.width = width
+        self.height = height
+        self.world_width = world_width or GlobalVar.WORLD_WIDTH
+        self.world_height = world_height or GlobalVar.WORLD_HEIGHT
+        self.x = self.world_width / 2
+        self.y = self.world_height / 2
+        self.zoom = 1.0
+
+    @property
+    def min_zoom(self):
+        """
+        Menor zoom permitido (o mundo inteiro cabe na tela).
+        """
+        return min(1.0, self.width / self.world_width, self.height / self.world_height)
+
+    def world_to_screen(self, position):
+        """
+        Converte uma posição do mundo para pixels da tela (inteiros).
+        """
+        return (
+            int((position[0] - self.x) * self.zoom + self.width / 2),
+            int((position[1] - self.y) * self.zoom + self.height / 2)
+        )
+
+    def screen_to_world(self, position):
+        """
+        Converte uma posição da tela para o mundo.
+        """
+        return (
+            (position[0] - self.width / 2) / self.zoom + self.x,
+            (position[1] - self.height / 2) / self.zoom + self.y
+        )
+
+    def visible_rect(self, margin=0):
+        """
+        Retorna o retângulo (esquerda, topo, direita, base) do mundo visível na tela.
+
+        Parameters:
+            margin (opcional): Margem (em unidades do mundo) somada em todos os lados, para incluir objetos com raio.
+        """
+        half_width = self.width / 2 / self.zoom + margin
+        half_height = self.height / 2 / self.zoom + margin
+        return (self.x - half_width, self.y - half_height, self.x + half_width, self.y + half_height)
+
+    def pan(self, dx, dy):
+        """
+        Move a câmera.
+
+        Parameters:
+            dx, dy: Deslocamento em pixels da tela.
+        """
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, position=None):
+        """
+        Multiplica o zoom pelo fator mantendo fixo o ponto do mundo sob a posição da tela (padrão = centro da tela).
+        """
+        if position is None:
+            position = (self.width / 2, self.height / 2)
+        anchor = self.screen_to_world(position)
+        self.zoom = min(GlobalVar.CAMERA_MAX_ZOOM, max(self.min_zoom, self.zoom * factor))
+        # Ajusta o centro para o ponto âncora continuar sob a mesma posição da tela
+        self.x = anchor[0] - (position[0] - self.width / 2) / self.zoom
+        self.y = anchor[1] - (position[1] - self.height / 2) / self.zoom
+        self.clamp()
+
+    def fit(self):
+        """
+        Mostra o mundo inteiro (zoom mínimo, centralizado).
+        """
+        self.zoom = self.min_zoom
+        self.x = self.world_width / 2
+        self.y = self.world_height / 2
+
+    def center_on(self, position):
+        """
+        Centraliza a câmera em uma posição do mundo.
+        """
+        self.x, self.y = position
+        self.clamp()
+
+    def clamp(self):
+        """
+        Mantém o centro da câmera dentro do mundo.
+        """
+        self.x = min(self.world_width, max(0, self.x))
+        self.y = min(self.world_height, max(0, self.y))
@@ -0,0 +1,503 @@
+import heapq
+import json
+import os
+import struct
+import threading
+from array import array
+
+import numpy as np
+
+from ant import Ant
+from ant_scout import Ant_Scout
+from environment import Environment
+from global_var import GlobalVar
+from pheromone import Pheromone
+from rng import COLONY_STREAM, ENVIRONMENT_STREAM, RandomStreams
+
+class Checkpoint:
+    """
+    Checkpoint do estado completo da simulação em formato binário compacto. O arquivo tem um cabeçalho JSON (valores
+    escalares, estado dos geradores aleatórios e índice dos arrays) seguido dos arrays NumPy brutos alinhados em 64
+    bytes, assim a leitura pode usar memory-map sem copiar os dados (útil para populações grandes).
+
+    Formato:
+        MAGIC (8 bytes) | tamanho do cabeçalho (uint64) | cabeçalho JSON | arrays alinhados
+
+    Atributos:
+        header: Dicionário com os valores escalares e o índice dos arrays.
+        arrays: Dicionário {nome: ndarray} com o estado das formigas, feromônios e comida.
+
+    Métodos:
+        capture(environment): Cria um checkpoint a partir do ambiente (classmethod).
+        save(path): Grava o checkpoint no arquivo (escrita atômica).
+        load(path, mmap): Lê um checkpoint do arquivo (classmethod).
+        restore(): Cria um novo ambiente com o estado do checkpoint.
+    """
+    MAGIC = b"ANTCKPT1"
+    ALIGNMENT = 64
+    VERSION = 4
+
+    def __init__(self, header, arrays):
+        """
+        Construtor do checkpoint.
+
+        Parameters:
+            header: Dicionário com os valores escalares.
+            arrays: Dicionário {nome: ndarray}.
+        """
+        self.header = header
+        self.arrays = arrays
+
+    @classmethod
+    def capture(cls, environment):
+        """
+        Copia o estado do ambiente (colônia, formigas com genes e fitness, feromônios, comida, contadores e sequências
+        aleatórias) para um checkpoint em memória. O resultado não depende mais do ambiente e pode ser gravado em outra
+        thread.
+
+        Parameters:
+            environment: O ambiente da simulação.
+
+        Returns:
+            Checkpoint: O checkpoint criado.
+        """
+        colony = environment.colony
+        if environment.population_engine is not None:
+            arrays = cls._capture_engine(environment.population_engine)
+        else:
+            arrays = cls._capture_ants(colony.ants + colony.ants_scout)
+
+        foods = list(environment.food_sources)
+        arrays["food_x"] = np.array([food.position[0] for food in foods], dtype=np.float64)
+        arrays["food_y"] = np.array([food.position[1] for food in foods], dtype=np.float64)
+        arrays["food_stock"] = np.array([food.stock for food in foods], dtype=np.int64)
+
+        # Feromônios (na ordem de inserção) e os lotes do heap de expiração
+        pheromones = list(environment.pheromones)
+        index_of = {pheromone: i for i, pheromone in enumerate(pheromones)}
+        arrays["pheromone_x"] = np.array([p.position[0] for p in pheromones], dtype=np.float64)
+        arrays["pheromone_y"] = np.array([p.position[1] for p in pheromones], dtype=np.float64)
+        arrays["pheromone_initial"] = np.array([p.initial_intensity for p in pheromones], dtype=np.float64)
+        arrays["pheromone_deposit_tick"] = np.array([p.deposit_tick for p in pheromones], dtype=np.int64)
+        arrays["pheromone_cached"] = np.array([p._intensity for p in pheromones], dtype=np.float64)
+        arrays["pheromone_cached_tick"] = np.array([p._tick for p in pheromones], dtype=np.int64)
+        arrays["expiry"] = np.array(
+            [(tick, order, index_of[batch[0]], len(batch)) for tick, order, batch in environment.pheromone_expiry],
+            dtype=np.int64
+        ).reshape(-1, 4)
+
+        if environment.pheromone_field is not None:
+            arrays["pheromone_field"] = environment.pheromone_field.grid.copy()
+        if environment.obstacles is not None:
+            arrays["obstacles"] = environment.obstacles.blocked.copy()
+
+        header = {
+            "version": cls.VERSION,
+            "tick": environment.tick,
+            "food_delivery_count": environment.food_delivery_count,
+            "steady_state_pending": environment.steady_state_pending,
+            "total_food_collected": environment.total_food_collected,
+            "colony": {
+                "x": colony.x,
+                "y": colony.y,
+                "food_collected": colony.food_collected,
+                "generation": colony.generation,
+                "generation_history": colony.generation_history,
+                "num_ants": len(colony.ants),
+                "num_scouts": len(colony.ants_scout),
+                "next_ant_id": colony.next_ant_id,
+                "steady_state_replacements": colony.steady_state_replacements,
+                "stream_position": colony.rng.position,
+            },
+            "pheromone_clock": {
+                "tick": environment.pheromone_clock.tick,
+                "decay_rate": environment.pheromone_clock.decay_rate,
+            },
+            "pheromone_order": environment._pheromone_order,
+            "pheromone_backend": "objects" if environment.pheromone_field is None else "field",
+            "world": {"width": GlobalVar.WORLD_WIDTH, "height": GlobalVar.WORLD_HEIGHT},
+            "random_seed": environment.random_streams.seed,
+            "stream_position": environment.rng.position,
+        }
+        if environment.pheromone_field is not None:
+            field = environment.pheromone_field
+            header["pheromone_field"] = {
+                "resolution": field.resolution,
+                "decay_rate": field.decay_rate,
+                "diffusion": field.diffusion,
+            }
+        if environment.obstacles is not None:
+            header["obstacle_cell_size"] = environment.obstacles.cell_size
+        return cls(header, arrays)
+
+    @staticmethod
+    def _capture_ants(ants):
+        """
+        Copia o estado das formigas a partir dos objetos (simulação sem o motor vetorizado).
+        """
+        arrays = {
+            "ant_x": np.array([ant.x for ant in ants], dtype=np.float64),
+            "ant_y": np.array([ant.y for ant in ants], dtype=np.float64),
+            "ant_has_food": np.array([ant.has_food for ant in ants], dtype=np.bool_),
+            "ant_exploring": np.array([ant.exploring for ant in ants], dtype=np.bool_),
+            "ant_speed": np.array([ant.ag_speed for ant in ants], dtype=np.float64),
+            "ant_sense": np.array([ant.ag_pheromone_detection_range for ant in ants], dtype=np.float64),
+            "ant_strength": np.array([ant.ag_pheromone_strength for ant in ants], dtype=np.float64),
+            "ant_food_collected": np.array([ant.fitness_food_collected for ant in ants], dtype=np.int64),
+            "ant_steps": np.array([ant.fitness_steps_count for ant in ants], dtype=np.int64),
+            "ant_fitness": np.array([ant.fitness_score for ant in ants], dtype=np.float64),
+            "ant_id": np.array([ant.id for ant in ants], dtype=np.int64),
+            "ant_stream_id": np.array([ant.rng.stream_id for ant in ants], dtype=np.int64),
+            "ant_stream_position": np.array([ant.rng.position for ant in ants], dtype=np.int64),
+            "ant_lod_tick": np.array([-1 if ant.lod_tick is None else ant.lod_tick for ant in ants], dtype=np.int64),
+        }
+        arrays["ant_route_runs"], arrays["route_data"] = Checkpoint._capture_routes(ants)
+        return arrays
+
+    @staticmethod
+    def _capture_engine(engine):
+        """
+        Copia o estado das formigas direto dos arrays do motor vetorizado, sem sincronizar os objetos. Só as formigas
+        carregando comida têm a rota de retorno escrita nos objetos (para copiar os trechos do buffer).
+        """
+        ants = engine.ants
+        arrays = {
+            "ant_x": engine.x.copy(),
+            "ant_y": engine.y.copy(),
+            "ant_has_food": engine.has_food.copy(),
+            "ant_exploring": ~engine.has_food,
+            "ant_speed": engine.ag_speed.copy(),
+            "ant_sense": engine.ag_pheromone_detection_range.copy(),
+            "ant_strength": engine.ag_pheromone_strength.copy(),
+            "ant_food_collected": engine.fitness_food_collected.copy(),
+            "ant_steps": engine.fitness_steps_count.copy(),
+            # A pontuação só existe nos objetos (é calculada pelo algoritmo genético)
+            "ant_fitness": np.array([ant.fitness_score for ant in ants], dtype=np.float64),
+            "ant_id": engine.ant_ids.copy(),
+            "ant_stream_id": engine.stream_ids.copy(),
+            "ant_stream_position": engine.stream_positions.astype(np.int64),
+            # O agendador LOD não é usado junto com o motor vetorizado
+            "ant_lod_tick": np.full(len(ants), -1, dtype=np.int64),
+        }
+
+        carrying = np.flatnonzero(engine.has_food)
+        engine.write_routes(carrying)
+        route_runs, route_data = Checkpoint._capture_routes([ants[i] for i in carrying])
+        arrays["ant_route_runs"] = np.zeros(len(ants), dtype=np.int64)
+        arrays["ant_route_runs"][carrying] = route_runs
+        arrays["route_data"] = route_data
+        return arrays
+
+    @staticmethod
+    def _capture_routes(ants):
+        """
+        Copia as rotas de retorno: trechos concatenados e a quantidade de trechos de cada formiga.
+        """
+        route = ants[0].food_return_route if ants else None
+        run_size = route.RUN_SIZE if route is not None else 5
+        runs = np.array([ant.food_return_route.runs for ant in ants], dtype=np.int64)
+        data = np.array(
+            [value for ant in ants for value in ant.food_return_route.buffer[:ant.food_return_route.runs * run_size]],
+            dtype=np.float64
+        )
+        return runs, data
+
+    def save(self, path):
+        """
+        Grava o checkpoint no arquivo. A escrita é feita em um arquivo temporário que depois substitui o destino, assim
+        um checkpoint interrompido nunca corrompe o anterior.
+
+        Parameters:
+            path: Caminho do arquivo.
+        """
+        header = dict(self.header)
+        index = {}
+        offset = 0
+        for name, array in self.arrays.items():
+            offset = self._align(offset)
+            index[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+        header["arrays"] = index
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = self._align(len(self.MAGIC) + 8 + len(header_bytes))
+
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(self.MAGIC)
+            file.write(struct.pack("<Q", len(header_bytes)))
+            file.write(header_bytes)
+            for name, array in self.arrays.items():
+                file.seek(data_start + index[name]["offset"])
+                file.write(np.ascontiguousarray(array).tobytes())
+            file.truncate(data_start + offset)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Lê um checkpoint do arquivo.
+
+        Parameters:
+            path: Caminho do arquivo.
+            mmap (opcional): Se os arrays são mapeados em memória (sem cópia) em vez de lidos para a memória.
+
+        Returns:
+            Checkpoint: O checkpoint lido.
+        """
+        with open(path, "rb") as file:
+            magic = file.read(len(cls.MAGIC))
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} não é um checkpoint da simulação.")
+            (header_size,) = struct.unpack("<Q", file.read(8))
+            header = json.loads(file.read(header_size).decode("utf-8"))
+
+        if header.get("version") != cls.VERSION:
+            raise ValueError(f"Versão de checkpoint não suportada: {header.get('version')}")
+
+        data_start = cls._align(len(cls.MAGIC) + 8 + header_size)
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            with open(path, "rb") as file:
+                buffer = np.frombuffer(file.read(), dtype=np.uint8)
+
+        arrays = {}
+        for name, info in header.pop("arrays").items():
+            dtype = np.dtype(info["dtype"])
+            shape = tuple(info["shape"])
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=data_start + info["offset"])
+        return cls(header, arrays)
+
+    @classmethod
+    def _align(cls, offset):
+        return (offset + cls.ALIGNMENT - 1) // cls.ALIGNMENT * cls.ALIGNMENT
+
+    def restore(self):
+        """
+        Cria um novo ambiente com o estado do checkpoint (inclui o estado dos geradores aleatórios, então a simulação
+        continua exatamente de onde parou). Os feromônios são restaurados no backend e na resolução do checkpoint,
+        mesmo que a configuração atual seja outra.
+
+        Returns:
+            Environment: O ambiente restaurado.
+
+        Raises:
+            ValueError: Se o tamanho do mundo do checkpoint é diferente do configurado (WORLD_WIDTH / WORLD_HEIGHT).
+        """
+        header = self.header
+        arrays = self.arrays
+        colony_state = header["colony"]
+
+        world = header["world"]
+        if (world["width"], world["height"]) != (GlobalVar.WORLD_WIDTH, GlobalVar.WORLD_HEIGHT):
+            raise ValueError(
+                f"O checkpoint foi criado com o mundo {world['width']}x{world['height']}, mas a configuração atual é "
+                f"{GlobalVar.WORLD_WIDTH}x{GlobalVar.WORLD_HEIGHT} (ajuste WORLD_WIDTH / WORLD_HEIGHT)."
+            )
+
+        environment = Environment(populate=False)
+        colony = environment.colony
+
+        # Sequências aleatórias com a semente e as posições do checkpoint
+        streams = RandomStreams(header["random_seed"])
+        environment.random_streams = colony.random_streams = streams
+        environment.rng = streams.stream(ENVIRONMENT_STREAM)
+        environment.rng.seek(header["stream_position"])
+        colony.rng = streams.stream(COLONY_STREAM)
+        colony.rng.seek(colony_state["stream_position"])
+        colony.next_ant_id = colony_state["next_ant_id"]
+        colony.x, colony.y = colony_state["x"], colony_state["y"]
+        colony.food_collected = colony_state["food_collected"]
+        colony.generation = colony_state["generation"]
+        colony.generation_history = colony_state["generation_history"]
+
+        environment.tick = header["tick"]
+        environment.food_delivery_count = header["food_delivery_count"]
+        environment.steady_state_pending = header["steady_state_pending"]
+        colony.steady_state_replacements = colony_state["steady_state_replacements"]
+        environment.total_food_collected = header["total_food_collected"]
+
+        self._restore_ants(colony, colony_state["num_ants"], colony_state["num_scouts"])
+        self._restore_food(environment)
+        self._restore_pheromones(environment)
+        self._restore_obstacles(environment)
+
+        if environment.population_engine is not None:
+            environment.population_engine.load()
+        return environment
+
+    def _restore_ants(self, colony, num_ants, num_scouts):
+        arrays = self.arrays
+        x, y = arrays["ant_x"].tolist(), arrays["ant_y"].tolist()
+        has_food, exploring = arrays["ant_has_food"].tolist(), arrays["ant_exploring"].tolist()
+        speed, sense, strength = arrays["ant_speed"].tolist(), arrays["ant_sense"].tolist(), arrays["ant_strength"].tolist()
+        food_collected, steps = arrays["ant_food_collected"].tolist(), arrays["ant_steps"].tolist()
+        fitness = arrays["ant_fitness"].tolist()
+        stream_ids, stream_positions = arrays["ant_stream_id"].tolist(), arrays["ant_stream_position"].tolist()
+        streams = colony.random_streams
+        lod_ticks = arrays["ant_lod_tick"].tolist() if "ant_lod_tick" in arrays else None
+        ant_ids = arrays["ant_id"].tolist() if "ant_id" in arrays else stream_ids
+        route_runs = arrays["ant_route_runs"].tolist()
+        route_data = arrays["route_data"].tolist()
+
+        ants = []
+        route_offset = 0
+        for i in range(num_ants + num_scouts):
+            ant_type = Ant if i < num_ants else Ant_Scout
+            ant = ant_type(x[i], y[i], streams.stream(stream_ids[i]))
+            ant.rng.seek(stream_positions[i])
+            ant.id = ant_ids[i]
+            ant.has_food = has_food[i]
+            ant.exploring = exploring[i]
+            ant.ag_speed = speed[i]
+            ant.ag_pheromone_detection_range = sense[i]
+            ant.ag_pheromone_strength = strength[i]
+            ant.fitness_food_collected = food_collected[i]
+            ant.fitness_steps_count = steps[i]
+            ant.fitness_score = fitness[i]
+            if lod_ticks is not None and lod_ticks[i] >= 0:
+                ant.lod_tick = lod_ticks[i]
+
+            # Os trechos da rota são copiados direto para o buffer (sem reconstruir os pontos)
+            route = ant.food_return_route
+            size = route_runs[i] * route.RUN_SIZE
+            if size:
+                route.buffer = array('d', route_data[route_offset:route_offset + size])
+                route.runs = route_runs[i]
+                route._length = int(sum(route.buffer[route.RUN_SIZE - 1::route.RUN_SIZE]))
+                route_offset += size
+            ants.append(ant)
+
+        colony.ants = ants[:num_ants]
+        colony.ants_scout = ants[num_ants:]
+
+    def _restore_food(self, environment):
+        arrays = self.arrays
+        for x, y, stock in zip(arrays["food_x"].tolist(), arrays["food_y"].tolist(), arrays["food_stock"].tolist()):
+            environment.add_food_source((x, y), stock)
+
+    def _restore_pheromones(self, environment):
+        header = self.header
+        arrays = self.arrays
+
+        clock = environment.pheromone_clock
+        clock.tick = header["pheromone_clock"]["tick"]
+        clock.decay_rate = header["pheromone_clock"]["decay_rate"]
+        environment._pheromone_order = header["pheromone_order"]
+
+        restored = []
+        columns = zip(
+            arrays["pheromone_x"].tolist(), arrays["pheromone_y"].tolist(), arrays["pheromone_initial"].tolist(),
+            arrays["pheromone_deposit_tick"].tolist(), arrays["pheromone_cached"].tolist(),
+            arrays["pheromone_cached_tick"].tolist()
+        )
+        for x, y, initial, deposit_tick, cached, cached_tick in columns:
+            pheromone = Pheromone((x, y), initial, clock)
+            pheromone.deposit_tick = deposit_tick
+            pheromone._intensity = cached
+            pheromone._tick = cached_tick
+            environment.pheromones[pheromone] = None
+            environment.pheromone_grid.insert(pheromone, pheromone.position)
+            restored.append(pheromone)
+
+        environment.pheromone_expiry = [
+            (tick, order, restored[start:start + length])
+            for tick, order, start, length in arrays["expiry"].tolist()
+        ]
+        heapq.heapify(environment.pheromone_expiry)
+
+        # O campo denso é recriado com os parâmetros do checkpoint (o backend configurado pode ser outro)
+        environment.pheromone_field = None
+        if header["pheromone_backend"] == "field":
+            from pheromone_field import PheromoneField
+
+            world = header["world"]
+            field = PheromoneField(world["width"], world["height"], **header["pheromone_field"])
+            if field.grid.shape != arrays["pheromone_field"].shape:
+                raise ValueError(
+                    f"O campo de feromônios do checkpoint tem a forma {arrays['pheromone_field'].shape}, mas o mundo "
+                    f"e a resolução do cabeçalho resultam em {field.grid.shape}."
+                )
+            field.grid[...] = arrays["pheromone_field"]
+            environment.pheromone_field = field
+
+    def _restore_obstacles(self, environment):
+        if "obstacles" not in self.arrays:
+            return
+        from navigation import ObstacleMap
+
+        blocked = self.arrays["obstacles"]
+        cell_size = self.header["obstacle_cell_size"]
+        obstacles = ObstacleMap(blocked.shape[0] * cell_size, blocked.shape[1] * cell_size, cell_size)
+        obstacles.blocked[:] = blocked
+        environment.set_obstacles(obstacles)
+
+class AutoCheckpointer:
+    """
+    Checkpoint automático periódico. Registrado em Environment.tick_listeners, a cada intervalo de ticks ele copia o
+    estado em memória e grava o arquivo em uma thread separada, sem parar o loop da simulação. Se a gravação anterior
+    ainda não terminou, o checkpoint do intervalo é pulado.
+
+    Atributos:
+        path: Caminho do arquivo de checkpoint.
+        interval: Intervalo (em ticks) entre checkpoints.
+        saved: Quantidade de checkpoints gravados.
+        skipped: Quantidade de checkpoints pulados porque a gravação anterior ainda estava em andamento.
+
+    Métodos:
+        attach(environment): Registra o checkpoint automático no ambiente.
+        checkpoint(environment): Inicia a gravação de um checkpoint em segundo plano.
+        wait(): Aguarda a gravação em andamento terminar.
+    """
+    def __init__(self, path, interval):
+        """
+        Construtor do checkpoint automático.
+
+        Parameters:
+            path: Caminho do arquivo de checkpoint.
+            interval: Intervalo (em ticks) entre checkpoints.
+        """
+        self.path = path
+        self.interval = interval
+        self.saved = 0
+        self.skipped = 0
+        self._thread = None
+
+    def __call__(self, environment):
+        if environment.tick % self.interval == 0:
+            self.checkpoint(environment)
+
+    def attach(self, environment):
+        """
+        Registra o checkpoint automático no ambiente.
+        """
+        environment.tick_listeners.append(self)
+        return self
+
+    def checkpoint(self, environment):
+        """
+        Copia o estado do ambiente e inicia a gravação em segundo plano.
+
+        Returns:
+            bool: True se a gravação foi iniciada, False se foi pulada.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self.skipped += 1
+            return False
+
+        snapshot = Checkpoint.capture(environment)
+        self._thread = threading.Thread(target=self._write, args=(snapshot,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _write(self, snapshot):
+        snapshot.save(self.path)
+        self.saved += 1
+
+    def wait(self):
+        """
+        Aguarda a gravação em andamento terminar.
+        """
+        if self._thread is not None:
+            self._thread.join()
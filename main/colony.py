@@ -1,5 +1,5 @@
-import random
 from global_var import GlobalVar
+from rng import COLONY_STREAM, FIRST_ANT_STREAM, RandomStreams
 from ant import Ant
 from ant_scout import Ant_Scout
 
@@ -14,26 +14,39 @@ class Colony:
         ants: Lista de formigas normais.
         ants_scout: Lista de formigas exploradoras.
         generation: Geração atual da colônia.
+        generation_history: Estatísticas registradas a cada geração.
+        random_streams: Fábrica das sequências aleatórias (uma por formiga).
+        rng: Sequência aleatória da colônia (seleção dos pais).
+        next_ant_id: Identificador da próxima formiga criada (também o da sua sequência aleatória) ou do próximo filho
+            que reaproveita uma formiga.
+        steady_state_replacements: Substituições feitas na evolução contínua desde a última geração contada.
 
     Métodos:
         position(): Retorna a posição da colônia.
         create_ants(num_ants): Cria as formigas iniciais (normais e exploradoras).
         initialize_ants(num_ants, is_scout): Inicializa uma lista com todas as formigas.
-        evolve_ants(): Evolui a população de formigas.
+        spawn_ant(Ant_Type): Cria uma formiga com a sua própria sequência aleatória.
+        evolve_ants(engine): Evolui a população de formigas.
         get_ant_fitness(ant): Seleciona o fitness de uma formiga.
-        evolve_population(): Evolui a população de formigas.
+        evolve_population(engine): Evolui a população de formigas.
+        evolve_population_arrays(engine): Evolui a população com operações em lote sobre arrays de genomas.
         tournament(): Seleciona dois pais para reprodução usando torneio.
         crossover_ants(parent1, parent2): Faz o cruzamento entre dois pais para gerar filho.
         select_elite_ants(): Escolhe as formigas de elite com base no fitness.
         select_parent(): Escolhe um pai para reprodução usando torneio.
-        print_statistics(): Imprime estatísticas da geração atual.
+        refresh_fitness(engine): Recalcula o fitness de todas as formigas (evolução contínua).
+        top_genomes(count): Retorna os genes das melhores formigas (emigrantes do modelo de ilhas).
+        receive_migrants(genomes): Substitui os genes de filhos da geração atual pelos genes recebidos.
+        get_statistics(): Retorna as estatísticas da geração atual.
+        print_statistics(stats): Imprime estatísticas da geração atual.
     """
-    def __init__(self, x, y):
+    def __init__(self, x, y, random_streams=None):
         """
         Construtor da colônia de formigas.
 
         Parameters:
             x, y: Coordenadas da colônia.
+            random_streams (opcional): Fábrica das sequências aleatórias (padrão = semente GlobalVar.RANDOM_SEED).
         """
         self.x = x
         self.y = y
@@ -41,6 +54,11 @@ class Colony:
         self.ants = []
         self.ants_scout = []
         self.generation = 1
+        self.generation_history = []
+        self.random_streams = random_streams if random_streams is not None else RandomStreams(GlobalVar.RANDOM_SEED)
+        self.rng = self.random_streams.stream(COLONY_STREAM)
+        self.next_ant_id = FIRST_ANT_STREAM
+        self.steady_state_replacements = 0
     
     @property
     def position(self):
@@ -77,17 +95,36 @@ class Colony:
         
         ants = []
         for _ in range(num_ants):
-            ant = Ant_Type(self.x, self.y)
+            ant = self.spawn_ant(Ant_Type)
             ants.append(ant)
         return ants
+
+    def spawn_ant(self, Ant_Type=Ant):
+        """
+        Cria uma formiga na colônia com a sua própria sequência aleatória (os identificadores são dados em ordem de
+        criação, então a mesma semente gera sempre as mesmas formigas).
+
+        Parameters:
+            Ant_Type (opcional): Classe da formiga (Ant ou Ant_Scout).
+
+        Returns:
+            Ant: A formiga criada.
+        """
+        ant = Ant_Type(self.x, self.y, self.random_streams.stream(self.next_ant_id))
+        self.next_ant_id += 1
+        return ant
     
-    def evolve_ants(self):
+    def evolve_ants(self, engine=None):
         """
         Evolui a população de formigas usando algoritmo genético.
+
+        Parameters:
+            engine (opcional): Motor vetorizado das formigas (com USE_VECTORIZED_EVOLUTION os genes são lidos e
+                escritos direto nos arrays dele).
         """
         self.generation += 1
         
-        self.evolve_population()
+        self.evolve_population(engine)
 
     def get_ant_fitness(self, ant):
         """
@@ -101,10 +138,17 @@ class Colony:
         """
         return ant.fitness_score
 
-    def evolve_population(self):
+    def evolve_population(self, engine=None):
         """
         Aplica evolução da população das formigas.
+
+        Parameters:
+            engine (opcional): Motor vetorizado das formigas (usado apenas com USE_VECTORIZED_EVOLUTION).
         """
+        if GlobalVar.USE_VECTORIZED_EVOLUTION:
+            self.evolve_population_arrays(engine)
+            return
+
         for ant in self.ants:
             ant.calculate_fitness()
         
@@ -129,6 +173,201 @@ class Colony:
             ant.has_food = False
             ant.exploring = True
 
+    def evolve_population_arrays(self, engine=None):
+        """
+        Aplica evolução da população com o algoritmo genético vetorizado (genetic.evolve_arrays). Os filhos são escritos
+        nas posições das formigas que não são elite (os objetos são reaproveitados e a lista não é reordenada) e voltam
+        para a colônia. Com o motor vetorizado os genes e o estado são lidos e escritos direto nos arrays dele.
+
+        Parameters:
+            engine (opcional): Motor vetorizado das formigas (None = arrays montados a partir dos objetos).
+        """
+        import numpy as np
+        from genetic import evolve_arrays
+
+        ants = self.ants
+        n = len(ants)
+        if engine is not None:
+            speed = engine.ag_speed[:n]
+            sense = engine.ag_pheromone_detection_range[:n]
+            strength = engine.ag_pheromone_strength[:n]
+            food_collected = engine.fitness_food_collected[:n]
+            steps_count = engine.fitness_steps_count[:n]
+        else:
+            speed = np.array([ant.ag_speed for ant in ants], dtype=np.float64)
+            sense = np.array([ant.ag_pheromone_detection_range for ant in ants], dtype=np.float64)
+            strength = np.array([ant.ag_pheromone_strength for ant in ants], dtype=np.float64)
+            food_collected = np.array([ant.fitness_food_collected for ant in ants], dtype=np.int64)
+            steps_count = np.array([ant.fitness_steps_count for ant in ants], dtype=np.int64)
+
+        result = evolve_arrays(speed, sense, strength, food_collected, steps_count, self.rng)
+        self.print_statistics(dict(
+            generation=self.generation, best_fitness=result.statistics["best_fitness"],
+            food_collected=self.food_collected, avg_speed=result.statistics["avg_speed"],
+            avg_sense=result.statistics["avg_sense"], avg_strength=result.statistics["avg_strength"],
+        ))
+
+        children = result.children
+        ids = np.arange(self.next_ant_id, self.next_ant_id + len(children))
+        self.next_ant_id += len(children)
+        if engine is not None:
+            engine.ant_ids[children] = ids
+            engine.ag_speed[children] = result.speed
+            engine.ag_pheromone_detection_range[children] = result.sense
+            engine.ag_pheromone_strength[children] = result.strength
+            engine.x[children] = self.x
+            engine.y[children] = self.y
+            engine.has_food[:n] = False
+            engine.route_steps[:n] = 0
+            engine.fitness_food_collected[:n] = 0
+            engine.fitness_steps_count[:n] = 0
+
+        # Objetos: fitness da geração avaliada, genes dos filhos e estado da nova geração (com o motor, os contadores,
+        # a posição e a rota são copiados dos arrays no próximo write_back)
+        for ant, score in zip(ants, result.fitness.tolist()):
+            ant.fitness_score = score
+            if engine is None:
+                ant.fitness_food_collected = 0
+                ant.fitness_steps_count = 0
+                ant.has_food = False
+                ant.exploring = True
+                ant.food_return_route.clear()
+
+        columns = zip(
+            children.tolist(), ids.tolist(), result.speed.tolist(), result.sense.tolist(), result.strength.tolist()
+        )
+        for index, child_id, child_speed, child_sense, child_strength in columns:
+            ant = ants[index]
+            ant.id = child_id
+            ant.ag_speed = child_speed
+            ant.ag_pheromone_detection_range = child_sense
+            ant.ag_pheromone_strength = child_strength
+            ant.fitness_score = 0.1
+            if engine is None:
+                ant.x, ant.y = self.x, self.y
+
+    def steady_state_step(self, replacements, engine=None):
+        """
+        Evolução contínua (steady-state): em vez de trocar a população inteira de uma vez, substitui poucas formigas por
+        tick. Cada substituição escolhe a pior de um torneio (entre as formigas com pelo menos AG_STEADY_STATE_MIN_AGE
+        passos) e a reaproveita como filho de dois pais escolhidos por torneio. Só o fitness dos candidatos é
+        calculado. A cada (população - elite) substituições é contada uma geração e as estatísticas são registradas.
+
+        Parameters:
+            replacements: Quantidade de substituições a tentar.
+            engine (opcional): Motor vetorizado das formigas (os candidatos são lidos e o filho é escrito nos arrays).
+
+        Returns:
+            int: Quantidade de formigas substituídas.
+        """
+        n = len(self.ants)
+        if n < 2:
+            return 0
+
+        size = min(GlobalVar.AG_TOURNAMENT_SIZE, n)
+        replaced = 0
+        for _ in range(replacements):
+            candidates = [
+                index for index in self.evaluate_candidates(size, engine)
+                if self.ants[index].fitness_steps_count >= GlobalVar.AG_STEADY_STATE_MIN_AGE
+            ]
+            if not candidates:
+                continue
+
+            worst = min(candidates, key=lambda index: self.ants[index].fitness_score)
+            parent1 = self.ants[max(self.evaluate_candidates(size, engine), key=lambda index: self.ants[index].fitness_score)]
+            parent2 = self.ants[max(self.evaluate_candidates(size, engine), key=lambda index: self.ants[index].fitness_score)]
+
+            self.replace_ant(self.ants[worst], parent1, parent2)
+            if engine is not None:
+                engine.load_slot(worst)
+            replaced += 1
+
+        # Uma geração equivale a substituir as formigas que não são elite
+        self.steady_state_replacements += replaced
+        generation_size = max(1, n - len(self.select_elite_ants()))
+        if self.steady_state_replacements >= generation_size:
+            self.steady_state_replacements -= generation_size
+            self.generation += 1
+            self.print_statistics(self.steady_state_statistics(engine))
+
+        return replaced
+
+    def evaluate_candidates(self, size, engine=None):
+        """
+        Sorteia os candidatos de um torneio e calcula o fitness atual de cada um.
+
+        Returns:
+            list: Índices dos candidatos em self.ants.
+        """
+        candidates = self.rng.sample(range(len(self.ants)), size)
+        for index in candidates:
+            if engine is not None:
+                engine.write_back_slot(index)
+            self.ants[index].calculate_fitness()
+        return candidates
+
+    def replace_ant(self, ant, parent1, parent2):
+        """
+        Reaproveita uma formiga como filho de dois pais: genes do cruzamento, mutação e estado de uma formiga nova na
+        colônia.
+
+        Parameters:
+            ant: A formiga substituída.
+            parent1, parent2: Os pais.
+        """
+        ant.ag_speed, ant.ag_pheromone_detection_range, ant.ag_pheromone_strength = self.crossover_genes(parent1, parent2)
+        ant.mutate()
+
+        # O filho é outra formiga para quem acompanha as trajetórias (a sequência aleatória continua a mesma)
+        ant.id = self.next_ant_id
+        self.next_ant_id += 1
+        ant.x, ant.y = self.x, self.y
+        ant.has_food = False
+        ant.exploring = True
+        ant.food_return_route.clear()
+        ant.fitness_food_collected = 0
+        ant.fitness_steps_count = 0
+        ant.fitness_score = 0.1
+
+    def steady_state_statistics(self, engine=None):
+        """
+        Retorna as estatísticas da geração na evolução contínua (o fitness de todas as formigas é recalculado, porque a
+        lista não fica ordenada).
+
+        Returns:
+            dict: Mesmas chaves de get_statistics().
+        """
+        fitness = self.refresh_fitness(engine)
+        stats = self.get_statistics()
+        stats["best_fitness"] = max(fitness) if fitness else 0
+        return stats
+
+    def refresh_fitness(self, engine=None):
+        """
+        Recalcula o fitness de todas as formigas com os contadores atuais (na evolução contínua só os candidatos dos
+        torneios têm o fitness atualizado).
+
+        Parameters:
+            engine (opcional): Motor vetorizado das formigas (os contadores e genes são lidos dos arrays).
+
+        Returns:
+            list: O fitness de cada formiga (na ordem de self.ants).
+        """
+        if engine is None:
+            return [ant.calculate_fitness() for ant in self.ants]
+
+        from genetic import fitness_array
+
+        n = len(self.ants)
+        fitness = fitness_array(
+            engine.fitness_food_collected[:n], engine.fitness_steps_count[:n],
+            engine.ag_speed[:n], engine.ag_pheromone_detection_range[:n], engine.ag_pheromone_strength[:n]
+        ).tolist()
+        for ant, score in zip(self.ants, fitness):
+            ant.fitness_score = score
+        return fitness
+
     def tournament(self):
         """
         Escolhe dois pais para reprodução usando torneio.
@@ -151,18 +390,32 @@ class Colony:
         Returns:
             Ant: O filho gerado pelo cruzamento.
         """
-        child = Ant(self.x, self.y)
-            
+        child = self.spawn_ant(Ant)
+        child.ag_speed, child.ag_pheromone_detection_range, child.ag_pheromone_strength = self.crossover_genes(parent1, parent2)
+        return child
+
+    def crossover_genes(self, parent1, parent2):
+        """
+        Calcula os genes do filho de dois pais: 70% dos genes do melhor pai e 30% do outro pai.
+
+        Parameters:
+            parent1 (Ant): O primeiro pai.
+            parent2 (Ant): O segundo pai.
+
+        Returns:
+            tuple: (ag_speed, ag_pheromone_detection_range, ag_pheromone_strength) do filho.
+        """
         # Crossover com tendência para o melhor pai
         if parent1.fitness_score > parent2.fitness_score:
             better_parent, weaker_parent = parent1, parent2
         else:
             better_parent, weaker_parent = parent2, parent1
                 
-        child.ag_speed = better_parent.ag_speed * 0.7 + weaker_parent.ag_speed * 0.3
-        child.ag_pheromone_detection_range = better_parent.ag_pheromone_detection_range * 0.7 + weaker_parent.ag_pheromone_detection_range * 0.3
-        child.ag_pheromone_strength = better_parent.ag_pheromone_strength * 0.7 + weaker_parent.ag_pheromone_strength * 0.3
-        return child
+        return (
+            better_parent.ag_speed * 0.7 + weaker_parent.ag_speed * 0.3,
+            better_parent.ag_pheromone_detection_range * 0.7 + weaker_parent.ag_pheromone_detection_range * 0.3,
+            better_parent.ag_pheromone_strength * 0.7 + weaker_parent.ag_pheromone_strength * 0.3,
+        )
 
     def select_elite_ants(self):
         """
@@ -183,9 +436,50 @@ class Colony:
             Ant: A formiga selecionada como pai.
         """
         # se quantidade de formigas for menor que o tamanho do torneio, seleciona todas
-        candidates = random.sample(self.ants, min(GlobalVar.AG_TOURNAMENT_SIZE, len(self.ants)))
+        candidates = self.rng.sample(self.ants, min(GlobalVar.AG_TOURNAMENT_SIZE, len(self.ants)))
         return max(candidates, key=self.get_ant_fitness)
 
+    def top_genomes(self, count):
+        """
+        Retorna os genes das melhores formigas pelo fitness da última geração avaliada (a elite fica no começo da lista
+        depois da evolução).
+
+        Parameters:
+            count: Quantidade de genomas.
+
+        Returns:
+            list: Tuplas (ag_speed, ag_pheromone_detection_range, ag_pheromone_strength).
+        """
+        ranked = sorted(self.ants, key=self.get_ant_fitness, reverse=True)
+        return [
+            (ant.ag_speed, ant.ag_pheromone_detection_range, ant.ag_pheromone_strength)
+            for ant in ranked[:count]
+        ]
+
+    def receive_migrants(self, genomes):
+        """
+        Substitui os genes de filhos da geração atual (os de menor fitness, nunca a elite) pelos genes recebidos de
+        outra colônia.
+
+        Parameters:
+            genomes: Tuplas (ag_speed, ag_pheromone_detection_range, ag_pheromone_strength).
+
+        Returns:
+            list: Índices (em self.ants) das formigas substituídas.
+        """
+        # A elite é formada pelas melhores formigas (ordem estável: na evolução por objetos ela está no começo da lista)
+        ants = self.ants
+        elite_size = len(self.select_elite_ants())
+        ranked = sorted(range(len(ants)), key=lambda index: self.get_ant_fitness(ants[index]), reverse=True)
+        children = ranked[elite_size:]
+
+        replaced = []
+        for index, genome in zip(reversed(children), genomes):
+            ant = ants[index]
+            ant.ag_speed, ant.ag_pheromone_detection_range, ant.ag_pheromone_strength = genome
+            replaced.append(index)
+        return replaced
+
     def calculate_average(self, ants, attribute):
         """
         Calcula a média de um atributo para a lista de formigas.
@@ -206,18 +500,40 @@ class Colony:
         
         return total / len(ants)
     
-    def print_statistics(self):
+    def get_statistics(self):
         """
-        Imprime estatísticas da geração atual.
+        Retorna as estatísticas da geração atual.
+
+        Returns:
+            dict: Geração, melhor fitness, comida coletada e médias dos atributos genéticos.
         """
         if self.ants:
             best_fitness = self.ants[0].fitness_score
         else:
             best_fitness = 0
-            
-        avg_speed = self.calculate_average(self.ants, "ag_speed")
-        avg_sense = self.calculate_average(self.ants, "ag_pheromone_detection_range")
-        avg_strength = self.calculate_average(self.ants, "ag_pheromone_strength")
-        
-        print(f"Geração {self.generation}: Melhor Fitness = {best_fitness:.2f}")
-        print(f"Velocidade média: {avg_speed:.2f}, Detecção média: {avg_sense:.2f}, Feromônio médio: {avg_strength:.2f}")
+
+        return {
+            "generation": self.generation,
+            "best_fitness": best_fitness,
+            "food_collected": self.food_collected,
+            "avg_speed": self.calculate_average(self.ants, "ag_speed"),
+            "avg_sense": self.calculate_average(self.ants, "ag_pheromone_detection_range"),
+            "avg_strength": self.calculate_average(self.ants, "ag_pheromone_strength"),
+        }
+
+    def print_statistics(self, stats=None):
+        """
+        Imprime estatísticas da geração atual (e guarda no histórico de gerações).
+
+        Parameters:
+            stats (opcional): Estatísticas já calculadas (padrão = get_statistics()).
+        """
+        if stats is None:
+            stats = self.get_statistics()
+        self.generation_history.append(stats)
+
+        if not GlobalVar.PRINT_STATISTICS:
+            return
+
+        print(f"Geração {stats['generation']}: Melhor Fitness = {stats['best_fitness']:.2f}")
+        print(f"Velocidade média: {stats['avg_speed']:.2f}, Detecção média: {stats['avg_sense']:.2f}, Feromônio médio: {stats['avg_strength']:.2f}")
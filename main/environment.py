@@ -1,9 +1,12 @@
-import random
+import heapq
 from ant import euclidean_distance
 from colony import Colony
 from food_source import FoodSource
-from pheromone import Pheromone
+from pheromone import Pheromone, PheromoneClock
+from spatial_hash import SpatialHash
 from global_var import GlobalVar
+from profiler import Profiler
+from rng import ENVIRONMENT_STREAM, RandomStreams
 
 class Environment:
     """
@@ -12,34 +15,101 @@ class Environment:
     e o gerenciamento de feromônios e comida.
 
     Atributos:
+        random_streams: Fábrica das sequências aleatórias da simulação (semente GlobalVar.RANDOM_SEED).
+        rng: Sequência aleatória do ambiente (posições da comida).
         colony: A colônia de formigas no ambiente.
-        food_sources: Fontes de comida disponíveis no ambiente.
-        pheromones: Feromônios ativos no ambiente.
+        food_sources: Fontes de comida disponíveis no ambiente (dicionário ordenado, remoção em O(1)).
+        food_grid: Índice espacial (grade uniforme) das fontes de comida.
+        pheromones: Feromônios ativos no ambiente (dicionário ordenado, remoção em O(1)).
+        pheromone_clock: Relógio compartilhado do decaimento preguiçoso dos feromônios (tick atual).
+        pheromone_expiry: Heap de (tick de expiração, ordem, feromônios) usado para remover os inativos. Cada entrada
+            guarda um lote depositado junto (mesma intensidade e tick, portanto expiram juntos).
+        pheromone_grid: Índice espacial (grade uniforme) dos feromônios ativos.
+        pheromone_field: Campo denso de feromônios (None quando os feromônios são objetos).
+        obstacles: Grade de obstáculos do mundo (None = sem obstáculos).
+        navigation: Campo de navegação até a colônia usado no retorno das formigas (None = sem obstáculos).
+        lod: Agendador de nível de detalhe das formigas ociosas (None = todas atualizadas a cada tick).
         food_delivery_count: Contador de entregas de comida desde a última evolução.
+        steady_state_pending: Substituições pendentes da evolução contínua.
         total_food_collected: Quantidade total de comida coletada na simulação.
+        tick: Quantidade de ticks executados.
+        tick_listeners: Funções chamadas com o ambiente ao final de cada tick (checkpoints, gravação, métricas).
+        population_engine: Motor vetorizado das formigas (None quando as formigas são atualizadas uma a uma; um
+            ParallelEngine quando GlobalVar.PARALLEL_WORKERS > 0).
+        profiler: Instrumentação de tempo por fase e contadores por tick (desabilitada por padrão).
 
     Métodos:
         create_random_food_sources(num_food): Gera fontes de comida em posições aleatórias.
         update(): Atualiza o estado do ambiente, incluindo o movimento das formigas e a evolução.
-        update_pheromones(): Atualiza a intensidade dos feromônios (remove os inativos).
+        move_ants(): Move as formigas e retorna a quantidade de entregas de comida.
+        sync_ant_views(): Atualiza os objetos das formigas com o estado do motor vetorizado.
+        pheromone_count(): Retorna a quantidade de feromônios ativos.
+        steady_state_evolution(food_delivered_count): Evolução contínua (algumas formigas por tick).
+        update_pheromones(): Avança o relógio dos feromônios (remove os que expiraram).
         find_nearest_pheromone(position, max_distance): Encontra o feromônio mais próximo de uma posição.
-        find_nearest_food(position): Encontra a fonte de comida mais próxima de uma posição.
+        find_nearest_food(position, max_distance): Encontra a fonte de comida mais próxima de uma posição.
+        find_food_in_radius(position, radius): Encontra as fontes de comida dentro de um raio.
+        add_food_source(position, stock): Adiciona uma fonte de comida (inclusive durante a simulação).
         take_food(food_source): Remove uma unidade de comida de uma fonte e verifica se ainda há comida.
         add_pheromone(position, strength): Adiciona um novo feromônio na posição especificada.
+        add_pheromones(positions, strength): Adiciona uma trilha de feromônios de uma vez.
+        set_obstacles(obstacles): Define a grade de obstáculos e calcula o campo de navegação.
+        edit_obstacles(position, radius, blocked): Adiciona ou remove obstáculos durante a simulação.
+        close(): Libera os recursos do motor das formigas (processos do modo paralelo).
     """
-    def __init__(self):
+    def __init__(self, populate=True):
         """
         Construtor do ambiente da simulação.
+
+        Parameters:
+            populate (opcional): Se cria as fontes de comida e as formigas iniciais (False = ambiente vazio, usado para
+                restaurar checkpoints).
         """
-        self.colony = Colony(GlobalVar.WINDOW_WIDTH // 2, GlobalVar.WINDOW_HEIGHT // 2)
-        self.food_sources = []
-        self.pheromones = []
+        self.random_streams = RandomStreams(GlobalVar.RANDOM_SEED)
+        self.rng = self.random_streams.stream(ENVIRONMENT_STREAM)
+        self.colony = Colony(GlobalVar.WORLD_WIDTH // 2, GlobalVar.WORLD_HEIGHT // 2, self.random_streams)
+        self.food_sources = {}
+        self.food_grid = SpatialHash(GlobalVar.FOOD_GRID_CELL_SIZE)
+        self.pheromones = {}
+        self.pheromone_clock = PheromoneClock(GlobalVar.PHEROMONE_DECAY_RATE)
+        self.pheromone_expiry = []
+        self._pheromone_order = 0
+        self.pheromone_grid = SpatialHash(GlobalVar.PHEROMONE_GRID_CELL_SIZE)
+        self.pheromone_field = None
+        if GlobalVar.PHEROMONE_BACKEND == "field":
+            from pheromone_field import PheromoneField
+            self.pheromone_field = PheromoneField(GlobalVar.WORLD_WIDTH, GlobalVar.WORLD_HEIGHT)
+
+        self.population_engine = None
+        self.obstacles = None
+        self.navigation = None
+        if GlobalVar.OBSTACLE_MAP:
+            from navigation import ObstacleMap
+            self.set_obstacles(ObstacleMap.load(GlobalVar.OBSTACLE_MAP))
         
-        self.create_random_food_sources(GlobalVar.FOOD_AVAILABLE)
-        self.colony.create_ants(GlobalVar.ANT_POPULATION_SIZE)
+        if populate:
+            self.create_random_food_sources(GlobalVar.FOOD_AVAILABLE)
+            self.colony.create_ants(GlobalVar.ANT_POPULATION_SIZE)
         
+        self.tick = 0
         self.food_delivery_count = 0
+        self.steady_state_pending = 0
         self.total_food_collected = 0
+        self.tick_listeners = []
+        self.profiler = Profiler(GlobalVar.PROFILER_ENABLED, GlobalVar.PROFILER_WINDOW, GlobalVar.PROFILER_OUTPUT)
+        
+        if GlobalVar.PARALLEL_WORKERS:
+            from parallel_engine import ParallelEngine
+            self.population_engine = ParallelEngine(self.colony, self)
+        elif GlobalVar.USE_VECTORIZED_ANTS:
+            from population_engine import PopulationEngine
+            self.population_engine = PopulationEngine(self.colony, self.navigation)
+
+        # Agendador LOD (só no loop por objeto; o motor vetorizado já faz as buscas em lote)
+        self.lod = None
+        if GlobalVar.LOD_INTERVAL > 1 and self.population_engine is None:
+            from lod import LodScheduler
+            self.lod = LodScheduler()
     
     def create_random_food_sources(self, num_food):
         """
@@ -50,10 +120,34 @@ class Environment:
         """
         for _ in range(num_food):
             pos = (
-                random.randint(50, GlobalVar.WINDOW_WIDTH - 50),
-                random.randint(50, GlobalVar.WINDOW_HEIGHT - 50)
+                self.rng.randint(50, GlobalVar.WORLD_WIDTH - 50),
+                self.rng.randint(50, GlobalVar.WORLD_HEIGHT - 50)
             )
-            self.food_sources.append(FoodSource(pos, GlobalVar.FOOD_STORAGE_CAPACITY))
+            # Sorteia de novo as posições dentro de obstáculos (algumas tentativas)
+            attempts = 0
+            while self.obstacles is not None and self.obstacles.is_blocked(pos) and attempts < 100:
+                pos = (
+                    self.rng.randint(50, GlobalVar.WORLD_WIDTH - 50),
+                    self.rng.randint(50, GlobalVar.WORLD_HEIGHT - 50)
+                )
+                attempts += 1
+            self.add_food_source(pos, GlobalVar.FOOD_STORAGE_CAPACITY)
+
+    def add_food_source(self, position, stock):
+        """
+        Adiciona uma fonte de comida ao ambiente e ao índice espacial (pode ser usado para comida que reaparece).
+
+        Parameters:
+            position: Coordenadas (x, y) da fonte de comida.
+            stock: Quantidade inicial de unidades de comida.
+
+        Returns:
+            FoodSource: A fonte de comida criada.
+        """
+        food_source = FoodSource(position, stock)
+        self.food_sources[food_source] = None
+        self.food_grid.insert(food_source, position)
+        return food_source
     
     def update(self):
         """
@@ -62,44 +156,135 @@ class Environment:
             Evolui as formigas se a quantidade de comida entregue atingir o limite.
             Atualiza a intensidade dos feromônios no ambiente.
         """
-        food_delivered_count = 0
+        profiler = self.profiler
+        update_start = profiler.start()
         
-        for ant in self.colony.ants:
-            food_delivered = ant.move(self)
-            if food_delivered:
-                food_delivered_count += 1
-                self.food_delivery_count += 1
-                self.colony.food_collected += 1
-                self.total_food_collected += 1
-
-        for ant_scout in self.colony.ants_scout:
-            food_delivered = ant_scout.move(self)
-            if food_delivered:
-                food_delivered_count += 1
-                self.food_delivery_count += 1
-                self.colony.food_collected += 1
-                self.total_food_collected += 1
+        start = profiler.start()
+        food_delivered_count = self.move_ants()
+        profiler.stop("move", start)
+        profiler.count("deliveries", food_delivered_count)
+        
+        self.food_delivery_count += food_delivered_count
+        self.colony.food_collected += food_delivered_count
+        self.total_food_collected += food_delivered_count
         
         # Evolui formigas se necessário
-        if self.food_delivery_count >= GlobalVar.AG_FOOD_COLLECT_TO_EVOLVE:
-            self.colony.evolve_ants()
+        if GlobalVar.AG_EVOLUTION_MODE == "steady_state":
+            start = profiler.start()
+            self.steady_state_evolution(food_delivered_count)
+            profiler.stop("evolve", start)
+        elif self.food_delivery_count >= GlobalVar.AG_FOOD_COLLECT_TO_EVOLVE:
+            start = profiler.start()
+            if self.population_engine is not None and GlobalVar.USE_VECTORIZED_EVOLUTION:
+                # Evolução direto nos arrays do motor (sem copiar o estado de/para os objetos)
+                self.colony.evolve_ants(self.population_engine)
+            else:
+                self.sync_ant_views()
+                self.colony.evolve_ants()
+                if self.population_engine is not None:
+                    self.population_engine.load()
             self.food_delivery_count = 0
+            profiler.stop("evolve", start)
         
         # Atualiza feromônios
+        start = profiler.start()
         self.update_pheromones()
+        profiler.stop("update_pheromones", start)
+        
+        profiler.stop("update", update_start)
+        if profiler.enabled:
+            profiler.end_tick(pheromones=self.pheromone_count(), ants=len(self.colony.ants) + len(self.colony.ants_scout))
+        
+        self.tick += 1
+        for listener in self.tick_listeners:
+            listener(self)
+    
+    def move_ants(self):
+        """
+        Move as formigas (normais e exploradoras) e realiza interações com comida e colônia.
+
+        Returns:
+            int: Quantidade de formigas que entregaram comida na colônia.
+        """
+        if self.population_engine is not None:
+            return self.population_engine.step(self)
+        if self.lod is not None:
+            return self.lod.move_ants(self)
+        
+        food_delivered_count = 0
+        for ant in self.colony.ants:
+            if ant.move(self):
+                food_delivered_count += 1
+
+        for ant_scout in self.colony.ants_scout:
+            if ant_scout.move(self):
+                food_delivered_count += 1
+        
+        return food_delivered_count
+    
+    def pheromone_count(self):
+        """
+        Retorna a quantidade de feromônios ativos (células ativas quando o campo denso está em uso).
+        """
+        if self.pheromone_field is not None:
+            return self.pheromone_field.count()
+        return len(self.pheromones)
+    
+    def steady_state_evolution(self, food_delivered_count):
+        """
+        Evolução contínua: substitui AG_STEADY_STATE_PER_TICK formigas por tick mais AG_STEADY_STATE_PER_DELIVERY por
+        entrega (None = o ritmo do modo por gerações: a população que não é elite a cada AG_FOOD_COLLECT_TO_EVOLVE
+        entregas). No máximo AG_STEADY_STATE_MAX_PER_TICK substituições são feitas por tick; o restante fica pendente
+        para os próximos ticks, assim o custo da evolução é distribuído.
+
+        Parameters:
+            food_delivered_count: Quantidade de entregas neste tick.
+        """
+        colony = self.colony
+        per_delivery = GlobalVar.AG_STEADY_STATE_PER_DELIVERY
+        if per_delivery is None:
+            generation_size = len(colony.ants) - len(colony.select_elite_ants())
+            per_delivery = -(-generation_size // GlobalVar.AG_FOOD_COLLECT_TO_EVOLVE)
+
+        self.steady_state_pending += GlobalVar.AG_STEADY_STATE_PER_TICK + per_delivery * food_delivered_count
+        replacements = min(self.steady_state_pending, GlobalVar.AG_STEADY_STATE_MAX_PER_TICK)
+        if replacements > 0:
+            colony.steady_state_step(replacements, self.population_engine)
+            self.steady_state_pending -= replacements
+        self.food_delivery_count = 0
+    
+    def sync_ant_views(self):
+        """
+        Copia o estado do motor vetorizado para os objetos das formigas (sem efeito quando ele não está em uso).
+        """
+        if self.population_engine is not None:
+            self.population_engine.write_back()
     
     def update_pheromones(self):
         """
-        Atualiza a intensidade dos feromônios e remove os inativos.
+        Avança um tick no decaimento dos feromônios e remove os inativos. A intensidade é calculada apenas na leitura
+        (decaimento preguiçoso), então só os feromônios que expiram neste tick são visitados, em ordem do heap de
+        expiração.
         """
-        active_pheromones = []
-        for pheromone in self.pheromones:
-            pheromone.gradual_decay(GlobalVar.PHEROMONE_DECAY_RATE)
-            
-            if pheromone.is_active():
-                active_pheromones.append(pheromone)
+        if self.pheromone_field is not None:
+            self.pheromone_field.update()
+            return
+        
+        clock = self.pheromone_clock
+        clock.tick += 1
         
-        self.pheromones = active_pheromones
+        expiry = self.pheromone_expiry
+        while expiry and expiry[0][0] <= clock.tick:
+            _, order, batch = heapq.heappop(expiry)
+            
+            # A expiração estimada pode ser adiantada, confirma com a intensidade exata
+            if batch[0].is_active():
+                heapq.heappush(expiry, (clock.tick + 1, order, batch))
+                continue
+            
+            for pheromone in batch:
+                del self.pheromones[pheromone]
+                self.pheromone_grid.remove(pheromone)
     
     def find_nearest_pheromone(self, position, max_distance):
         """
@@ -110,57 +295,73 @@ class Environment:
             max_distance: A distância máxima para considerar feromônios.
 
         Returns:
-            Pheromone: O feromônio mais próximo ou None se nenhum for encontrado.
+            tuple: A posição (x, y) do feromônio mais próximo (com o campo denso, do ponto mais atrativo) ou None se
+                nenhum for encontrado.
+        """
+        profiler = self.profiler
+        start = profiler.start()
+        target = self._find_nearest_pheromone(position, max_distance)
+        profiler.stop("pheromone_search", start)
+        profiler.count("pheromone_queries")
+        return target
+    
+    def _find_nearest_pheromone(self, position, max_distance):
         """
+        Busca de find_nearest_pheromone (sem a instrumentação).
+        """
+        if self.pheromone_field is not None:
+            return self.pheromone_field.find_best(position, max_distance)
+        
         if not self.pheromones:
             return None
         
-        # Filtra feromônios dentro do alcance
-        in_range_pheromones = []
-        for phero in self.pheromones:
-            distance = euclidean_distance(position, phero.position)
-            if distance <= max_distance:
-                in_range_pheromones.append(phero)
-                
-        if not in_range_pheromones:
-            return None
-            
-        # Escolhe o mais próximo, ponderado pela intensidade
+        # Escolhe o mais próximo dentro do alcance, ponderado pela intensidade (somente nas células que cobrem o alcance)
         best_pheromone = None
         best_attractiveness = -1
+        best_order = -1
         
-        for pheromone in in_range_pheromones:
-            distance = max(1, euclidean_distance(position, pheromone.position))
-            attractiveness = pheromone.intensity / distance
+        for pheromone, order in self.pheromone_grid.query(position, max_distance):
+            distance = euclidean_distance(position, pheromone.position)
+            if distance > max_distance:
+                continue
+            
+            attractiveness = pheromone.intensity / max(1, distance)
             
-            if best_pheromone is None or attractiveness > best_attractiveness:
+            # Em caso de empate vence o feromônio mais antigo (mesmo resultado da busca linear na lista)
+            if (best_pheromone is None or attractiveness > best_attractiveness
+                    or (attractiveness == best_attractiveness and order < best_order)):
                 best_pheromone = pheromone
                 best_attractiveness = attractiveness
+                best_order = order
         
-        return best_pheromone
+        return best_pheromone.position if best_pheromone is not None else None
     
-    def find_nearest_food(self, position):
+    def find_nearest_food(self, position, max_distance=None):
         """
-        Encontra a fonte de comida mais próxima.
+        Encontra a fonte de comida mais próxima (busca no índice espacial).
 
         Parameters:
             position: A posição (x, y) da formiga.
+            max_distance (opcional): A distância máxima para considerar fontes de comida (None = sem limite).
 
         Returns:
             FoodSource: A fonte de comida mais próxima ou None se nenhuma for encontrada.
         """
-        if not self.food_sources:
-            return None
-        
-        nearest_food = None
-        min_distance = float('inf')
-        for food in self.food_sources:
-            distance = euclidean_distance(position, food.position)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_food = food
-        
-        return nearest_food
+        self.profiler.count("food_queries")
+        return self.food_grid.nearest(position, max_distance)
+    
+    def find_food_in_radius(self, position, radius):
+        """
+        Encontra as fontes de comida dentro de um raio.
+
+        Parameters:
+            position: A posição (x, y) de referência.
+            radius: O raio de busca.
+
+        Returns:
+            list: Fontes de comida dentro do raio (na ordem em que foram criadas).
+        """
+        return self.food_grid.within(position, radius)
     
     def take_food(self, food_source):
         """
@@ -174,7 +375,8 @@ class Environment:
         """
         has_food = food_source.decrement_food_stock()
         if not has_food:
-            self.food_sources.remove(food_source)
+            del self.food_sources[food_source]
+            self.food_grid.remove(food_source)
         return has_food
     
     def add_pheromone(self, position, strength = 1.0):
@@ -185,5 +387,86 @@ class Environment:
             position: A posição (x, y) onde o feromônio será adicionado.
             strength (opcional): A força inicial do feromônio (padrão = 1.0).
         """
+        self.add_pheromones([position], strength)
+    
+    def add_pheromones(self, positions, strength = 1.0):
+        """
+        Adiciona uma trilha de feromônios de uma vez (todos com a mesma intensidade). Com feromônios como objetos, o
+        lote ocupa uma única entrada no heap de expiração.
+
+        Parameters:
+            positions: Lista de posições (x, y) dos feromônios.
+            strength (opcional): A força inicial dos feromônios (padrão = 1.0).
+        """
         intensity = GlobalVar.FOOD_STORAGE_CAPACITY * strength
-        self.pheromones.append(Pheromone(position, intensity))
+        if self.pheromone_field is not None:
+            xs = [position[0] for position in positions]
+            ys = [position[1] for position in positions]
+            self.pheromone_field.deposit_many(xs, ys, intensity)
+            return
+        
+        clock = self.pheromone_clock
+        pheromones = self.pheromones
+        grid = self.pheromone_grid
+        batch = [Pheromone(position, intensity, clock) for position in positions]
+        for pheromone in batch:
+            pheromones[pheromone] = None
+            grid.insert(pheromone, pheromone.position)
+        
+        if not batch:
+            return
+        expiry_tick = batch[0].expiry_tick()
+        if expiry_tick is not None:
+            heapq.heappush(self.pheromone_expiry, (expiry_tick, self._pheromone_order, batch))
+            self._pheromone_order += 1
+
+    def set_obstacles(self, obstacles):
+        """
+        Define a grade de obstáculos e calcula o campo de navegação até a colônia (o motor vetorizado passa a usar o
+        novo campo).
+
+        Parameters:
+            obstacles: Grade de obstáculos (ObstacleMap).
+
+        Raises:
+            ValueError: Se a colônia está dentro de um obstáculo.
+        """
+        from navigation import NavigationField
+
+        if obstacles.is_blocked(self.colony.position):
+            raise ValueError("A colônia está dentro de um obstáculo do mapa.")
+        self.obstacles = obstacles
+        self.navigation = NavigationField(obstacles, self.colony.position)
+        if self.population_engine is not None:
+            self.population_engine.navigation = self.navigation
+
+    def edit_obstacles(self, position, radius=None, blocked=True):
+        """
+        Adiciona (ou remove) obstáculos em um círculo durante a simulação. Só a região afetada do campo de navegação é
+        recalculada. A célula da colônia nunca é bloqueada.
+
+        Parameters:
+            position: Centro do círculo.
+            radius (opcional): Raio do círculo (padrão = GlobalVar.OBSTACLE_BRUSH_RADIUS).
+            blocked (opcional): True adiciona obstáculos, False remove.
+
+        Returns:
+            list: Células (cx, cy) alteradas.
+        """
+        if self.obstacles is None:
+            if not blocked:
+                return []
+            from navigation import ObstacleMap
+            self.set_obstacles(ObstacleMap(GlobalVar.WORLD_WIDTH, GlobalVar.WORLD_HEIGHT))
+
+        radius = radius if radius is not None else GlobalVar.OBSTACLE_BRUSH_RADIUS
+        changed = self.obstacles.paint(position, radius, blocked, protected=[self.colony.position])
+        self.navigation.update(changed)
+        return changed
+
+    def close(self):
+        """
+        Libera os recursos do motor das formigas (processos e memória compartilhada do modo paralelo).
+        """
+        if self.population_engine is not None:
+            self.population_engine.close()
@@ -0,0 +1,123 @@
+import numpy as np
+
+from global_var import GlobalVar
+
+def fitness_array(food_collected, steps_count, speed, sense, strength):
+    """
+    Versão vetorizada de Ant.calculate_fitness (mesmos pesos e mesma ordem das operações).
+
+    Parameters:
+        food_collected, steps_count: Arrays com os contadores de fitness das formigas.
+        speed, sense, strength: Arrays com os atributos genéticos.
+
+    Returns:
+        ndarray: O fitness de cada formiga.
+    """
+    efficiency = food_collected / np.maximum(1, steps_count)
+    speed_bonus = speed / GlobalVar.ANT_INITIAL_SPEED
+    sense_bonus = sense / GlobalVar.ANT_INITIAL_PHEROMONE_SENSE
+    strength_bonus = strength / GlobalVar.ANT_INITIAL_PHEROMONE_STRENGTH
+
+    fitness = efficiency * 0.6 + speed_bonus * 0.2 + sense_bonus * 0.1 + strength_bonus * 0.1
+    fitness[food_collected == 0] = 0.1
+    return fitness
+
+class GenerationArrays:
+    """
+    Resultado de uma geração do algoritmo genético vetorizado.
+
+    Atributos:
+        fitness: Fitness de cada formiga da geração avaliada.
+        elite: Índices das formigas da elite (mantêm os genes).
+        children: Índices das posições que recebem os filhos (todas as que não são elite, em ordem).
+        speed, sense, strength: Genes dos filhos (na ordem de children).
+        statistics: Estatísticas da geração avaliada (mesmas chaves de Colony.get_statistics, sem generation e
+            food_collected).
+    """
+    def __init__(self, fitness, elite, children, speed, sense, strength, statistics):
+        self.fitness = fitness
+        self.elite = elite
+        self.children = children
+        self.speed = speed
+        self.sense = sense
+        self.strength = strength
+        self.statistics = statistics
+
+def evolve_arrays(speed, sense, strength, food_collected, steps_count, rng):
+    """
+    Uma geração do algoritmo genético sobre arrays de genomas: fitness em lote, elite com argpartition, todos os
+    torneios sorteados de uma vez e cruzamento/mutação aplicados nos arrays inteiros. Os filhos ocupam as posições das
+    formigas que não são elite (nenhum objeto novo é criado).
+
+    Diferenças em relação a Colony.evolve_population:
+        Os candidatos de cada torneio são sorteados com reposição.
+        Os números aleatórios do torneio, cruzamento e mutação vêm todos da sequência da colônia.
+
+    Parameters:
+        speed, sense, strength: Arrays com os genes das formigas.
+        food_collected, steps_count: Arrays com os contadores de fitness.
+        rng: Sequência aleatória da colônia (RandomStream).
+
+    Returns:
+        GenerationArrays: Fitness, elite, posições dos filhos e os genes dos filhos.
+    """
+    n = len(speed)
+    fitness = fitness_array(food_collected, steps_count, speed, sense, strength)
+    statistics = {
+        "best_fitness": float(fitness.max()) if n else 0,
+        "avg_speed": float(speed.mean()) if n else 0,
+        "avg_sense": float(sense.mean()) if n else 0,
+        "avg_strength": float(strength.mean()) if n else 0,
+    }
+
+    elite_size = min(n, max(2, int(n * GlobalVar.AG_ELITE_PERCENTAGE)))
+    if elite_size < n:
+        elite = np.argpartition(-fitness, elite_size - 1)[:elite_size]
+    else:
+        elite = np.arange(n)
+    is_child = np.ones(n, dtype=bool)
+    is_child[elite] = False
+    children = np.flatnonzero(is_child)
+    count = len(children)
+
+    empty = np.empty(0, dtype=np.float64)
+    if count == 0:
+        return GenerationArrays(fitness, elite, children, empty, empty, empty, statistics)
+
+    # Torneios: dois pais por filho, cada um o melhor de k candidatos
+    k = min(GlobalVar.AG_TOURNAMENT_SIZE, n)
+    candidates = (rng.random_array((2 * count, k)) * n).astype(np.int64)
+    best = np.argmax(fitness[candidates], axis=1)
+    winners = candidates[np.arange(2 * count), best]
+    parent1, parent2 = winners[:count], winners[count:]
+
+    # Cruzamento com tendência para o melhor pai (70% / 30%)
+    first_is_better = fitness[parent1] > fitness[parent2]
+    better = np.where(first_is_better, parent1, parent2)
+    weaker = np.where(first_is_better, parent2, parent1)
+    child_speed = speed[better] * 0.7 + speed[weaker] * 0.3
+    child_sense = sense[better] * 0.7 + sense[weaker] * 0.3
+    child_strength = strength[better] * 0.7 + strength[weaker] * 0.3
+
+    # Mutação: sorteio da ocorrência, do atributo e da intensidade
+    draws = rng.random_array((3, count))
+    mutated = draws[0] < GlobalVar.AG_MUTATION_RATE
+    attribute = (draws[1] * 3).astype(np.int64)
+    amount = draws[2]
+    force = GlobalVar.AG_MUTATION_FORCE
+
+    # Como em Ant.mutate, só o atributo mutado é limitado ao intervalo válido
+    selected = mutated & (attribute == 0)
+    child_speed[selected] = np.clip(
+        child_speed[selected] + (-1.0 + 2.0 * amount[selected]) * force, 1.0, GlobalVar.ANT_MAX_SPEED
+    )
+    selected = mutated & (attribute == 1)
+    child_sense[selected] = np.clip(
+        child_sense[selected] + (-20 + 40 * amount[selected]) * force, 10.0, GlobalVar.ANT_MAX_PHEROMONE_SENSE
+    )
+    selected = mutated & (attribute == 2)
+    child_strength[selected] = np.clip(
+        child_strength[selected] + (-0.5 + 1.0 * amount[selected]) * force, 0.5, GlobalVar.ANT_MAX_PHEROMONE_STRENGTH
+    )
+
+    return GenerationArrays(fitness, elite, children, child_speed, child_sense, child_strength, statistics)
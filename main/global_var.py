@@ -1,4 +1,5 @@
 import math
+from contextlib import contextmanager
 
 class GlobalVar:
     """
@@ -8,6 +9,13 @@ class GlobalVar:
     WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
     WINDOW_BACKGROUND_COLOR = (81, 58, 42)  # Marrom
 
+    # Mundo (pode ser maior que a janela; a câmera mostra uma parte dele)
+    WORLD_WIDTH, WORLD_HEIGHT = 800, 600
+
+    # Câmera
+    CAMERA_MAX_ZOOM = 8.0  # Zoom máximo (o mínimo mostra o mundo inteiro)
+    CAMERA_ZOOM_STEP = 1.25  # Fator de zoom por passo da roda do mouse ou das teclas +/-
+
     # Colônia
     COLONY_COLOR = (53, 40, 30)  # Marrom escuro
     COLONY_RADIUS = 10
@@ -19,14 +27,33 @@ class GlobalVar:
     ANT_SCOUT_WITH_FOOD_COLOR = (0, 255, 0)  # Verde
     ANT_POPULATION_SIZE = 200
     ANT_SCOUT_COLOR_POPULATION_SIZE = ANT_POPULATION_SIZE//4
+    USE_VECTORIZED_ANTS = False  # Atualiza as formigas com o motor vetorizado (NumPy)
+    LOD_INTERVAL = 0  # Atualiza as formigas ociosas a cada N ticks (agendador LOD; 0 ou 1 = desabilitado; loop por objeto)
+    LOD_CELL_SIZE = 25  # Tamanho das células da grade de interesse do agendador LOD
+    PARALLEL_WORKERS = 0  # Processos do motor paralelo por tiles (0 = desabilitado; requer PHEROMONE_BACKEND = "field")
+    PARALLEL_REBALANCE_INTERVAL = 10  # Intervalo (em ticks) entre verificações do equilíbrio dos tiles
+    PARALLEL_IMBALANCE = 1.2  # Recalcula as fronteiras se o tile mais cheio passar dessa razão sobre a média
     
+    # Obstáculos (navigation.py)
+    OBSTACLE_MAP = None  # Mapa de obstáculos: texto (.txt/.map, "#" = obstáculo) ou imagem (pixels escuros); None = sem
+    OBSTACLE_CELL_SIZE = 10  # Tamanho (em pixels do mundo) da célula da grade de obstáculos e do campo de navegação
+    OBSTACLE_BRUSH_RADIUS = 20  # Raio dos obstáculos adicionados/removidos com o mouse
+    OBSTACLE_COLOR = (110, 90, 70)
+
     # Comida 
     FOOD_AVAILABLE = 40
     FOOD_STORAGE_CAPACITY = 15
+    FOOD_PICKUP_RADIUS = 15  # Distância para a formiga pegar comida
+    FOOD_GRID_CELL_SIZE = 30  # Tamanho da célula do índice espacial de comida
 
     # Feromônio
     PHEROMONE_COLOR = (255, 255, 0)  # Amarelo
     PHEROMONE_DECAY_RATE = 0.2
+    PHEROMONE_GRID_CELL_SIZE = 50  # Tamanho da célula do índice espacial de feromônios (próximo do alcance de detecção)
+    PHEROMONE_TRAIL_SPACING = None  # Distância entre feromônios da trilha (None = um por passo da formiga)
+    PHEROMONE_BACKEND = "objects"  # "objects" (um objeto por feromônio) ou "field" (campo denso NumPy)
+    PHEROMONE_FIELD_RESOLUTION = 4  # Tamanho (em pixels) da célula do campo denso
+    PHEROMONE_FIELD_DIFFUSION = 0.0  # Fração espalhada para as células vizinhas a cada tick
 
     # Evolução
     AG_MUTATION_RATE = 0.3  # Probabilidade de mutação (Aumentado de 0.1 para 0.3)
@@ -34,6 +61,18 @@ class GlobalVar:
     AG_FOOD_COLLECT_TO_EVOLVE = 10  # Número de gerações para evolução (Reduzido de 5 para 3)
     AG_ELITE_PERCENTAGE = 0.2  # 20% das melhores formigas sobrevivem
     AG_TOURNAMENT_SIZE = 5  # Tamanho do torneio de seleção (Aumentado para 5)
+    USE_VECTORIZED_EVOLUTION = False  # Evolui a população com operações em lote sobre arrays de genomas (NumPy)
+    AG_EVOLUTION_MODE = "generational"  # "generational" (toda a população de uma vez) ou "steady_state" (aos poucos)
+    AG_STEADY_STATE_PER_DELIVERY = None  # Substituições por entrega (None = mesmo ritmo do modo por gerações)
+    AG_STEADY_STATE_PER_TICK = 0  # Substituições por tick (além das por entrega)
+    AG_STEADY_STATE_MIN_AGE = 100  # Passos mínimos antes de uma formiga poder ser substituída
+    AG_STEADY_STATE_MAX_PER_TICK = 50  # Limite de substituições por tick (o excesso fica para os próximos ticks)
+
+    # Modelo de ilhas (várias colônias em processos separados com migração)
+    ISLAND_COUNT = 4  # Quantidade de ilhas (uma por processo)
+    ISLAND_MIGRATION_INTERVAL = 5  # Gerações entre migrações
+    ISLAND_MIGRANTS = 5  # Quantidade de genomas enviados por ilha em cada migração
+    ISLAND_TOPOLOGY = "ring"  # "ring" (anel), "full" (todas para todas) ou "random" (destino sorteado)
 
     # Atributos iniciais e limites dasformigas
     ANT_INITIAL_SPEED = 3.0
@@ -43,4 +82,60 @@ class GlobalVar:
     ANT_INITIAL_PHEROMONE_STRENGTH = 1.0
     ANT_MAX_PHEROMONE_STRENGTH = 5.0
 
-    FPS = 30  
\ No newline at end of file
+    FPS = 30
+    SIM_MIN_BUDGET_FRACTION = 0.25  # Fração mínima do quadro reservada para a simulação na velocidade máxima
+    PHEROMONE_SPRITE_ALPHA_STEP = 1  # Quantização da opacidade no cache de imagens dos feromônios (1 = exato)
+    RENDER_BATCH_BLITS = True  # Desenha todos os feromônios com uma única chamada a Surface.blits
+    RENDER_BULK = True  # Desenha formigas e feromônios em lote (NumPy/surfarray) em vez de um círculo por objeto
+    RENDER_BULK_MIN_COUNT = 1000  # Quantidade mínima de formigas (ou feromônios) para usar o desenho em lote
+
+    # Números aleatórios
+    RANDOM_SEED = None  # Semente das sequências aleatórias (None = sorteada com o módulo random)
+    RANDOM_BLOCK_SIZE = 256  # Tamanho máximo do bloco de números pré-gerados de cada sequência
+
+    # Saída
+    PRINT_STATISTICS = True  # Imprime as estatísticas a cada geração
+
+    # Profiler (tempo por fase e contadores por tick)
+    PROFILER_ENABLED = False
+    PROFILER_WINDOW = 300  # Quantidade de ticks usados nos percentis
+    PROFILER_OUTPUT = None  # Arquivo .csv ou JSON lines com uma linha por tick (None = não grava)
+
+    # Gravação da trajetória (recorder.py)
+    RECORDER_INTERVAL = 1  # Intervalo (em ticks) entre registros das formigas
+    RECORDER_SNAPSHOT_INTERVAL = 100  # Intervalo (em ticks) entre instantâneos de feromônios e comida
+    RECORDER_CHUNK_TICKS = 256  # Quantidade de ticks por bloco (arquivo) de registros
+
+    # Replay (replay.py)
+    REPLAY_OUTPUT = None  # Arquivo do replay gravado durante a simulação com interface (None = não grava)
+    REPLAY_KEYFRAME_INTERVAL = 500  # Intervalo (em ticks) entre quadros-chave com o estado completo
+    REPLAY_POSITION_SCALE = 8  # Subdivisões do pixel nas posições gravadas (precisão de 1/8 pixel)
+
+    # Servidor local de métricas e controle (metrics_server.py)
+    METRICS_PORT = None  # Porta do servidor HTTP (None = desabilitado; 0 = porta livre escolhida pelo sistema)
+    METRICS_HOST = "127.0.0.1"
+    METRICS_INTERVAL = 1  # Intervalo (em ticks) entre registros de métricas
+    METRICS_BUFFER_SIZE = 4096  # Registros guardados nos buffers circulares (por tick e por geração)
+    METRICS_STREAM_INTERVAL = 0.25  # Intervalo (em segundos) entre envios do GET /stream
+
+    @classmethod
+    @contextmanager
+    def override(cls, **values):
+        """
+        Altera temporariamente configurações globais e restaura os valores originais ao sair do bloco with.
+
+        Parameters:
+            values: Pares NOME=valor das configurações a serem alteradas.
+        """
+        unknown = [name for name in values if not hasattr(cls, name)]
+        if unknown:
+            raise AttributeError(f"Configurações desconhecidas: {', '.join(unknown)}")
+
+        previous = {name: getattr(cls, name) for name in values}
+        for name, value in values.items():
+            setattr(cls, name, value)
+        try:
+            yield cls
+        finally:
+            for name, value in previous.items():
+                setattr(cls, name, value)
@@ -0,0 +1,267 @@
+import argparse
+import time
+
+from environment import Environment
+from global_var import GlobalVar
+
+class HeadlessSimulation:
+    """
+    Classe da simulação sem interface gráfica (não importa o pygame). Ela executa o environment o mais rápido possível,
+    sem o limite de FPS do renderer, até atingir uma quantidade de ticks, gerações ou comida coletada.
+
+    Atributos:
+        environment: Representa o ambiente da simulação (contêm informações sobre a colônia, fontes de comida e feromônios).
+        max_ticks: Quantidade máxima de ticks (None = sem limite).
+        max_generations: Geração a ser atingida (None = sem limite).
+        food_target: Quantidade de comida coletada a ser atingida (None = sem limite).
+        ticks: Quantidade de ticks executados.
+        elapsed: Tempo de execução em segundos (sem o tempo pausado).
+        metrics: Servidor de métricas e controle (None = sem servidor).
+        paused: Se a execução está pausada (por um comando do servidor de métricas).
+        pending_steps: Ticks a serem executados enquanto pausada.
+        ticks_per_frame: Limite de velocidade em ticks por quadro de GlobalVar.FPS (None = sem limite).
+
+    Métodos:
+        run(): Executa o loop da simulação até atingir algum dos critérios de parada.
+        handle_command(command, value): Aplica um comando de controle (pausa, passo, velocidade, snapshot).
+        is_finished(): Verifica se algum critério de parada foi atingido.
+        is_food_exhausted(): Verifica se a comida do ambiente acabou.
+        ticks_per_second(): Retorna a taxa de ticks por segundo da execução.
+        print_summary(): Imprime o resumo da execução.
+    """
+    def __init__(self, max_ticks=None, max_generations=None, food_target=None, environment=None, metrics=None):
+        """
+        Cria o ambiente da simulação.
+
+        Parameters:
+            max_ticks (opcional): Quantidade máxima de ticks.
+            max_generations (opcional): Geração a ser atingida.
+            food_target (opcional): Quantidade de comida coletada a ser atingida.
+            environment (opcional): Ambiente já existente (ex.: restaurado de um checkpoint).
+            metrics (opcional): Servidor de métricas (registrado no ambiente e consultado a cada tick por comandos).
+        """
+        if max_ticks is None and max_generations is None and food_target is None:
+            raise ValueError("Informe ao menos um critério de parada (ticks, gerações ou comida).")
+
+        self.environment = environment if environment is not None else Environment()
+        self.max_ticks = max_ticks
+        self.max_generations = max_generations
+        self.food_target = food_target
+        self.ticks = 0
+        self.elapsed = 0.0
+
+        self.metrics = metrics
+        self.paused = False
+        self.pending_steps = 0
+        self.ticks_per_frame = None
+        if metrics is not None:
+            metrics.attach(self.environment)
+
+    def is_finished(self):
+        """
+        Retorna True se algum critério de parada foi atingido, caso contrário False.
+        """
+        if self.max_ticks is not None and self.ticks >= self.max_ticks:
+            return True
+        if self.max_generations is not None and self.environment.colony.generation >= self.max_generations:
+            return True
+        if self.food_target is not None and self.environment.total_food_collected >= self.food_target:
+            return True
+        return self.is_food_exhausted()
+
+    def is_food_exhausted(self):
+        """
+        Retorna True se não há mais comida no ambiente nem formigas carregando comida (a simulação não evolui mais).
+        """
+        if self.environment.food_sources:
+            return False
+
+        self.environment.sync_ant_views()
+        colony = self.environment.colony
+        return not any(ant.has_food for ant in colony.ants + colony.ants_scout)
+
+    def run(self):
+        """
+        Executa o loop principal sem renderização nem limite de FPS. O tempo em que a execução fica pausada não entra
+        em elapsed.
+        """
+        start = time.perf_counter()
+        next_tick = start
+        paused_time = 0.0
+
+        while not self.is_finished():
+            if self.metrics is not None:
+                iteration_start = time.perf_counter()
+                if self.metrics.commands:
+                    for command, value in self.metrics.poll_commands():
+                        self.handle_command(command, value)
+                if self.paused and self.pending_steps == 0:
+                    time.sleep(0.01)
+                    paused_time += time.perf_counter() - iteration_start
+                    continue
+                if self.ticks_per_frame is not None and not self.paused:
+                    # Velocidade limitada: ticks_per_frame ticks por quadro de GlobalVar.FPS
+                    now = time.perf_counter()
+                    if now < next_tick:
+                        time.sleep(next_tick - now)
+                    next_tick = max(now, next_tick) + 1.0 / (self.ticks_per_frame * GlobalVar.FPS)
+
+            self.environment.update()
+            self.ticks += 1
+            if self.pending_steps > 0:
+                self.pending_steps -= 1
+
+        self.elapsed = time.perf_counter() - start - paused_time
+
+    def handle_command(self, command, value):
+        """
+        Aplica um comando de controle recebido pelo servidor de métricas.
+
+        Parameters:
+            command: "pause" (value = True, False ou None para alternar), "step" (value = quantidade de ticks),
+                "speed" (value = ticks por quadro, None = sem limite) ou "snapshot" (value = arquivo do checkpoint).
+            value: Valor do comando.
+        """
+        if command == "pause":
+            self.paused = not self.paused if value is None else value
+        elif command == "step":
+            self.paused = True
+            self.pending_steps += value
+        elif command == "speed":
+            self.ticks_per_frame = value
+            self.paused = False
+        elif command == "snapshot":
+            self.metrics.snapshot(self.environment, value)
+        self.metrics.set_status(paused=self.paused, speed=self.ticks_per_frame)
+
+    def ticks_per_second(self):
+        """
+        Retorna a quantidade de ticks executados por segundo.
+        """
+        return self.ticks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def print_summary(self):
+        """
+        Imprime o desempenho da execução e as estatísticas das gerações.
+        """
+        colony = self.environment.colony
+
+        print(f"Ticks: {self.ticks} em {self.elapsed:.2f}s ({self.ticks_per_second():.1f} ticks/s)")
+        print(f"Geração: {colony.generation}, Comida coletada: {self.environment.total_food_collected}")
+
+        for stats in colony.generation_history:
+            print(
+                f"Geração {stats['generation']}: Melhor Fitness = {stats['best_fitness']:.2f}, "
+                f"Velocidade média: {stats['avg_speed']:.2f}, Detecção média: {stats['avg_sense']:.2f}, "
+                f"Feromônio médio: {stats['avg_strength']:.2f}"
+            )
+
+        profiler = self.environment.profiler
+        if profiler.enabled:
+            profiler.close()
+            for line in profiler.hud_lines():
+                print(line)
+
+def parse_args(argv=None):
+    """
+    Lê os argumentos da linha de comando.
+    """
+    parser = argparse.ArgumentParser(description="Executa a simulação de formigas sem interface gráfica.")
+    parser.add_argument("--ticks", type=int, help="Quantidade máxima de ticks.")
+    parser.add_argument("--generations", type=int, help="Geração a ser atingida.")
+    parser.add_argument("--food", type=int, help="Quantidade de comida coletada a ser atingida.")
+    parser.add_argument("--seed", type=int, help="Semente das sequências aleatórias (execução reprodutível).")
+    parser.add_argument("--quiet", action="store_true", help="Não imprime as estatísticas a cada geração.")
+    parser.add_argument("--profile", nargs="?", const="", metavar="ARQUIVO",
+                        help="Habilita o profiler (e grava cada tick no arquivo .csv ou JSON lines informado).")
+    parser.add_argument("--checkpoint", metavar="ARQUIVO", help="Grava checkpoints da simulação no arquivo.")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, metavar="TICKS",
+                        help="Intervalo (em ticks) entre checkpoints automáticos (padrão: 1000).")
+    parser.add_argument("--resume", metavar="ARQUIVO", help="Continua a simulação a partir de um checkpoint.")
+    parser.add_argument("--record", metavar="PASTA", help="Grava a trajetória das formigas na pasta (recorder.py).")
+    parser.add_argument("--record-every", type=int, metavar="TICKS",
+                        help="Intervalo (em ticks) entre registros das formigas (padrão = GlobalVar.RECORDER_INTERVAL).")
+    parser.add_argument("--snapshot-every", type=int, metavar="TICKS",
+                        help="Intervalo (em ticks) entre instantâneos de feromônios e comida (0 = sem instantâneos).")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="Grava um replay da execução (replay_viewer.py).")
+    parser.add_argument("--keyframe-every", type=int, metavar="TICKS",
+                        help="Intervalo (em ticks) entre quadros-chave do replay "
+                             "(padrão = GlobalVar.REPLAY_KEYFRAME_INTERVAL).")
+    parser.add_argument("--metrics-port", type=int, metavar="PORTA",
+                        help="Inicia o servidor local de métricas e controle na porta (0 = porta livre).")
+    parser.add_argument("--metrics-name", metavar="NOME", help="Nome da execução exibido pelo servidor de métricas.")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="Executa as formigas em N processos (tiles do mundo, campo denso de feromônios).")
+    parser.add_argument("--lod", type=int, metavar="TICKS",
+                        help="Atualiza as formigas ociosas (longe de feromônios e comida) a cada TICKS ticks.")
+    parser.add_argument("--obstacles", metavar="ARQUIVO",
+                        help="Mapa de obstáculos (texto .txt/.map com '#' = obstáculo, ou imagem com pixels escuros).")
+
+    args = parser.parse_args(argv)
+    if args.ticks is None and args.generations is None and args.food is None:
+        parser.error("informe --ticks, --generations ou --food")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.quiet:
+        GlobalVar.PRINT_STATISTICS = False
+    if args.seed is not None:
+        GlobalVar.RANDOM_SEED = args.seed
+    if args.profile is not None:
+        GlobalVar.PROFILER_ENABLED = True
+        GlobalVar.PROFILER_OUTPUT = args.profile or None
+    if args.workers:
+        GlobalVar.PARALLEL_WORKERS = args.workers
+        GlobalVar.PHEROMONE_BACKEND = "field"
+    if args.obstacles:
+        GlobalVar.OBSTACLE_MAP = args.obstacles
+    if args.lod:
+        GlobalVar.LOD_INTERVAL = args.lod
+
+    environment = None
+    if args.resume:
+        from checkpoint import Checkpoint
+        environment = Checkpoint.load(args.resume).restore()
+
+    metrics = None
+    if args.metrics_port is not None:
+        from metrics_server import MetricsServer
+        metrics = MetricsServer(args.metrics_port, name=args.metrics_name)
+
+    simulation = HeadlessSimulation(args.ticks, args.generations, args.food, environment, metrics)
+    if metrics is not None:
+        print(f"Métricas em http://{metrics.host}:{metrics.port}/ ({metrics.name})", flush=True)
+
+    checkpointer = None
+    if args.checkpoint:
+        from checkpoint import AutoCheckpointer
+        checkpointer = AutoCheckpointer(args.checkpoint, args.checkpoint_every).attach(simulation.environment)
+
+    recorder = None
+    if args.record:
+        from recorder import TrajectoryRecorder
+        recorder = TrajectoryRecorder(args.record, args.record_every, args.snapshot_every).attach(simulation.environment)
+
+    replay = None
+    if args.replay:
+        from replay import ReplayRecorder
+        replay = ReplayRecorder(args.replay, args.keyframe_every).attach(simulation.environment)
+
+    simulation.run()
+    if recorder is not None:
+        recorder.close()
+    if replay is not None:
+        replay.close()
+    if checkpointer is not None:
+        # Checkpoint final (síncrono) com o estado no fim da execução
+        checkpointer.wait()
+        checkpointer.checkpoint(simulation.environment)
+        checkpointer.wait()
+    if metrics is not None:
+        metrics.close()
+    simulation.print_summary()
+    simulation.environment.close()
+
+if __name__ == "__main__":
+    main()
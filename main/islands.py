@@ -0,0 +1,270 @@
+import argparse
+import json
+import multiprocessing
+import random
+
+from global_var import GlobalVar
+from headless import HeadlessSimulation
+from rng import stream_key
+from sweep import parse_value
+
+def ring_targets(index, active, rng):
+    """
+    Topologia em anel: cada ilha envia para a próxima ilha ativa.
+    """
+    position = active.index(index)
+    return [active[(position + 1) % len(active)]]
+
+def full_targets(index, active, rng):
+    """
+    Topologia completa: cada ilha envia para todas as outras ilhas ativas.
+    """
+    return [other for other in active if other != index]
+
+def random_targets(index, active, rng):
+    """
+    Topologia aleatória: cada ilha envia para uma outra ilha ativa sorteada a cada migração.
+    """
+    others = [other for other in active if other != index]
+    return [rng.choice(others)] if others else []
+
+# Topologias de migração: função (ilha, ilhas ativas, rng) -> ilhas de destino
+TOPOLOGIES = {
+    "ring": ring_targets,
+    "full": full_targets,
+    "random": random_targets,
+}
+
+class MigrationListener:
+    """
+    Listener de tick da ilha (registrado em Environment.tick_listeners). Quando a colônia completa o intervalo de
+    gerações, envia os melhores genomas ao coordenador pelo pipe e espera os imigrantes (as ilhas ficam sincronizadas
+    em cada migração, então o resultado é reprodutível).
+
+    Atributos:
+        connection: Ponta do pipe da ilha.
+        interval: Gerações entre migrações.
+        migrants: Quantidade de genomas enviados.
+        generation: Última geração vista.
+        received: Quantidade de formigas substituídas por imigrantes.
+    """
+    def __init__(self, connection, interval, migrants):
+        self.connection = connection
+        self.interval = interval
+        self.migrants = migrants
+        self.generation = 1
+        self.received = 0
+
+    def __call__(self, environment):
+        colony = environment.colony
+        if colony.generation == self.generation:
+            return
+        self.generation = colony.generation
+        if (self.generation - 1) % self.interval != 0:
+            return
+
+        # Os genes dos objetos estão sincronizados com o motor vetorizado, mas a posição, os contadores e as sequências
+        # aleatórias podem estar só nos arrays (evolução vetorizada): só as formigas substituídas são copiadas, depois
+        # de receberem o estado atual dos arrays
+        if GlobalVar.AG_EVOLUTION_MODE == "steady_state":
+            # Na evolução contínua o fitness só é recalculado para os candidatos dos torneios
+            colony.refresh_fitness(environment.population_engine)
+        self.connection.send(("migrate", colony.top_genomes(self.migrants)))
+        immigrants = self.connection.recv()
+        if immigrants:
+            replaced = colony.receive_migrants(immigrants)
+            engine = environment.population_engine
+            if engine is not None:
+                for index in replaced:
+                    engine.write_back_slot(index)
+                    engine.load_slot(index)
+            self.received += len(replaced)
+
+def island_worker(index, connection, job):
+    """
+    Processo de uma ilha: executa uma simulação sem interface gráfica com a sua semente e migra genomas pelo pipe.
+
+    Parameters:
+        index: Índice da ilha.
+        connection: Ponta do pipe da ilha.
+        job: Dicionário com seed, overrides, critérios de parada, interval e migrants.
+    """
+    settings = dict(job["overrides"], RANDOM_SEED=job["seed"], PRINT_STATISTICS=False)
+    with GlobalVar.override(**settings):
+        simulation = HeadlessSimulation(job["max_ticks"], job["max_generations"], job["food_target"])
+        listener = MigrationListener(connection, job["interval"], job["migrants"])
+        simulation.environment.tick_listeners.append(listener)
+        simulation.run()
+        colony = simulation.environment.colony
+        if GlobalVar.AG_EVOLUTION_MODE == "steady_state":
+            colony.refresh_fitness(simulation.environment.population_engine)
+
+    connection.send(("done", {
+        "island": index,
+        "seed": job["seed"],
+        "ticks": simulation.ticks,
+        "elapsed": simulation.elapsed,
+        "generation": colony.generation,
+        "total_food_collected": simulation.environment.total_food_collected,
+        "immigrants": listener.received,
+        "best_genomes": colony.top_genomes(job["migrants"]),
+        "history": colony.generation_history,
+    }))
+    connection.close()
+
+class IslandModel:
+    """
+    Modelo de ilhas: K colônias evoluem em processos separados (cada uma com o seu Environment) e a cada M gerações os
+    melhores genomas migram entre as ilhas segundo uma topologia. O processo principal coordena as migrações pelos
+    pipes.
+
+    Atributos:
+        count: Quantidade de ilhas.
+        interval: Gerações entre migrações.
+        migrants: Quantidade de genomas enviados por ilha em cada migração.
+        topology: Nome da topologia (chave de TOPOLOGIES).
+        seed: Semente base (cada ilha recebe uma semente derivada dela).
+        overrides: Configurações do GlobalVar aplicadas em todas as ilhas.
+        migrations: Quantidade de migrações realizadas.
+        results: Resultado de cada ilha (preenchido por run).
+
+    Métodos:
+        run(max_ticks, max_generations, food_target): Executa as ilhas até os critérios de parada.
+        route(emigrants, active): Distribui os emigrantes de uma migração entre as ilhas.
+        print_summary(): Imprime o resultado de cada ilha.
+    """
+    def __init__(self, count=None, interval=None, migrants=None, topology=None, seed=0, overrides=None):
+        """
+        Construtor do modelo de ilhas (parâmetros omitidos usam as configurações ISLAND_* do GlobalVar).
+        """
+        self.count = count or GlobalVar.ISLAND_COUNT
+        self.interval = interval or GlobalVar.ISLAND_MIGRATION_INTERVAL
+        self.migrants = migrants if migrants is not None else GlobalVar.ISLAND_MIGRANTS
+        self.topology = topology or GlobalVar.ISLAND_TOPOLOGY
+        if self.topology not in TOPOLOGIES:
+            raise ValueError(f"Topologia desconhecida: {self.topology} (use {', '.join(TOPOLOGIES)})")
+
+        self.seed = seed
+        self.overrides = overrides or {}
+        self.rng = random.Random(seed)
+        self.migrations = 0
+        self.results = []
+
+    def run(self, max_ticks=None, max_generations=None, food_target=None):
+        """
+        Executa as ilhas até os critérios de parada (os mesmos para todas as ilhas).
+
+        Returns:
+            list: Resultado de cada ilha, na ordem dos índices.
+        """
+        if max_ticks is None and max_generations is None and food_target is None:
+            raise ValueError("Informe ao menos um critério de parada (ticks, gerações ou comida).")
+
+        connections = {}
+        processes = []
+        for index in range(self.count):
+            parent_end, child_end = multiprocessing.Pipe()
+            job = {
+                "seed": stream_key(self.seed, index) >> 1,
+                "overrides": self.overrides,
+                "max_ticks": max_ticks,
+                "max_generations": max_generations,
+                "food_target": food_target,
+                "interval": self.interval,
+                "migrants": self.migrants,
+            }
+            process = multiprocessing.Process(target=island_worker, args=(index, child_end, job))
+            process.start()
+            child_end.close()
+            connections[index] = parent_end
+            processes.append(process)
+
+        results = {}
+        active = list(range(self.count))
+        while active:
+            # Cada ilha ativa envia exatamente uma mensagem por migração: os emigrantes ou o resultado final
+            emigrants = {}
+            for index in active:
+                kind, payload = connections[index].recv()
+                if kind == "done":
+                    results[index] = payload
+                else:
+                    emigrants[index] = payload
+
+            active = sorted(emigrants)
+            if not active:
+                break
+
+            for index, immigrants in self.route(emigrants, active).items():
+                connections[index].send(immigrants)
+            self.migrations += 1
+
+        for process in processes:
+            process.join()
+        self.results = [results[index] for index in sorted(results)]
+        return self.results
+
+    def route(self, emigrants, active):
+        """
+        Distribui os emigrantes de uma migração segundo a topologia (só entre as ilhas que ainda estão executando).
+
+        Parameters:
+            emigrants: Dicionário {ilha: genomas enviados}.
+            active: Índices das ilhas que participam da migração.
+
+        Returns:
+            dict: {ilha: genomas recebidos}.
+        """
+        targets = TOPOLOGIES[self.topology]
+        immigrants = {index: [] for index in active}
+        for index in active:
+            for target in targets(index, active, self.rng):
+                immigrants[target].extend(emigrants[index])
+        return immigrants
+
+    def print_summary(self):
+        """
+        Imprime o resultado de cada ilha e o melhor genoma encontrado.
+        """
+        print(f"{self.count} ilhas, topologia {self.topology}, {self.migrations} migrações")
+        for result in self.results:
+            best = result["best_genomes"][0] if result["best_genomes"] else None
+            fitness = result["history"][-1]["best_fitness"] if result["history"] else 0.0
+            genome = f"velocidade {best[0]:.2f}, detecção {best[1]:.2f}, feromônio {best[2]:.2f}" if best else "-"
+            print(
+                f"Ilha {result['island']}: geração {result['generation']}, comida {result['total_food_collected']}, "
+                f"fitness {fitness:.2f}, {result['immigrants']} imigrantes ({genome})"
+            )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evolução com modelo de ilhas (uma colônia por processo).")
+    parser.add_argument("--islands", type=int, help="Quantidade de ilhas (padrão = GlobalVar.ISLAND_COUNT).")
+    parser.add_argument("--interval", type=int, help="Gerações entre migrações.")
+    parser.add_argument("--migrants", type=int, help="Quantidade de genomas enviados por ilha.")
+    parser.add_argument("--topology", choices=sorted(TOPOLOGIES), help="Topologia de migração.")
+    parser.add_argument("--seed", type=int, default=0, help="Semente base das ilhas.")
+    parser.add_argument("--ticks", type=int, help="Quantidade máxima de ticks de cada ilha.")
+    parser.add_argument("--generations", type=int, help="Geração a ser atingida em cada ilha.")
+    parser.add_argument("--food", type=int, help="Quantidade de comida coletada a ser atingida em cada ilha.")
+    parser.add_argument("--set", nargs="*", default=[], metavar="NOME=VALOR", help="Altera configurações do GlobalVar.")
+    parser.add_argument("--output", help="Arquivo JSON com o resultado de cada ilha.")
+    args = parser.parse_args(argv)
+
+    if args.ticks is None and args.generations is None and args.food is None:
+        parser.error("informe --ticks, --generations ou --food")
+
+    overrides = {}
+    for item in args.set:
+        name, _, value = item.partition("=")
+        overrides[name] = parse_value(value)
+
+    model = IslandModel(args.islands, args.interval, args.migrants, args.topology, args.seed, overrides)
+    model.run(args.ticks, args.generations, args.food)
+    model.print_summary()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"topology": model.topology, "migrations": model.migrations, "islands": model.results}, file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import math
+
+import numpy as np
+
+from global_var import GlobalVar
+from pheromone import Pheromone
+
+# Variância (por eixo, em unidades de ag_speed²) de um passo da caminhada aleatória de Ant.move: dx e dy sorteados em
+# uniform(-10, 10) e normalizados por max(|dx|, |dy|, 1)
+RANDOM_STEP_VARIANCE = 199 / 300
+
+def gaussian_pair(rng):
+    """
+    Sorteia dois números independentes com distribuição normal padrão (Box-Muller) usando dois números da sequência.
+
+    Parameters:
+        rng: Sequência de números aleatórios (RandomStream ou o módulo random).
+
+    Returns:
+        tuple: (z1, z2).
+    """
+    radius = math.sqrt(-2.0 * math.log(1.0 - rng.random()))
+    angle = 2.0 * math.pi * rng.random()
+    return radius * math.cos(angle), radius * math.sin(angle)
+
+def max_displacement(ticks, speed):
+    """
+    Deslocamento máximo de uma formiga em ticks passos da caminhada aleatória (cada passo anda no máximo |ag_speed| em
+    cada eixo). É a margem do teste de ociosidade e o limite do passo agregado de Ant.move_aggregated, então uma
+    formiga adormecida nunca sai da área testada.
+
+    Parameters:
+        ticks: Quantidade de passos.
+        speed: ag_speed (número ou array).
+
+    Returns:
+        float ou ndarray: Distância máxima.
+    """
+    return ticks * abs(speed) * math.sqrt(2)
+
+class LodScheduler:
+    """
+    Agendador de nível de detalhe (LOD) das formigas no loop por objeto. Uma formiga sem comida que não tem nenhum
+    feromônio, comida ou obstáculo por perto (teste conservador por células) só faria a caminhada aleatória, então em
+    vez de chamar Ant.move a cada tick ela é atualizada a cada GlobalVar.LOD_INTERVAL ticks com um passo agregado
+    (Ant.move_aggregated: a soma dos passos aleatórios aproximada por uma normal). As atualizações são escalonadas
+    (cada formiga tem seu tick) para distribuir o custo. Quando uma formiga entra em uma região de interesse, ela recebe
+    os ticks pendentes em um passo agregado e volta a ser atualizada por Ant.move a cada tick.
+
+    O teste usa, para cada formiga, o alcance de detecção (feromônios) ou o raio de coleta (comida e obstáculos) mais
+    o deslocamento máximo até a próxima atualização. Feromônios depositados perto de uma formiga adormecida só são
+    vistos quando ela é testada de novo (no máximo um tick depois); por isso o resultado difere um pouco do loop
+    completo, mas as estatísticas de coleta ficam próximas (ver benchmarks/lod.py).
+
+    Atributos:
+        interval: Intervalo (em ticks) entre as atualizações das formigas ociosas.
+        cell_size: Tamanho das células da grade de interesse.
+        full_updates: Atualizações completas (Ant.move) no último tick.
+        aggregated_updates: Passos agregados no último tick.
+
+    Métodos:
+        interest_tables(environment): Calcula as tabelas de células de interesse.
+        idle_mask(environment, ants): Retorna quais formigas estão longe de qualquer região de interesse.
+        move_ants(environment): Move as formigas (completas ou agregadas) e retorna a quantidade de entregas.
+    """
+    def __init__(self, interval=None, cell_size=None):
+        """
+        Construtor do agendador.
+
+        Parameters:
+            interval (opcional): Intervalo entre as atualizações das formigas ociosas (padrão = GlobalVar.LOD_INTERVAL).
+            cell_size (opcional): Tamanho das células da grade de interesse (padrão = GlobalVar.LOD_CELL_SIZE).
+        """
+        self.interval = max(1, interval or GlobalVar.LOD_INTERVAL)
+        self.cell_size = cell_size or GlobalVar.LOD_CELL_SIZE
+        self.cols = math.ceil(GlobalVar.WORLD_WIDTH / self.cell_size) + 1
+        self.rows = math.ceil(GlobalVar.WORLD_HEIGHT / self.cell_size) + 1
+        self.full_updates = 0
+        self.aggregated_updates = 0
+
+    def _summed_table(self, left, top, right, bottom):
+        """
+        Tabela de somas acumuladas das células da grade de interesse cobertas por retângulos (coordenadas do mundo).
+        """
+        cell_size, cols, rows = self.cell_size, self.cols, self.rows
+        x0 = np.clip(np.floor(np.asarray(left) / cell_size).astype(np.int64), 0, cols - 1)
+        x1 = np.clip(np.floor(np.asarray(right) / cell_size).astype(np.int64), 0, cols - 1) + 1
+        y0 = np.clip(np.floor(np.asarray(top) / cell_size).astype(np.int64), 0, rows - 1)
+        y1 = np.clip(np.floor(np.asarray(bottom) / cell_size).astype(np.int64), 0, rows - 1) + 1
+
+        # Retângulos marcados com uma tabela de diferenças (cada célula fica com a quantidade de retângulos)
+        coverage = np.zeros((cols + 1, rows + 1), dtype=np.int64)
+        np.add.at(coverage, (x0, y0), 1)
+        np.add.at(coverage, (x1, y0), -1)
+        np.add.at(coverage, (x0, y1), -1)
+        np.add.at(coverage, (x1, y1), 1)
+        occupied = coverage.cumsum(axis=0).cumsum(axis=1)[:cols, :rows] > 0
+
+        summed = np.zeros((cols + 1, rows + 1), dtype=np.int64)
+        summed[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+        return summed
+
+    def interest_tables(self, environment):
+        """
+        Calcula as células de interesse: as que têm feromônios (detectados no alcance de detecção) e as que têm comida
+        ou obstáculos (tocados no raio de coleta).
+
+        Returns:
+            tuple: Tabelas de somas acumuladas (feromônios, comida e obstáculos).
+        """
+        field = environment.pheromone_field
+        if field is not None:
+            cx, cy = np.nonzero(field.grid > Pheromone.ACTIVE_THRESHOLD)
+            size = field.resolution
+        else:
+            grid = environment.pheromone_grid
+            cells = np.array(list(grid.cells.keys()), dtype=np.int64).reshape(-1, 2)
+            cx, cy = cells[:, 0], cells[:, 1]
+            size = grid.cell_size
+        sensed = self._summed_table(cx * size, cy * size, (cx + 1) * size, (cy + 1) * size)
+
+        foods = list(environment.food_sources)
+        left = [food.position[0] for food in foods]
+        top = [food.position[1] for food in foods]
+        right, bottom = list(left), list(top)
+        obstacles = environment.obstacles
+        if obstacles is not None:
+            bx, by = np.nonzero(obstacles.blocked)
+            size = obstacles.cell_size
+            left = np.concatenate((left, bx * size))
+            top = np.concatenate((top, by * size))
+            right = np.concatenate((right, (bx + 1) * size))
+            bottom = np.concatenate((bottom, (by + 1) * size))
+        touched = self._summed_table(left, top, right, bottom)
+        return sensed, touched
+
+    def _any_in_reach(self, summed, xs, ys, reach):
+        cell_size = self.cell_size
+        x0 = np.clip(np.floor((xs - reach) / cell_size).astype(np.int64), 0, self.cols)
+        x1 = np.clip(np.floor((xs + reach) / cell_size).astype(np.int64) + 1, 0, self.cols)
+        y0 = np.clip(np.floor((ys - reach) / cell_size).astype(np.int64), 0, self.rows)
+        y1 = np.clip(np.floor((ys + reach) / cell_size).astype(np.int64) + 1, 0, self.rows)
+        return (summed[x1, y1] - summed[x0, y1] - summed[x1, y0] + summed[x0, y0]) > 0
+
+    def idle_mask(self, environment, ants):
+        """
+        Teste conservador de quais formigas estão ociosas: sem comida e sem feromônio, comida ou obstáculo ao alcance
+        durante os próximos interval ticks.
+
+        Parameters:
+            environment: O ambiente da simulação.
+            ants: Lista das formigas.
+
+        Returns:
+            ndarray: Máscara booleana (True = ociosa).
+        """
+        count = len(ants)
+        xs = np.fromiter((ant.x for ant in ants), dtype=np.float64, count=count)
+        ys = np.fromiter((ant.y for ant in ants), dtype=np.float64, count=count)
+        has_food = np.fromiter((ant.has_food for ant in ants), dtype=bool, count=count)
+        speed = np.fromiter((ant.ag_speed for ant in ants), dtype=np.float64, count=count)
+        sense = np.fromiter((ant.ag_pheromone_detection_range for ant in ants), dtype=np.float64, count=count)
+
+        # Deslocamento máximo até a próxima atualização
+        margin = max_displacement(self.interval, speed)
+        sensed, touched = self.interest_tables(environment)
+        busy = has_food
+        busy |= self._any_in_reach(sensed, xs, ys, sense + margin)
+        busy |= self._any_in_reach(touched, xs, ys, GlobalVar.FOOD_PICKUP_RADIUS + margin)
+        return ~busy
+
+    def move_ants(self, environment):
+        """
+        Move as formigas da colônia (normais e exploradoras): as ociosas só no seu tick do intervalo, com um passo
+        agregado, e as demais com Ant.move (antes recebem os ticks pendentes em um passo agregado).
+
+        Returns:
+            int: Quantidade de formigas que entregaram comida na colônia.
+        """
+        ants = environment.colony.ants + environment.colony.ants_scout
+        if not ants:
+            return 0
+
+        tick = environment.tick
+        interval = self.interval
+        idle = self.idle_mask(environment, ants).tolist()
+        full = aggregated = 0
+        food_delivered_count = 0
+        for i, ant in enumerate(ants):
+            last = ant.lod_tick if ant.lod_tick is not None else tick - 1
+            if idle[i]:
+                # Escalonamento: cada formiga ociosa é atualizada em um tick diferente do intervalo
+                if (tick + i) % interval == 0 or tick - last >= interval:
+                    ant.move_aggregated(environment, tick - last)
+                    ant.lod_tick = tick
+                    aggregated += 1
+                continue
+
+            if tick - last > 1:
+                ant.move_aggregated(environment, tick - last - 1)
+            if ant.move(environment):
+                food_delivered_count += 1
+            ant.lod_tick = tick
+            full += 1
+
+        self.full_updates, self.aggregated_updates = full, aggregated
+        environment.profiler.count("lod_full_updates", full)
+        environment.profiler.count("lod_aggregated_updates", aggregated)
+        return food_delivered_count
@@ -0,0 +1,473 @@
+import asyncio
+import collections
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from global_var import GlobalVar
+
+# Comandos aceitos em POST /control (os mesmos de Simulation.handle_command, mais "snapshot")
+COMMANDS = ("pause", "step", "speed", "snapshot")
+
+# Tamanho máximo do corpo de uma requisição
+MAX_BODY_SIZE = 64 * 1024
+
+# Janela (em segundos) do cálculo da taxa de ticks
+RATE_WINDOW = 0.5
+
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large"}
+
+def to_json(value):
+    """
+    Serializa um valor em JSON (números do NumPy viram números do Python).
+    """
+    return json.dumps(value, default=lambda item: item.item())
+
+def parse_command(item):
+    """
+    Valida um comando recebido em POST /control.
+
+    Parameters:
+        item: Objeto {"command": nome, "value": valor}.
+
+    Returns:
+        tuple: (comando, valor) no formato de Simulation.handle_command.
+
+    Raises:
+        ValueError: Se o comando ou o valor forem inválidos.
+    """
+    if not isinstance(item, dict) or item.get("command") not in COMMANDS:
+        raise ValueError(f"Comando inválido: {item!r} (use {', '.join(COMMANDS)}).")
+    command, value = item["command"], item.get("value")
+
+    if command == "pause" and value is not None and not isinstance(value, bool):
+        raise ValueError("O valor de 'pause' deve ser true, false ou null (alterna).")
+    if command in ("step", "speed") and value is not None:
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f"O valor de '{command}' deve ser um inteiro positivo ou null.")
+    if command == "step" and value is None:
+        value = 1
+    if command == "snapshot" and value is not None and not isinstance(value, str):
+        raise ValueError("O valor de 'snapshot' deve ser o caminho do arquivo ou null.")
+    return command, value
+
+class MetricsRing:
+    """
+    Buffer circular de registros sem trava: um único produtor (o loop da simulação) e vários leitores (o servidor). O
+    produtor grava o registro no espaço e só depois avança head; o leitor descarta os registros que podem ter sido
+    sobrescritos enquanto lia (até head - capacity, inclusive, no fim da leitura).
+
+    Atributos:
+        capacity: Quantidade de registros guardados.
+        head: Quantidade total de registros publicados (o próximo número de sequência).
+
+    Métodos:
+        push(record): Publica um registro.
+        read(since): Retorna os registros a partir de um número de sequência.
+        latest(): Retorna o último registro publicado.
+    """
+    def __init__(self, capacity):
+        """
+        Construtor do buffer circular.
+
+        Parameters:
+            capacity: Quantidade de registros guardados.
+        """
+        self.capacity = max(1, capacity)
+        self.head = 0
+        self._slots = [None] * self.capacity
+
+    def push(self, record):
+        """
+        Publica um registro (sobrescreve o mais antigo quando o buffer está cheio).
+        """
+        self._slots[self.head % self.capacity] = record
+        self.head += 1
+
+    def read(self, since=0):
+        """
+        Retorna os registros publicados a partir de um número de sequência.
+
+        Parameters:
+            since: Número de sequência do primeiro registro (os que já saíram do buffer são pulados).
+
+        Returns:
+            tuple: (lista de registros, próximo número de sequência).
+        """
+        head = self.head
+        start = max(0, since, head - self.capacity)
+        records = [self._slots[index % self.capacity] for index in range(start, head)]
+        # Registros sobrescritos durante a leitura são descartados. O produtor grava o espaço de head antes de
+        # avançar head, então o registro head - capacity também pode estar sendo sobrescrito
+        valid_start = max(start, self.head - self.capacity + 1)
+        return records[valid_start - start:], head
+
+    def latest(self):
+        """
+        Retorna o último registro publicado (None se não houver).
+        """
+        head = self.head
+        return self._slots[(head - 1) % self.capacity] if head else None
+
+class MetricsServer:
+    """
+    Servidor HTTP local (asyncio, em uma thread separada) com as métricas da simulação em execução e uma fila de
+    comandos de controle. Registrado em Environment.tick_listeners, ele só publica registros em buffers circulares e
+    nunca espera pelo servidor; a serialização e o envio acontecem na thread do servidor. Os comandos recebidos são
+    guardados em uma fila e aplicados pelo loop da simulação (poll_commands) no início do tick seguinte.
+
+    Endpoints:
+        GET /: Identificação da execução (nome, pid, porta), último registro e estado (pausa, velocidade, snapshot).
+        GET /metrics?since=N: Registros por tick a partir do número de sequência N (padrão = só o último).
+        GET /generations?since=N: Estatísticas de cada geração a partir de N (padrão = todas as guardadas).
+        GET /stream: Server-Sent Events com os eventos "tick" (o último a cada envio, ou todos com ?all=1) e
+            "generation".
+        POST /control: Um comando ou uma lista de comandos {"command": ..., "value": ...}: "pause" (true, false ou null
+            para alternar), "step" (quantidade de ticks), "speed" (ticks por quadro, null = máxima) e "snapshot"
+            (grava um checkpoint; valor = caminho do arquivo).
+
+    Atributos:
+        host, port: Endereço do servidor (porta 0 = escolhida pelo sistema; o valor é atualizado ao iniciar).
+        name: Nome da execução (para identificar várias execuções no mesmo painel).
+        interval: Intervalo (em ticks) entre registros.
+        ticks: Buffer circular dos registros por tick.
+        generations: Buffer circular das estatísticas por geração.
+        commands: Fila de comandos recebidos (esvaziada por poll_commands).
+        status: Estado da execução informado pela simulação (pausa, velocidade, último snapshot).
+
+    Métodos:
+        start(): Inicia o servidor.
+        attach(environment): Registra a publicação das métricas no ambiente (e inicia o servidor).
+        publish(environment): Publica o registro do tick e as gerações novas.
+        latest_record(): Retorna o último registro por tick com a taxa de ticks atual.
+        poll_commands(): Retorna e remove os comandos recebidos.
+        set_status(**values): Atualiza o estado publicado.
+        snapshot(environment, path): Grava um checkpoint em segundo plano.
+        close(): Encerra o servidor.
+    """
+    def __init__(self, port=None, host=None, name=None, interval=None, capacity=None):
+        """
+        Construtor do servidor de métricas (não inicia o servidor).
+
+        Parameters:
+            port (opcional): Porta (padrão = GlobalVar.METRICS_PORT; 0 = porta livre).
+            host (opcional): Endereço (padrão = GlobalVar.METRICS_HOST).
+            name (opcional): Nome da execução (padrão = "pid <número do processo>").
+            interval (opcional): Intervalo (em ticks) entre registros (padrão = GlobalVar.METRICS_INTERVAL).
+            capacity (opcional): Tamanho dos buffers circulares (padrão = GlobalVar.METRICS_BUFFER_SIZE).
+        """
+        self.port = port if port is not None else (GlobalVar.METRICS_PORT or 0)
+        self.host = host or GlobalVar.METRICS_HOST
+        self.name = name or f"pid {os.getpid()}"
+        self.interval = max(1, interval or GlobalVar.METRICS_INTERVAL)
+        capacity = capacity or GlobalVar.METRICS_BUFFER_SIZE
+        self.ticks = MetricsRing(capacity)
+        self.generations = MetricsRing(capacity)
+        self.commands = collections.deque()
+        self.status = {"paused": False, "speed": None, "snapshot": None}
+
+        self._generations_seen = 0
+        self._rate = 0.0
+        self._rate_tick = None
+        self._rate_time = None
+        self._snapshot_thread = None
+        self._thread = None
+        self._loop = None
+        self._stop = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self):
+        """
+        Inicia o servidor em uma thread separada e espera ele começar a aceitar conexões.
+
+        Raises:
+            OSError: Se não foi possível abrir a porta.
+        """
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="metrics-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def attach(self, environment):
+        """
+        Registra a publicação das métricas no ambiente e inicia o servidor.
+        """
+        self.start()
+        environment.tick_listeners.append(self)
+        return self
+
+    def __call__(self, environment):
+        if environment.tick % self.interval == 0:
+            self.publish(environment)
+
+    def publish(self, environment):
+        """
+        Publica o registro do tick atual (taxa de ticks, feromônios, comida, médias dos genes) e as gerações que
+        terminaram desde o último registro.
+        """
+        now = time.perf_counter()
+        tick = environment.tick
+        if self._rate_time is None:
+            self._rate_tick, self._rate_time = tick, now
+        elif now - self._rate_time >= RATE_WINDOW:
+            self._rate = (tick - self._rate_tick) / (now - self._rate_time)
+            self._rate_tick, self._rate_time = tick, now
+
+        colony = environment.colony
+        record = {
+            "tick": tick,
+            "time": time.time(),
+            "ticks_per_second": round(self._rate, 2),
+            "generation": colony.generation,
+            "food_collected": environment.total_food_collected,
+            "food_sources": len(environment.food_sources),
+            "pheromones": environment.pheromone_count(),
+            "ants": len(colony.ants) + len(colony.ants_scout),
+        }
+        record.update(self.gene_averages(environment))
+        self.ticks.push(record)
+
+        history = colony.generation_history
+        for stats in history[self._generations_seen:]:
+            self.generations.push(dict(stats, tick=tick))
+        self._generations_seen = len(history)
+
+    def latest_record(self):
+        """
+        Retorna o último registro por tick com a taxa de ticks atual: 0 quando nenhum tick foi publicado durante a
+        janela da taxa (simulação pausada ou parada), em vez da última taxa publicada.
+        """
+        record = self.ticks.latest()
+        if record is None or time.time() - record["time"] < RATE_WINDOW:
+            return record
+        return dict(record, ticks_per_second=0.0)
+
+    def gene_averages(self, environment):
+        """
+        Médias dos atributos genéticos das formigas normais (como Colony.get_statistics), lidas dos arrays do motor
+        vetorizado quando ele existe.
+        """
+        colony = environment.colony
+        count = len(colony.ants)
+        if count == 0:
+            return {"avg_speed": 0.0, "avg_sense": 0.0, "avg_strength": 0.0}
+
+        engine = environment.population_engine
+        if engine is not None:
+            return {
+                "avg_speed": float(engine.ag_speed[:count].mean()),
+                "avg_sense": float(engine.ag_pheromone_detection_range[:count].mean()),
+                "avg_strength": float(engine.ag_pheromone_strength[:count].mean()),
+            }
+        return {
+            "avg_speed": colony.calculate_average(colony.ants, "ag_speed"),
+            "avg_sense": colony.calculate_average(colony.ants, "ag_pheromone_detection_range"),
+            "avg_strength": colony.calculate_average(colony.ants, "ag_pheromone_strength"),
+        }
+
+    def poll_commands(self):
+        """
+        Retorna e remove os comandos recebidos (lista de pares (comando, valor), na ordem de chegada).
+        """
+        commands = []
+        while self.commands:
+            commands.append(self.commands.popleft())
+        return commands
+
+    def set_status(self, **values):
+        """
+        Atualiza o estado publicado em GET / (o dicionário é substituído, nunca alterado).
+        """
+        self.status = dict(self.status, **values)
+
+    def snapshot(self, environment, path=None):
+        """
+        Copia o estado atual e grava o checkpoint em segundo plano (pulado se a gravação anterior ainda não terminou).
+
+        Parameters:
+            environment: O ambiente da simulação.
+            path (opcional): Arquivo do checkpoint (padrão = "snapshot-<tick>.ckpt").
+        """
+        from checkpoint import Checkpoint
+
+        path = path or f"snapshot-{environment.tick}.ckpt"
+        started = self._snapshot_thread is None or not self._snapshot_thread.is_alive()
+        if started:
+            checkpoint = Checkpoint.capture(environment)
+            self._snapshot_thread = threading.Thread(target=checkpoint.save, args=(path,), daemon=True)
+            self._snapshot_thread.start()
+        self.set_status(snapshot={"tick": environment.tick, "path": path, "started": started})
+
+    def close(self):
+        """
+        Encerra o servidor (as conexões abertas são fechadas) e espera o snapshot em andamento.
+        """
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+
+    def _run(self):
+        """
+        Executa o loop do asyncio na thread do servidor.
+        """
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except OSError as error:
+            self._error = error
+        finally:
+            self._ready.set()
+            self._loop.close()
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stop.wait()
+
+    async def _handle(self, reader, writer):
+        """
+        Atende uma conexão HTTP (uma requisição por conexão).
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            method, target = lines[0].split(" ")[:2]
+            headers = {}
+            for line in lines[1:]:
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY_SIZE:
+                self._respond(writer, 413, {"error": "Corpo da requisição muito grande."})
+            else:
+                body = await reader.readexactly(length) if length else b""
+                url = urlsplit(target)
+                query = parse_qs(url.query)
+                if method == "GET" and url.path == "/stream":
+                    await self._stream(writer, query)
+                else:
+                    self._respond(writer, *self._route(method, url.path, query, body))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method, path, query, body):
+        """
+        Resolve uma requisição.
+
+        Returns:
+            tuple: (código HTTP, conteúdo JSON).
+        """
+        if method == "OPTIONS":
+            return 204, None
+
+        if path == "/control":
+            if method != "POST":
+                return 405, {"error": "Use POST."}
+            try:
+                payload = json.loads(body or b"null")
+                items = payload if isinstance(payload, list) else [payload]
+                commands = [parse_command(item) for item in items]
+            except ValueError as error:
+                return 400, {"error": str(error)}
+            self.commands.extend(commands)
+            return 200, {"queued": len(commands)}
+
+        if method != "GET":
+            return 405, {"error": "Use GET."}
+
+        if path == "/":
+            return 200, {
+                "name": self.name,
+                "pid": os.getpid(),
+                "port": self.port,
+                "status": self.status,
+                "latest": self.latest_record(),
+            }
+        if path in ("/metrics", "/generations"):
+            ring = self.ticks if path == "/metrics" else self.generations
+            try:
+                since = int(query["since"][0]) if "since" in query else (ring.head - 1 if path == "/metrics" else 0)
+            except ValueError:
+                return 400, {"error": "'since' deve ser um inteiro."}
+            records, head = ring.read(since)
+            return 200, {"name": self.name, "next": head, "records": records}
+        return 404, {"error": f"Caminho desconhecido: {path}"}
+
+    def _respond(self, writer, status, payload):
+        """
+        Escreve uma resposta HTTP com conteúdo JSON.
+        """
+        body = b"" if payload is None else to_json(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+
+    async def _stream(self, writer, query):
+        """
+        Envia os registros como Server-Sent Events até o cliente desconectar ou o servidor ser encerrado.
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        send_all = query.get("all", ["0"])[0] == "1"
+        tick_cursor = max(0, self.ticks.head - 1)
+        generation_cursor = self.generations.head
+        sent_rate = None
+        idle = 0.0
+
+        while not self._stop.is_set():
+            records, tick_cursor = self.ticks.read(tick_cursor)
+            if not send_all:
+                records = records[-1:]
+                latest = self.latest_record()
+                if not records and latest is not None and latest["ticks_per_second"] != sent_rate:
+                    # Sem ticks novos: reenvia o último registro com a taxa atualizada (pausa)
+                    records = [latest]
+                if records:
+                    sent_rate = records[-1]["ticks_per_second"]
+            generations, generation_cursor = self.generations.read(generation_cursor)
+
+            events = [f"event: tick\ndata: {to_json(record)}\n\n" for record in records]
+            events += [f"event: generation\ndata: {to_json(stats)}\n\n" for stats in generations]
+            if not events and idle >= 15:
+                # Comentário periódico para detectar clientes desconectados
+                events = [": keepalive\n\n"]
+            if events:
+                idle = 0.0
+                writer.write("".join(events).encode("utf-8"))
+                await writer.drain()
+
+            interval = GlobalVar.METRICS_STREAM_INTERVAL
+            idle += interval
+            try:
+                await asyncio.wait_for(self._stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
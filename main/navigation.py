@@ -0,0 +1,484 @@
+import heapq
+import math
+import os
+
+import numpy as np
+
+from global_var import GlobalVar
+
+# Movimentos da grade de navegação: (dcx, dcy, custo em células)
+MOVES = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+)
+
+# Caracteres de obstáculo nos mapas de texto (os demais são livres)
+OBSTACLE_CHARS = "#Xx@"
+
+def homing_directions(next_x, next_y, cell_size, xs, ys, colony_x, colony_y):
+    """
+    Direção de retorno em lote pelo campo de navegação: cada formiga segue para o centro da próxima célula do caminho
+    mais curto até a colônia (na célula da colônia ou em regiões sem caminho, segue reto para a colônia).
+
+    Parameters:
+        next_x, next_y: Grades com o ponto alvo de cada célula (NaN = sem caminho).
+        cell_size: Tamanho da célula da grade.
+        xs, ys: Posições das formigas.
+        colony_x, colony_y: Posição da colônia.
+
+    Returns:
+        tuple: Arrays (dx, dy) com o deslocamento desejado.
+    """
+    cols, rows = next_x.shape
+    cx = np.clip((xs / cell_size).astype(np.int64), 0, cols - 1)
+    cy = np.clip((ys / cell_size).astype(np.int64), 0, rows - 1)
+    target_x, target_y = next_x[cx, cy], next_y[cx, cy]
+    unreachable = np.isnan(target_x)
+    target_x = np.where(unreachable, colony_x, target_x)
+    target_y = np.where(unreachable, colony_y, target_y)
+    return target_x - xs, target_y - ys
+
+def resolve_moves(blocked, cell_size, old_x, old_y, new_x, new_y):
+    """
+    Impede que as formigas entrem em obstáculos (em lote): se a célula de destino está bloqueada, tenta mover só no
+    eixo x, depois só no eixo y (deslizando pela parede) e, se nenhum for possível, a formiga fica parada.
+
+    Parameters:
+        blocked: Grade booleana dos obstáculos.
+        cell_size: Tamanho da célula da grade.
+        old_x, old_y: Posições antes do movimento.
+        new_x, new_y: Posições depois do movimento (alteradas no lugar).
+    """
+    cols, rows = blocked.shape
+
+    def is_blocked(xs, ys):
+        cx = np.clip((xs / cell_size).astype(np.int64), 0, cols - 1)
+        cy = np.clip((ys / cell_size).astype(np.int64), 0, rows - 1)
+        return blocked[cx, cy]
+
+    hit = np.flatnonzero(is_blocked(new_x, new_y))
+    if len(hit) == 0:
+        return
+
+    # Desliza no eixo x (mantém o y anterior) ou no eixo y (mantém o x anterior)
+    slide_x = ~is_blocked(new_x[hit], old_y[hit])
+    slide_y = ~slide_x & ~is_blocked(old_x[hit], new_y[hit])
+    stuck = ~slide_x & ~slide_y
+    new_y[hit[slide_x]] = old_y[hit[slide_x]]
+    new_x[hit[slide_y]] = old_x[hit[slide_y]]
+    new_x[hit[stuck]] = old_x[hit[stuck]]
+    new_y[hit[stuck]] = old_y[hit[stuck]]
+
+class ObstacleMap:
+    """
+    Obstáculos do mundo (paredes e pedras) em uma grade booleana. O mapa pode ser carregado de um arquivo de texto
+    (um caractere por célula, "#" = obstáculo) ou de uma imagem (pixels escuros = obstáculo), que é ajustado ao tamanho
+    do mundo.
+
+    Atributos:
+        cell_size: Tamanho (em pixels do mundo) de cada célula.
+        cols, rows: Dimensões da grade.
+        blocked: Array (cols x rows) com True nas células bloqueadas.
+        version: Contador de edições (aumenta a cada alteração).
+
+    Métodos:
+        load(path, width, height, cell_size): Carrega um mapa de texto ou imagem.
+        from_mask(mask, width, height, cell_size): Cria a grade a partir de uma máscara booleana em qualquer resolução.
+        cell(position): Retorna a célula de uma posição.
+        is_blocked(position): Verifica se a posição está em um obstáculo.
+        resolve_move(x, y, new_x, new_y): Ajusta um movimento para não entrar em obstáculos.
+        paint(position, radius, blocked, protected): Marca ou libera as células de um círculo.
+        set_cells(cells, blocked): Marca ou libera células.
+    """
+    def __init__(self, width, height, cell_size=None):
+        """
+        Cria uma grade sem obstáculos.
+
+        Parameters:
+            width, height: Tamanho do mundo.
+            cell_size (opcional): Tamanho da célula (padrão = GlobalVar.OBSTACLE_CELL_SIZE).
+        """
+        self.cell_size = cell_size or GlobalVar.OBSTACLE_CELL_SIZE
+        self.cols = max(1, math.ceil(width / self.cell_size))
+        self.rows = max(1, math.ceil(height / self.cell_size))
+        self.blocked = np.zeros((self.cols, self.rows), dtype=bool)
+        self.version = 0
+
+    @classmethod
+    def load(cls, path, width=None, height=None, cell_size=None):
+        """
+        Carrega um mapa de obstáculos: arquivos .txt/.map são lidos como texto (uma linha por fileira, "#", "X" ou "@"
+        = obstáculo) e os demais como imagem pelo pygame (pixels com luminância abaixo de 128 = obstáculo).
+
+        Parameters:
+            path: Arquivo do mapa.
+            width, height (opcional): Tamanho do mundo (padrão = GlobalVar.WORLD_WIDTH / WORLD_HEIGHT).
+            cell_size (opcional): Tamanho da célula (padrão = GlobalVar.OBSTACLE_CELL_SIZE).
+        """
+        if os.path.splitext(path)[1].lower() in (".txt", ".map"):
+            with open(path) as file:
+                lines = [line.rstrip("\n") for line in file if line.strip()]
+            if not lines:
+                raise ValueError(f"Mapa de obstáculos vazio: {path}")
+            map_width = max(len(line) for line in lines)
+            mask = np.zeros((map_width, len(lines)), dtype=bool)
+            for y, line in enumerate(lines):
+                for x, char in enumerate(line):
+                    mask[x, y] = char in OBSTACLE_CHARS
+        else:
+            import pygame
+            pixels = pygame.surfarray.array3d(pygame.image.load(path)).astype(np.float64)
+            luminance = pixels[..., 0] * 0.299 + pixels[..., 1] * 0.587 + pixels[..., 2] * 0.114
+            mask = luminance < 128
+
+        return cls.from_mask(mask, width, height, cell_size)
+
+    @classmethod
+    def from_mask(cls, mask, width=None, height=None, cell_size=None):
+        """
+        Cria a grade a partir de uma máscara booleana (x, y) que cobre o mundo inteiro, em qualquer resolução (cada
+        célula usa o valor da máscara no seu centro).
+        """
+        obstacles = cls(width or GlobalVar.WORLD_WIDTH, height or GlobalVar.WORLD_HEIGHT, cell_size)
+        mask = np.asarray(mask, dtype=bool)
+        mask_x = ((np.arange(obstacles.cols) + 0.5) * mask.shape[0] / obstacles.cols).astype(np.int64)
+        mask_y = ((np.arange(obstacles.rows) + 0.5) * mask.shape[1] / obstacles.rows).astype(np.int64)
+        obstacles.blocked[:] = mask[np.minimum(mask_x, mask.shape[0] - 1)][:, np.minimum(mask_y, mask.shape[1] - 1)]
+        return obstacles
+
+    def cell(self, position):
+        """
+        Retorna a célula (cx, cy) que contém a posição (limitada à grade).
+        """
+        cx = min(self.cols - 1, max(0, int(position[0] / self.cell_size)))
+        cy = min(self.rows - 1, max(0, int(position[1] / self.cell_size)))
+        return cx, cy
+
+    def is_blocked(self, position):
+        """
+        Retorna True se a posição está em uma célula bloqueada.
+        """
+        return bool(self.blocked[self.cell(position)])
+
+    def resolve_move(self, x, y, new_x, new_y):
+        """
+        Versão de resolve_moves para uma formiga.
+
+        Returns:
+            tuple: Posição final (x, y).
+        """
+        if not self.is_blocked((new_x, new_y)):
+            return new_x, new_y
+        if not self.is_blocked((new_x, y)):
+            return new_x, y
+        if not self.is_blocked((x, new_y)):
+            return x, new_y
+        return x, y
+
+    def paint(self, position, radius, blocked=True, protected=()):
+        """
+        Marca (ou libera) as células cujo centro está dentro de um círculo.
+
+        Parameters:
+            position: Centro do círculo.
+            radius: Raio do círculo.
+            blocked (opcional): True marca obstáculos, False libera.
+            protected (opcional): Posições cujas células nunca são bloqueadas (ex.: a colônia).
+
+        Returns:
+            list: Células (cx, cy) alteradas.
+        """
+        cell_size = self.cell_size
+        first_x = max(0, int((position[0] - radius) / cell_size))
+        last_x = min(self.cols - 1, int((position[0] + radius) / cell_size))
+        first_y = max(0, int((position[1] - radius) / cell_size))
+        last_y = min(self.rows - 1, int((position[1] + radius) / cell_size))
+        keep = {self.cell(point) for point in protected} if blocked else set()
+
+        cells = []
+        for cx in range(first_x, last_x + 1):
+            for cy in range(first_y, last_y + 1):
+                center_x, center_y = (cx + 0.5) * cell_size, (cy + 0.5) * cell_size
+                if (center_x - position[0])**2 + (center_y - position[1])**2 <= radius**2 and (cx, cy) not in keep:
+                    cells.append((cx, cy))
+        return self.set_cells(cells, blocked)
+
+    def set_cells(self, cells, blocked=True):
+        """
+        Marca (ou libera) células.
+
+        Returns:
+            list: Células (cx, cy) que mudaram de estado.
+        """
+        changed = [(cx, cy) for cx, cy in cells if self.blocked[cx, cy] != blocked]
+        for cell in changed:
+            self.blocked[cell] = blocked
+        if changed:
+            self.version += 1
+        return changed
+
+class NavigationField:
+    """
+    Campo de navegação até a colônia compartilhado por todas as formigas: a distância do caminho mais curto de cada
+    célula livre até a célula da colônia (Dijkstra sobre a grade de obstáculos, 8 vizinhos, sem cortar quinas) e o
+    ponto alvo de cada célula (centro da próxima célula do caminho). Cada formiga consulta o alvo da sua célula em O(1)
+    em vez de procurar um caminho.
+
+    Quando os obstáculos mudam, update() recalcula apenas a região afetada: as células cujo caminho passava pelas
+    células bloqueadas são invalidadas e preenchidas de novo a partir da borda da região, e as células liberadas
+    propagam as distâncias menores. As distâncias ficam iguais às de um recálculo completo.
+
+    Atributos:
+        obstacles: Grade de obstáculos.
+        target: Posição da colônia.
+        distance: Array (cols x rows) com a distância (em pixels) até a colônia (inf = sem caminho).
+        next_x, next_y: Arrays (cols x rows) com o ponto alvo de cada célula (NaN = sem caminho).
+        version: Versão dos obstáculos usada no último cálculo.
+
+    Métodos:
+        rebuild(): Recalcula o campo inteiro.
+        update(changed): Recalcula só a região afetada por células alteradas.
+        direction(position): Direção de retorno de uma formiga.
+        directions(xs, ys): Direções de retorno em lote.
+        trace(xs, ys, speeds, counts): Reconstrói os pontos das rotas de retorno.
+    """
+    def __init__(self, obstacles, target):
+        """
+        Cria o campo e calcula as distâncias.
+
+        Parameters:
+            obstacles: Grade de obstáculos.
+            target: Posição (x, y) da colônia.
+        """
+        self.obstacles = obstacles
+        self.target = (float(target[0]), float(target[1]))
+        self.rebuild()
+
+    def _index(self, cx, cy):
+        return cx * self.obstacles.rows + cy
+
+    def _neighbors(self, index, blocked):
+        """
+        Gera os vizinhos livres de uma célula (índice, custo em células), sem cortar quinas de obstáculos.
+        """
+        rows, cols = self.obstacles.rows, self.obstacles.cols
+        cx, cy = divmod(index, rows)
+        for dcx, dcy, cost in MOVES:
+            nx, ny = cx + dcx, cy + dcy
+            if not (0 <= nx < cols and 0 <= ny < rows):
+                continue
+            neighbor = nx * rows + ny
+            if blocked[neighbor]:
+                continue
+            if dcx and dcy and (blocked[nx * rows + cy] or blocked[cx * rows + ny]):
+                continue
+            yield neighbor, cost
+
+    def rebuild(self):
+        """
+        Recalcula o campo inteiro (Dijkstra a partir da célula da colônia).
+        """
+        obstacles = self.obstacles
+        size = obstacles.cols * obstacles.rows
+        self._blocked = obstacles.blocked.reshape(-1).tolist()
+        self._dist = [math.inf] * size
+        self._parent = [-1] * size
+        self._goal = self._index(*obstacles.cell(self.target))
+
+        if not self._blocked[self._goal]:
+            self._dist[self._goal] = 0.0
+            self._propagate([(0.0, self._goal)], set())
+
+        self.distance = np.array(self._dist, dtype=np.float64).reshape(obstacles.cols, obstacles.rows)
+        self.distance *= obstacles.cell_size
+        self.next_x = np.full((obstacles.cols, obstacles.rows), np.nan)
+        self.next_y = np.full((obstacles.cols, obstacles.rows), np.nan)
+        self._write_targets(range(size))
+        self.version = obstacles.version
+
+    def _propagate(self, heap, touched):
+        """
+        Dijkstra a partir das entradas do heap (distância, célula), registrando as células alteradas em touched.
+        """
+        dist, parent, blocked = self._dist, self._parent, self._blocked
+        heapq.heapify(heap)
+        while heap:
+            current, index = heapq.heappop(heap)
+            if current > dist[index]:
+                continue
+            for neighbor, cost in self._neighbors(index, blocked):
+                candidate = current + cost
+                if candidate < dist[neighbor]:
+                    dist[neighbor] = candidate
+                    parent[neighbor] = index
+                    touched.add(neighbor)
+                    heapq.heappush(heap, (candidate, neighbor))
+
+    def _valid_step(self, index, parent, blocked):
+        """
+        Verifica se o passo de uma célula para a célula pai ainda é permitido (as duas livres e sem cortar quinas).
+        """
+        if blocked[index] or blocked[parent]:
+            return False
+        rows = self.obstacles.rows
+        cx, cy = divmod(index, rows)
+        px, py = divmod(parent, rows)
+        if cx != px and cy != py:
+            return not (blocked[px * rows + cy] or blocked[cx * rows + py])
+        return True
+
+    def update(self, changed):
+        """
+        Recalcula só a região afetada por células alteradas na grade de obstáculos.
+
+        Parameters:
+            changed: Células (cx, cy) que mudaram de estado (retorno de ObstacleMap.paint / set_cells).
+        """
+        obstacles = self.obstacles
+        rows, cols = obstacles.rows, obstacles.cols
+        dist, parent, blocked = self._dist, self._parent, self._blocked
+        changed = [self._index(cx, cy) for cx, cy in changed]
+        for index in changed:
+            blocked[index] = bool(obstacles.blocked.flat[index])
+        self.version = obstacles.version
+        if not changed:
+            return
+
+        if blocked[self._goal]:
+            self.rebuild()
+            return
+
+        # Células vizinhas das alteradas (os passos diagonais entre elas dependem das quinas)
+        around = set(changed)
+        for index in changed:
+            cx, cy = divmod(index, rows)
+            for dcx, dcy, _ in MOVES:
+                nx, ny = cx + dcx, cy + dcy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    around.add(nx * rows + ny)
+
+        # Invalida as células cujo caminho passa por um passo que deixou de ser permitido
+        roots = [
+            index for index in around
+            if dist[index] < math.inf and index != self._goal
+            and (blocked[index] or not self._valid_step(index, parent[index], blocked))
+        ]
+        invalid = set(roots)
+        stack = list(roots)
+        while stack:
+            index = stack.pop()
+            cx, cy = divmod(index, rows)
+            for dcx, dcy, _ in MOVES:
+                nx, ny = cx + dcx, cy + dcy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    neighbor = nx * rows + ny
+                    if parent[neighbor] == index and neighbor not in invalid:
+                        invalid.add(neighbor)
+                        stack.append(neighbor)
+        for index in invalid:
+            dist[index] = math.inf
+            parent[index] = -1
+
+        # Refaz a partir da borda: vizinhos válidos das células invalidadas e da região alterada
+        seeds = set()
+        for index in invalid | around:
+            if blocked[index]:
+                continue
+            if dist[index] < math.inf:
+                seeds.add(index)
+            for neighbor, _ in self._neighbors(index, blocked):
+                if dist[neighbor] < math.inf:
+                    seeds.add(neighbor)
+        touched = set(invalid) | set(changed)
+        self._propagate([(dist[index], index) for index in seeds], touched)
+
+        touched = sorted(touched)
+        flat = self.distance.reshape(-1)
+        flat[touched] = [dist[index] * obstacles.cell_size for index in touched]
+        self._write_targets(touched)
+
+    def _write_targets(self, indices):
+        """
+        Atualiza o ponto alvo das células (centro da célula pai; a posição da colônia na célula da colônia).
+        """
+        rows, cell_size = self.obstacles.rows, self.obstacles.cell_size
+        flat_x, flat_y = self.next_x.reshape(-1), self.next_y.reshape(-1)
+        dist, parent = self._dist, self._parent
+        for index in indices:
+            if index == self._goal and dist[index] == 0.0:
+                flat_x[index], flat_y[index] = self.target
+            elif parent[index] >= 0:
+                px, py = divmod(parent[index], rows)
+                flat_x[index] = (px + 0.5) * cell_size
+                flat_y[index] = (py + 0.5) * cell_size
+            else:
+                flat_x[index] = flat_y[index] = np.nan
+
+    def direction(self, position):
+        """
+        Direção de retorno de uma formiga (centro da próxima célula do caminho; reto para a colônia sem caminho).
+
+        Returns:
+            tuple: Deslocamento (dx, dy) desejado.
+        """
+        cell = self.obstacles.cell(position)
+        target_x = self.next_x.item(cell)
+        if math.isnan(target_x):
+            return (self.target[0] - position[0], self.target[1] - position[1])
+        return (target_x - position[0], self.next_y.item(cell) - position[1])
+
+    def directions(self, xs, ys):
+        """
+        Direções de retorno em lote (ver homing_directions).
+        """
+        return homing_directions(
+            self.next_x, self.next_y, self.obstacles.cell_size, xs, ys, self.target[0], self.target[1]
+        )
+
+    def step(self, xs, ys, speeds):
+        """
+        Um passo de retorno em lote: as mesmas operações do movimento das formigas com comida (direção pelo campo,
+        normalização, limite do mundo e colisão com obstáculos).
+
+        Returns:
+            tuple: Novas posições (x, y).
+        """
+        dx, dy = self.directions(xs, ys)
+        norm = np.maximum(np.maximum(np.abs(dx), np.abs(dy)), 1)
+        new_x = np.clip(xs + speeds * dx / norm, 0, GlobalVar.WORLD_WIDTH)
+        new_y = np.clip(ys + speeds * dy / norm, 0, GlobalVar.WORLD_HEIGHT)
+        resolve_moves(self.obstacles.blocked, self.obstacles.cell_size, xs, ys, new_x, new_y)
+        return new_x, new_y
+
+    def trace(self, xs, ys, speeds, counts):
+        """
+        Reconstrói os pontos das rotas de retorno repetindo os passos a partir do ponto de coleta (usado pelo motor
+        vetorizado, que guarda só o início e a quantidade de passos de cada rota).
+
+        Parameters:
+            xs, ys: Pontos de coleta.
+            speeds: Velocidade de cada formiga.
+            counts: Quantidade de pontos de cada rota.
+
+        Returns:
+            tuple: Arrays (rota, x, y) com todos os pontos, agrupados por rota e na ordem do percurso.
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        total = int(counts.sum())
+        owners = np.repeat(np.arange(len(counts)), counts)
+        points_x = np.empty(total)
+        points_y = np.empty(total)
+        offsets = np.cumsum(counts) - counts
+
+        x, y = np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64)
+        speeds = np.asarray(speeds, dtype=np.float64)
+        active = np.flatnonzero(counts > 0)
+        step = 0
+        while len(active):
+            points_x[offsets[active] + step] = x[active]
+            points_y[offsets[active] + step] = y[active]
+            step += 1
+            active = active[counts[active] > step]
+            if len(active):
+                x[active], y[active] = self.step(x[active], y[active], speeds[active])
+        return owners, points_x, points_y
@@ -0,0 +1,554 @@
+import weakref
+from multiprocessing import get_context, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from global_var import GlobalVar
+from navigation import homing_directions, resolve_moves
+from pheromone import Pheromone
+from pheromone_field import PheromoneField
+from population_engine import PopulationEngine, nearest_food
+from rng import counter_random_array
+
+# Arrays do motor guardados em memória compartilhada (além de owner e claim, usados só pelo modo paralelo)
+SHARED_ARRAYS = (
+    "x", "y", "has_food", "ag_speed", "ag_pheromone_detection_range", "ag_pheromone_strength",
+    "fitness_food_collected", "fitness_steps_count", "route_x", "route_y", "route_steps",
+    "stream_keys", "stream_positions"
+)
+
+def create_shared(shape, dtype):
+    """
+    Cria um array em um bloco de memória compartilhada.
+
+    Returns:
+        tuple: (array, bloco de memória).
+    """
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    block = SharedMemory(create=True, size=size)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf), block
+
+def attach_shared(spec):
+    """
+    Abre um array criado por create_shared em outro processo.
+
+    Parameters:
+        spec: Tupla (nome do bloco, formato, dtype).
+
+    Returns:
+        tuple: (array, bloco de memória).
+    """
+    name, shape, dtype = spec
+    block = SharedMemory(name=name)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf), block
+
+def release_shared(blocks, unlink):
+    """
+    Fecha (e opcionalmente remove) blocos de memória compartilhada.
+    """
+    for block in blocks:
+        try:
+            block.close()
+            if unlink:
+                block.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+def shutdown_workers(connections, processes, blocks):
+    """
+    Encerra os processos dos tiles e remove a memória compartilhada (também chamada pelo finalizador do motor).
+    """
+    for connection in connections:
+        try:
+            connection.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for connection in connections:
+        connection.close()
+    release_shared(blocks, unlink=True)
+
+class SharedPheromoneField(PheromoneField):
+    """
+    Campo denso de feromônios em memória compartilhada (modo paralelo). A grade tem dois buffers: os workers calculam o
+    decaimento e a difusão das suas faixas de colunas lendo um buffer e escrevendo no outro, e então os buffers são
+    trocados. O resultado é igual ao de PheromoneField.update().
+
+    Atributos:
+        engine: Motor paralelo que executa a atualização nos workers.
+        buffers: Os dois arrays da grade (em memória compartilhada).
+        current: Índice do buffer com a grade atual.
+        blocks: Blocos de memória compartilhada dos buffers.
+
+    Métodos:
+        update(): Aplica decaimento e difusão nos workers e troca os buffers.
+    """
+    def __init__(self, engine, field):
+        """
+        Cria a grade compartilhada com as mesmas dimensões e parâmetros de um campo existente (copia as intensidades).
+
+        Parameters:
+            engine: Motor paralelo.
+            field: Campo de feromônios original.
+        """
+        self.engine = engine
+        self.buffers = None
+        self.current = 0
+        self.blocks = []
+        super().__init__(
+            field.cols * field.resolution, field.rows * field.resolution,
+            field.resolution, field.decay_rate, field.diffusion
+        )
+        self.grid = field.grid
+        self.deposit_log = field.deposit_log
+
+    @property
+    def grid(self):
+        return self.buffers[self.current]
+
+    @grid.setter
+    def grid(self, values):
+        # Atribuições substituem o conteúdo do buffer atual (os workers continuam vendo os mesmos blocos)
+        if self.buffers is None:
+            self.buffers = []
+            for _ in range(2):
+                array, block = create_shared(values.shape, np.float64)
+                self.buffers.append(array)
+                self.blocks.append(block)
+        np.copyto(self.buffers[self.current], values)
+
+    def update(self):
+        """
+        Aplica o decaimento e a difusão em paralelo (cada worker calcula uma faixa de colunas) e troca os buffers.
+        """
+        self.engine.update_field(self)
+        self.current = 1 - self.current
+        self._tables = None
+
+def field_columns(cols, count):
+    """
+    Divide as colunas da grade em faixas contínuas (uma por worker).
+
+    Returns:
+        list: Pares (primeira coluna, coluna final exclusiva).
+    """
+    edges = np.linspace(0, cols, count + 1).round().astype(int).tolist()
+    return list(zip(edges[:-1], edges[1:]))
+
+def update_field_columns(source, target, start, stop, decay_rate, diffusion):
+    """
+    Calcula as colunas [start, stop) da grade do próximo tick (as mesmas operações de PheromoneField.update(), lendo uma
+    coluna vizinha de cada lado).
+    """
+    if start >= stop:
+        return
+    cols = source.shape[0]
+    low, high = max(0, start - 1), min(cols, stop + 1)
+    slab = source[low:high] * decay_rate
+
+    if diffusion > 0:
+        # Nas bordas do mundo repete a coluna (como np.pad(mode="edge") na grade inteira)
+        padded = np.pad(slab, 1, mode="edge")
+        neighbors = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]) * 0.25
+        slab *= 1 - diffusion
+        slab += diffusion * neighbors
+
+    result = slab[start - low:stop - low]
+    result[result <= Pheromone.ACTIVE_THRESHOLD] = 0.0
+    target[start:stop] = result
+
+def move_tile(arrays, field, owned, colony_x, colony_y, world_width, world_height, navigation=None):
+    """
+    Move as formigas de um tile: as mesmas operações de PopulationEngine.step (campo denso) até o limite do mundo,
+    aplicadas ao subconjunto de índices do tile.
+
+    Parameters:
+        arrays: Dicionário com os arrays compartilhados do motor.
+        field: Campo de feromônios que lê a grade atual.
+        owned: Índices das formigas do tile.
+        colony_x, colony_y: Posição da colônia.
+        world_width, world_height: Tamanho do mundo.
+        navigation (opcional): Tupla (next_x, next_y, obstáculos, tamanho da célula) do campo de navegação.
+    """
+    x, y = arrays["x"][owned], arrays["y"][owned]
+    carrying = arrays["has_food"][owned]
+    keys, positions = arrays["stream_keys"][owned], arrays["stream_positions"][owned]
+    arrays["fitness_steps_count"][owned] += 1
+
+    dx = -10 + 20 * counter_random_array(keys, positions)
+    dy = -10 + 20 * counter_random_array(keys, positions + np.uint64(1))
+    random_walk = ~carrying
+
+    exploring = np.flatnonzero(~carrying)
+    target_x, target_y, _, found = field.sense_many(
+        x[exploring], y[exploring], arrays["ag_pheromone_detection_range"][owned[exploring]]
+    )
+    following = exploring[found]
+    dx[following] = target_x[found] - x[following]
+    dy[following] = target_y[found] - y[following]
+    random_walk[following] = False
+    positions[random_walk] += np.uint64(2)
+    arrays["stream_positions"][owned] = positions
+
+    if navigation is not None:
+        next_x, next_y, blocked, cell_size = navigation
+        dx[carrying], dy[carrying] = homing_directions(
+            next_x, next_y, cell_size, x[carrying], y[carrying], colony_x, colony_y
+        )
+        old_x, old_y = x.copy(), y.copy()
+    else:
+        dx[carrying] = colony_x - x[carrying]
+        dy[carrying] = colony_y - y[carrying]
+    arrays["route_steps"][owned[carrying]] += 1
+
+    speed = arrays["ag_speed"][owned]
+    norm = np.maximum(np.maximum(np.abs(dx), np.abs(dy)), 1)
+    x += speed * dx / norm
+    y += speed * dy / norm
+    np.clip(x, 0, world_width, out=x)
+    np.clip(y, 0, world_height, out=y)
+    if navigation is not None:
+        resolve_moves(blocked, cell_size, old_x, old_y, x, y)
+    arrays["x"][owned] = x
+    arrays["y"][owned] = y
+
+def tile_worker(index, connection, config):
+    """
+    Loop de um processo worker: espera comandos do processo principal, executa a parte do seu tile e responde.
+
+    Comandos:
+        ("attach", specs): Abre os arrays compartilhados (dicionário nome -> (bloco, formato, dtype)).
+        ("move", food_count, colony_x, colony_y, cell_size): Move as formigas do tile, calcula os pedidos de comida e o
+            novo dono de cada formiga (cell_size = tamanho da célula do campo de navegação; 0 = sem obstáculos).
+            Responde com a quantidade de formigas que mudaram de tile.
+        ("field", source, start, stop): Atualiza as colunas [start, stop) da grade (lê o buffer source).
+        ("stop",): Encerra o worker.
+    """
+    arrays, blocks = {}, []
+    field = PheromoneField(1, 1, config["resolution"], config["decay_rate"], config["diffusion"])
+    try:
+        while True:
+            message = connection.recv()
+            command = message[0]
+            if command == "stop":
+                break
+
+            if command == "attach":
+                release_shared(blocks, unlink=False)
+                arrays, blocks = {}, []
+                for name, spec in message[1].items():
+                    arrays[name], block = attach_shared(spec)
+                    blocks.append(block)
+                field.cols, field.rows = arrays["grid_0"].shape
+                connection.send(None)
+
+            elif command == "move":
+                _, food_count, colony_x, colony_y, cell_size = message
+                owner = arrays["owner"]
+                owned = np.flatnonzero(owner == index)
+                field.grid = arrays[f"grid_{arrays['field_current'][0]}"]
+                navigation = None
+                if cell_size:
+                    navigation = (arrays["nav_next_x"], arrays["nav_next_y"], arrays["obstacles"], cell_size)
+                move_tile(
+                    arrays, field, owned, colony_x, colony_y, config["world_width"], config["world_height"], navigation
+                )
+
+                # Pedidos de comida (a resolução do estoque é feita pelo processo principal)
+                claim = arrays["claim"]
+                claim[owned] = -1
+                searching = owned[~arrays["has_food"][owned]]
+                pair_ant, pair_food = nearest_food(
+                    arrays["x"][searching], arrays["y"][searching],
+                    arrays["food_x"][:food_count], arrays["food_y"][:food_count], config["pickup_radius"]
+                )
+                claim[searching[pair_ant]] = pair_food
+
+                # Passagem das formigas que cruzaram a fronteira para o tile vizinho (vale a partir do próximo tick,
+                # depois da barreira; owner não muda durante o tick)
+                new_owner = np.searchsorted(arrays["bounds"], arrays["x"][owned], side="right")
+                handoffs = int(np.count_nonzero(new_owner != index))
+                arrays["next_owner"][owned] = new_owner
+                connection.send(handoffs)
+
+            elif command == "field":
+                _, source, start, stop = message
+                update_field_columns(
+                    arrays[f"grid_{source}"], arrays[f"grid_{1 - source}"], start, stop,
+                    config["decay_rate"], config["diffusion"]
+                )
+                connection.send(None)
+    finally:
+        arrays.clear()
+        field.grid = None
+        release_shared(blocks, unlink=False)
+        connection.close()
+
+class ParallelEngine(PopulationEngine):
+    """
+    Motor vetorizado com decomposição de domínio: o mundo é dividido em faixas verticais (tiles) e cada faixa é
+    simulada por um processo worker. O estado das formigas e a grade de feromônios ficam em memória compartilhada, então
+    os workers leem e escrevem diretamente nos arrays do motor (o processo principal continua usando todos os métodos do
+    PopulationEngine, como write_back e a evolução).
+
+    Cada tick tem duas barreiras:
+        Movimento: cada worker move as formigas do seu tile, calcula o pedido de comida de cada uma (fonte mais próxima)
+            e passa as formigas que cruzaram a fronteira para o tile vizinho (array owner).
+        Feromônios: cada worker aplica decaimento e difusão em uma faixa de colunas da grade.
+    Os recursos compartilhados são resolvidos pelo processo principal em ordem de índice das formigas: o estoque de
+    comida (serve_food) e as entregas na colônia com o depósito das trilhas (deposit_food). Por isso o resultado é
+    igual ao do PopulationEngine, qualquer que seja a quantidade de workers. Com obstáculos, a grade de obstáculos e o
+    campo de navegação são copiados para a memória compartilhada sempre que mudam.
+
+    A cada GlobalVar.PARALLEL_REBALANCE_INTERVAL ticks, se o tile mais cheio tiver mais que PARALLEL_IMBALANCE vezes a
+    média de formigas, as fronteiras são recalculadas pelos quantis de x das formigas para que cada worker fique com a
+    mesma quantidade (no início de cada geração quase todas estão perto da colônia). Requer PHEROMONE_BACKEND = "field" (os feromônios como objetos não podem ser compartilhados entre
+    processos).
+
+    Atributos:
+        workers: Quantidade de processos (tiles).
+        bounds: Fronteiras internas dos tiles (coordenada x; array compartilhado).
+        owner: Tile dono de cada formiga.
+        next_owner: Tile dono de cada formiga no próximo tick (escrito pelos workers depois do movimento).
+        claim: Fonte de comida pedida por cada formiga no tick (-1 = nenhuma).
+        handoffs: Quantidade de formigas passadas entre tiles no último tick.
+        ticks: Quantidade de ticks executados pelo motor.
+
+    Métodos:
+        step(environment): Executa um tick da população nos workers.
+        update_field(field): Atualiza a grade de feromônios nos workers.
+        rebalance(): Recalcula as fronteiras dos tiles.
+        close(): Encerra os workers e remove a memória compartilhada.
+    """
+    def __init__(self, colony, environment, workers=None):
+        """
+        Cria os processos dos tiles, move o estado para a memória compartilhada e troca o campo de feromônios do
+        ambiente por um SharedPheromoneField.
+
+        Parameters:
+            colony: A colônia cujas formigas serão simuladas.
+            environment: O ambiente da simulação.
+            workers (opcional): Quantidade de processos (padrão = GlobalVar.PARALLEL_WORKERS).
+        """
+        field = environment.pheromone_field
+        if field is None:
+            raise ValueError("O modo paralelo requer PHEROMONE_BACKEND = 'field'.")
+
+        self.workers = max(1, workers or GlobalVar.PARALLEL_WORKERS)
+        self.handoffs = 0
+        self.ticks = 0
+        self._blocks = {}
+        self._shared = {}
+        self._all_blocks = []
+        self._food_capacity = 0
+        self._food_count = 0
+        self._navigation_version = None
+
+        # Os workers usam o mesmo resource tracker do processo principal (senão cada um avisaria de "vazamentos" ao sair)
+        resource_tracker.ensure_running()
+        context = get_context()
+        config = {
+            "resolution": field.resolution,
+            "decay_rate": field.decay_rate,
+            "diffusion": field.diffusion,
+            "pickup_radius": GlobalVar.FOOD_PICKUP_RADIUS,
+            "world_width": GlobalVar.WORLD_WIDTH,
+            "world_height": GlobalVar.WORLD_HEIGHT,
+        }
+        self._connections, self._processes = [], []
+        for index in range(self.workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=tile_worker, args=(index, child, config), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+        # Encerra os workers e remove os blocos mesmo se close() não for chamado
+        self._finalizer = weakref.finalize(
+            self, shutdown_workers, self._connections, self._processes, self._all_blocks
+        )
+
+        # Os blocos da grade pertencem ao campo, mas são removidos junto com os do motor
+        self.field = SharedPheromoneField(self, field)
+        environment.pheromone_field = self.field
+        self._all_blocks.extend(self.field.blocks)
+        self._share("field_current", np.zeros(1, dtype=np.int64))
+        self._share("bounds", np.zeros(self.workers - 1, dtype=np.float64))
+        self._share_food(environment)
+        super().__init__(colony, environment.navigation)
+
+    def _share(self, name, values):
+        """
+        Guarda um array em memória compartilhada e o coloca no atributo de mesmo nome (reaproveita o bloco se o formato
+        e o tipo não mudaram).
+
+        Returns:
+            bool: Se um novo bloco foi criado (os workers precisam abrir os arrays de novo).
+        """
+        shared = self._shared.get(name)
+        if shared is not None and shared.shape == values.shape and shared.dtype == values.dtype:
+            np.copyto(shared, values)
+            setattr(self, name, shared)
+            return False
+
+        array, block = create_shared(values.shape, values.dtype)
+        np.copyto(array, values)
+        old_block = self._blocks.pop(name, None)
+        if old_block is not None:
+            self._all_blocks.remove(old_block)
+            release_shared([old_block], unlink=True)
+        self._blocks[name] = block
+        self._shared[name] = array
+        self._all_blocks.append(block)
+        setattr(self, name, array)
+        return True
+
+    def _share_food(self, environment):
+        """
+        Copia as posições das fontes de comida para a memória compartilhada (aumenta os arrays quando necessário).
+
+        Returns:
+            list: As fontes de comida, na ordem dos índices usados nos pedidos.
+        """
+        foods = list(environment.food_sources)
+        count = len(foods)
+        created = False
+        if "food_x" not in self._shared or count > self._food_capacity:
+            self._food_capacity = max(count, 2 * self._food_capacity, 64)
+            created |= self._share("food_x", np.zeros(self._food_capacity, dtype=np.float64))
+            created |= self._share("food_y", np.zeros(self._food_capacity, dtype=np.float64))
+        self.food_x[:count] = [food.position[0] for food in foods]
+        self.food_y[:count] = [food.position[1] for food in foods]
+        self._food_count = count
+        if created and hasattr(self, "owner"):
+            self._attach_workers()
+        return foods
+
+    def _share_navigation(self):
+        """
+        Copia a grade de obstáculos e o campo de navegação para a memória compartilhada quando mudaram.
+
+        Returns:
+            int: Tamanho da célula do campo de navegação (0 = sem obstáculos).
+        """
+        navigation = self.navigation
+        if navigation is None:
+            return 0
+
+        version = (id(navigation), navigation.version)
+        if version != self._navigation_version:
+            created = self._share("nav_next_x", navigation.next_x)
+            created |= self._share("nav_next_y", navigation.next_y)
+            created |= self._share("obstacles", navigation.obstacles.blocked)
+            if created:
+                self._attach_workers()
+            self._navigation_version = version
+        return navigation.obstacles.cell_size
+
+    def _attach_workers(self):
+        """
+        Envia para os workers os nomes dos blocos de memória compartilhada.
+        """
+        specs = {
+            name: (block.name, self._shared[name].shape, self._shared[name].dtype.str)
+            for name, block in self._blocks.items()
+        }
+        for index, buffer in enumerate(self.field.buffers):
+            specs[f"grid_{index}"] = (self.field.blocks[index].name, buffer.shape, buffer.dtype.str)
+        self._broadcast(("attach", specs))
+
+    def _broadcast(self, message):
+        """
+        Envia a mesma mensagem para todos os workers e espera as respostas (barreira).
+
+        Returns:
+            list: A resposta de cada worker.
+        """
+        for connection in self._connections:
+            connection.send(message)
+        return [connection.recv() for connection in self._connections]
+
+    def load(self):
+        """
+        Copia o estado dos objetos da colônia para os arrays compartilhados e recalcula os tiles.
+        """
+        super().load()
+        created = False
+        for name in SHARED_ARRAYS:
+            created |= self._share(name, getattr(self, name))
+        count = len(self.ants)
+        created |= self._share("owner", np.zeros(count, dtype=np.int64))
+        created |= self._share("next_owner", np.zeros(count, dtype=np.int64))
+        created |= self._share("claim", np.full(count, -1, dtype=np.int64))
+        self.rebalance()
+        if created:
+            self._attach_workers()
+
+    def rebalance(self):
+        """
+        Recalcula as fronteiras dos tiles pelos quantis de x das formigas (mesma quantidade de formigas por worker) e o
+        dono de cada formiga.
+        """
+        if len(self.x) and self.workers > 1:
+            self.bounds[:] = np.quantile(self.x, np.arange(1, self.workers) / self.workers)
+        self.owner[:] = np.searchsorted(self.bounds, self.x, side="right")
+
+    def step(self, environment):
+        """
+        Executa um tick da população: movimento e pedidos de comida nos workers, depois coleta (estoque) e entrega na
+        colônia no processo principal.
+
+        Parameters:
+            environment: Representa o ambiente da simulação.
+
+        Returns:
+            int: Quantidade de formigas que entregaram comida na colônia.
+        """
+        if len(self.ants) == 0:
+            return 0
+
+        if self.ticks and self.ticks % GlobalVar.PARALLEL_REBALANCE_INTERVAL == 0:
+            counts = np.bincount(self.owner, minlength=self.workers)
+            if counts.max() > GlobalVar.PARALLEL_IMBALANCE * len(self.ants) / self.workers:
+                self.rebalance()
+        self.ticks += 1
+
+        foods = self._share_food(environment)
+        searching = int(np.count_nonzero(~self.has_food))
+        environment.profiler.count("pheromone_queries", searching)
+        if foods:
+            environment.profiler.count("food_queries", searching)
+
+        self.field_current[0] = self.field.current
+        cell_size = self._share_navigation()
+        replies = self._broadcast(("move", self._food_count, self.colony.x, self.colony.y, cell_size))
+        self.handoffs = sum(replies)
+        self.owner[:] = self.next_owner
+        environment.profiler.count("tile_handoffs", self.handoffs)
+
+        ants = np.flatnonzero(self.claim >= 0)
+        if len(ants):
+            self.serve_food(environment, foods, ants, self.claim[ants])
+        return self.deposit_food(environment)
+
+    def update_field(self, field):
+        """
+        Atualiza a grade de feromônios: cada worker escreve uma faixa de colunas do buffer que não está em uso.
+        """
+        source = field.current
+        for connection, (start, stop) in zip(self._connections, field_columns(field.cols, self.workers)):
+            connection.send(("field", source, start, stop))
+        for connection in self._connections:
+            connection.recv()
+
+    def close(self):
+        """
+        Encerra os workers e remove a memória compartilhada (o motor não pode mais ser usado).
+        """
+        self._finalizer()
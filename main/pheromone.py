@@ -1,25 +1,86 @@
+import math
+
+class PheromoneClock:
+    """
+    Relógio compartilhado pelos feromônios com decaimento preguiçoso. Ele guarda o tick atual da simulação e a taxa de
+    decaimento, assim cada feromônio calcula sua intensidade apenas quando é lido.
+
+    Atributos:
+        tick: Quantidade de ticks (decaimentos) já executados.
+        decay_rate: A taxa de decaimento aplicada a cada tick.
+    """
+    def __init__(self, decay_rate, tick=0):
+        """
+        Construtor do relógio.
+
+        Parameters:
+            decay_rate: A taxa de decaimento aplicada a cada tick.
+            tick (opcional): Tick inicial.
+        """
+        self.decay_rate = decay_rate
+        self.tick = tick
+
 class Pheromone:
     """
     Classe do feromônio ( tem decaimento ao longo do tempo).
-    
+
+    Quando criado com um relógio (PheromoneClock) o decaimento é preguiçoso: o feromônio guarda o tick do depósito e a
+    intensidade inicial e a intensidade atual é calculada na leitura, aplicando as multiplicações pendentes (o resultado
+    é idêntico ao de chamar gradual_decay a cada tick).
+
     Atributos:
         position (): A posição (x, y) do feromônio.
-        intensity (): A intensidade do feromônio (padrão = 1.0).    
+        intensity (): A intensidade do feromônio (padrão = 1.0).
+        initial_intensity: A intensidade no momento do depósito.
+        deposit_tick: O tick do relógio no momento do depósito.
+        clock: Relógio compartilhado (None = decaimento manual com gradual_decay).
     Métodos:
         gradual_decay(rate): Diminui a intensidade do feromônio multiplicando por taxa fornecida.
         is_active(): Se o feromônio está ativo (True e > 0.1) ou não (False).
+        expiry_tick(): Estimativa do tick em que o feromônio deixa de estar ativo.
     """
-    def __init__(self, position, intensity=1.0):
+    # Intensidade mínima para o feromônio continuar ativo
+    ACTIVE_THRESHOLD = 0.1
+
+    def __init__(self, position, intensity=1.0, clock=None):
         """
         Construtor de novo feromônio.
 
         Parameters:
             position: Coordenadas (x, y) que representam a posição do feromônio.
             intensity (opcional): Intensidade inicial do feromônio.
+            clock (opcional): Relógio compartilhado para o decaimento preguiçoso.
         """
         self.position = position
-        self.intensity = intensity
-        
+        self.initial_intensity = intensity
+        self.clock = clock
+        self.deposit_tick = clock.tick if clock is not None else 0
+
+        # Intensidade já calculada e o tick a que ela corresponde
+        self._intensity = intensity
+        self._tick = self.deposit_tick
+
+    @property
+    def intensity(self):
+        """
+        Retorna a intensidade atual (aplica os decaimentos pendentes desde a última leitura).
+        """
+        clock = self.clock
+        if clock is not None and self._tick < clock.tick:
+            intensity = self._intensity
+            rate = clock.decay_rate
+            for _ in range(clock.tick - self._tick):
+                intensity *= rate
+            self._intensity = intensity
+            self._tick = clock.tick
+        return self._intensity
+
+    @intensity.setter
+    def intensity(self, value):
+        self._intensity = value
+        if self.clock is not None:
+            self._tick = self.clock.tick
+
     def gradual_decay(self, rate = 0.95):
         """
         Reduz a intensidade do feromônio pelo fator de taxa fornecido.
@@ -28,10 +89,26 @@ class Pheromone:
             rate: A taxa de decaimento. O valor padrão é 0.95, ou seja, o decaimento é de 5% por chamada.
         """
         self.intensity *= rate
-        
+
     def is_active(self):
         """
         Verifica se o feromônio ainda está ativo (intensidade > 0.1) no ambiente e retorna True, caso contrário False.
         """
-        return self.intensity > 0.1
+        return self.intensity > self.ACTIVE_THRESHOLD
+
+    def expiry_tick(self):
+        """
+        Estima (analiticamente) o primeiro tick em que a intensidade fica abaixo do limite. A estimativa nunca passa do
+        tick real (pode ser um pouco antes), por isso quem remove o feromônio deve confirmar com is_active().
+
+        Returns:
+            int: O tick estimado ou None se o feromônio nunca expira (taxa >= 1).
+        """
+        rate = self.clock.decay_rate if self.clock is not None else 0.95
+        if self.initial_intensity <= self.ACTIVE_THRESHOLD or rate <= 0:
+            return self.deposit_tick + 1
+        if rate >= 1:
+            return None
 
+        decays = math.ceil(math.log(self.ACTIVE_THRESHOLD / self.initial_intensity) / math.log(rate))
+        return self.deposit_tick + max(1, decays - 1)
@@ -0,0 +1,311 @@
+import math
+
+import numpy as np
+
+from global_var import GlobalVar
+from pheromone import Pheromone
+
+class PheromoneField:
+    """
+    Campo denso de feromônios (grade NumPy sobre a tela). Em vez de guardar cada feromônio como objeto, a intensidade é
+    acumulada nas células da grade. O decaimento é uma multiplicação do array inteiro, a difusão (opcional) é uma
+    convolução com os vizinhos e a detecção soma poucos quadrados de células ao redor da formiga (tabelas de somas
+    acumuladas). O custo por tick depende do tamanho da grade e não da quantidade de trilhas já depositadas.
+
+    Atributos:
+        resolution: Tamanho (em pixels) do lado de cada célula.
+        cols, rows: Dimensões da grade.
+        grid: Array (cols x rows) com a intensidade de cada célula.
+        decay_rate: Fator de decaimento aplicado a cada tick.
+        diffusion: Fração da intensidade espalhada para os vizinhos a cada tick (0 = sem difusão).
+        deposit_log: Lista onde os depósitos (células, intensidades) são registrados (None = sem registro; usado pela
+            gravação do replay).
+
+    Métodos:
+        deposit(position, intensity): Adiciona intensidade na célula da posição.
+        deposit_many(xs, ys, intensities): Adiciona intensidades em lote.
+        update(): Aplica decaimento, difusão e remove intensidades abaixo do limite.
+        intensity_at(position): Retorna a intensidade da célula da posição.
+        count(): Retorna a quantidade de células ativas.
+        summed_tables(): Retorna as tabelas de somas acumuladas da grade.
+        find_best(position, max_distance): Retorna o ponto mais atrativo no alcance.
+        sense_many(xs, ys, max_distances): Versão em lote de find_best.
+        cell_center(cx, cy): Retorna o centro de uma célula em pixels.
+    """
+    # A detecção divide a área do alcance em SENSE_SQUARES x SENSE_SQUARES quadrados
+    SENSE_SQUARES = 4
+
+    def __init__(self, width, height, resolution=None, decay_rate=None, diffusion=None):
+        """
+        Construtor do campo de feromônios.
+
+        Parameters:
+            width, height: Tamanho (em pixels) da área coberta.
+            resolution (opcional): Tamanho da célula (padrão = PHEROMONE_FIELD_RESOLUTION).
+            decay_rate (opcional): Fator de decaimento (padrão = PHEROMONE_DECAY_RATE).
+            diffusion (opcional): Fração de difusão (padrão = PHEROMONE_FIELD_DIFFUSION).
+        """
+        self.resolution = resolution if resolution is not None else GlobalVar.PHEROMONE_FIELD_RESOLUTION
+        self.decay_rate = decay_rate if decay_rate is not None else GlobalVar.PHEROMONE_DECAY_RATE
+        self.diffusion = diffusion if diffusion is not None else GlobalVar.PHEROMONE_FIELD_DIFFUSION
+        self.cols = max(1, math.ceil(width / self.resolution))
+        self.rows = max(1, math.ceil(height / self.resolution))
+        self.grid = np.zeros((self.cols, self.rows), dtype=np.float64)
+        self.deposit_log = None
+        self._tables = None
+
+    def _cells(self, xs, ys):
+        """
+        Converte posições em índices de célula (limitados à grade).
+        """
+        cx = np.clip((np.asarray(xs) / self.resolution).astype(np.int64), 0, self.cols - 1)
+        cy = np.clip((np.asarray(ys) / self.resolution).astype(np.int64), 0, self.rows - 1)
+        return cx, cy
+
+    def cell_center(self, cx, cy):
+        """
+        Retorna as coordenadas (x, y) do centro da célula.
+        """
+        return ((cx + 0.5) * self.resolution, (cy + 0.5) * self.resolution)
+
+    def deposit(self, position, intensity):
+        """
+        Adiciona intensidade de feromônio na célula da posição.
+
+        Parameters:
+            position: Coordenadas (x, y) do depósito.
+            intensity: Intensidade a ser adicionada.
+        """
+        cx = min(self.cols - 1, max(0, int(position[0] / self.resolution)))
+        cy = min(self.rows - 1, max(0, int(position[1] / self.resolution)))
+        self.grid[cx, cy] += intensity
+        self._tables = None
+        if self.deposit_log is not None:
+            self.deposit_log.append((np.array([cx]), np.array([cy]), intensity))
+
+    def deposit_many(self, xs, ys, intensities):
+        """
+        Adiciona intensidades em lote (soma as intensidades que caem na mesma célula).
+
+        Parameters:
+            xs, ys: Coordenadas dos depósitos.
+            intensities: Intensidade de cada depósito (ou um valor único para todos).
+        """
+        cx, cy = self._cells(xs, ys)
+        np.add.at(self.grid, (cx, cy), intensities)
+        self._tables = None
+        if self.deposit_log is not None:
+            self.deposit_log.append((cx, cy, intensities))
+
+    def update(self):
+        """
+        Aplica o decaimento e a difusão e zera as células abaixo do limite de atividade (0.1).
+        """
+        grid = self.grid
+        grid *= self.decay_rate
+
+        if self.diffusion > 0:
+            padded = np.pad(grid, 1, mode="edge")
+            neighbors = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]) * 0.25
+            grid *= 1 - self.diffusion
+            grid += self.diffusion * neighbors
+
+        grid[grid <= Pheromone.ACTIVE_THRESHOLD] = 0.0
+        self._tables = None
+
+    def intensity_at(self, position):
+        """
+        Retorna a intensidade da célula que contém a posição.
+        """
+        cx, cy = self._cells(position[0], position[1])
+        return float(self.grid[cx, cy])
+
+    def count(self):
+        """
+        Retorna a quantidade de células com feromônio ativo.
+        """
+        return int(np.count_nonzero(self.grid))
+
+    def summed_tables(self):
+        """
+        Retorna as tabelas de somas acumuladas da grade: intensidade e intensidade vezes a coordenada x / y do centro
+        da célula (a soma de qualquer retângulo de células sai de 4 leituras, e as duas últimas dão o centro de massa
+        do retângulo). As tabelas usadas por find_best são guardadas e só são refeitas depois de uma atualização ou de
+        um depósito, ou seja, uma vez por tick na maior parte dos ticks.
+
+        Returns:
+            tuple: Arrays (cols + 1 x rows + 1) em que table[i, j] é a soma de grid[:i, :j] (com os pesos).
+        """
+        if self._tables is None:
+            self._tables = self._summed()
+        return self._tables
+
+    def _summed(self):
+        center_x, center_y = self.cell_center(np.arange(self.cols), np.arange(self.rows))
+        tables = np.zeros((3, self.cols + 1, self.rows + 1), dtype=np.float64)
+        tables[0, 1:, 1:] = self.grid
+        tables[1, 1:, 1:] = self.grid * center_x[:, None]
+        tables[2, 1:, 1:] = self.grid * center_y[None, :]
+        np.cumsum(tables, axis=1, out=tables)
+        np.cumsum(tables, axis=2, out=tables)
+        return tables[0], tables[1], tables[2]
+
+    def _square_bounds(self, positions, max_distances, size):
+        """
+        Divide as células que cobrem [posição - alcance, posição + alcance] (em um eixo) em SENSE_SQUARES faixas.
+
+        Returns:
+            ndarray: Array (N x SENSE_SQUARES + 1) com os limites das faixas em índices de célula (limitados à grade).
+        """
+        first = np.floor((positions - max_distances) / self.resolution).astype(np.int64)
+        last = np.floor((positions + max_distances) / self.resolution).astype(np.int64) + 1
+        steps = np.arange(self.SENSE_SQUARES + 1)
+        bounds = first[:, None] + (last - first)[:, None] * steps // self.SENSE_SQUARES
+        return np.clip(bounds, 0, size)
+
+    def find_best(self, position, max_distance):
+        """
+        Retorna o ponto mais atrativo no alcance. A área do alcance é dividida em SENSE_SQUARES x SENSE_SQUARES
+        quadrados cujas intensidades são somadas pelas tabelas de somas acumuladas. Entre os quadrados com centro no
+        alcance, vence o de maior soma / distância, e o alvo é o centro de massa do feromônio dentro dele. Quando a área
+        inteira está vazia (o caso mais comum) a busca termina com 4 leituras da tabela.
+
+        Parameters:
+            position: A posição (x, y) da formiga.
+            max_distance: O alcance de detecção.
+
+        Returns:
+            tuple: Coordenadas (x, y) do alvo ou None se não houver feromônio no alcance.
+        """
+        x, y = position
+        table, table_x, table_y = self.summed_tables()
+        first_x = math.floor((x - max_distance) / self.resolution)
+        last_x = math.floor((x + max_distance) / self.resolution) + 1
+        first_y = math.floor((y - max_distance) / self.resolution)
+        last_y = math.floor((y + max_distance) / self.resolution) + 1
+        x0, x1 = min(self.cols, max(0, first_x)), min(self.cols, max(0, last_x))
+        y0, y1 = min(self.rows, max(0, first_y)), min(self.rows, max(0, last_y))
+        total = table.item(x1, y1) - table.item(x0, y1) - table.item(x1, y0) + table.item(x0, y0)
+        if total <= Pheromone.ACTIVE_THRESHOLD:
+            return None
+
+        # Mesmas contas de sense_many (limites de _square_bounds), quadrado a quadrado na ordem x, y
+        squares = self.SENSE_SQUARES
+        bx = [first_x + (last_x - first_x) * k // squares for k in range(squares + 1)]
+        by = [first_y + (last_y - first_y) * k // squares for k in range(squares + 1)]
+        if x0 != first_x or x1 != last_x:
+            bx = [min(self.cols, max(0, bound)) for bound in bx]
+        if y0 != first_y or y1 != last_y:
+            by = [min(self.rows, max(0, bound)) for bound in by]
+        corners = [[table.item(i, j) for j in by] for i in bx]
+        half = self.resolution / 2
+        best = None
+        best_attractiveness = 0.0
+        for i in range(squares):
+            center_x = (bx[i] + bx[i + 1]) * half
+            low, high = corners[i], corners[i + 1]
+            for j in range(squares):
+                total = high[j + 1] - low[j + 1] - high[j] + low[j]
+                if total <= Pheromone.ACTIVE_THRESHOLD:
+                    continue
+                center_y = (by[j] + by[j + 1]) * half
+                distance = math.sqrt((center_x - x)**2 + (center_y - y)**2)
+                if distance > max_distance:
+                    continue
+                attractiveness = total / (distance if distance > 1 else 1)
+                if best is None or attractiveness > best_attractiveness:
+                    best = (i, j, total)
+                    best_attractiveness = attractiveness
+
+        if best is None:
+            return None
+        i, j, total = best
+        sx0, sx1, sy0, sy1 = bx[i], bx[i + 1], by[j], by[j + 1]
+        weighted_x = table_x.item(sx1, sy1) - table_x.item(sx0, sy1) - table_x.item(sx1, sy0) + table_x.item(sx0, sy0)
+        weighted_y = table_y.item(sx1, sy1) - table_y.item(sx0, sy1) - table_y.item(sx1, sy0) + table_y.item(sx0, sy0)
+        return (weighted_x / total, weighted_y / total)
+
+    def sense_many(self, xs, ys, max_distances):
+        """
+        Versão em lote de find_best (mesmo resultado para cada formiga). As tabelas são calculadas a cada chamada
+        (uma vez por tick no motor vetorizado).
+
+        Parameters:
+            xs, ys: Arrays com as posições das formigas.
+            max_distances: Array com o alcance de detecção de cada formiga.
+
+        Returns:
+            tuple: Arrays (alvo_x, alvo_y, intensidade do quadrado escolhido, encontrado).
+        """
+        count = len(xs)
+        target_x = np.zeros(count, dtype=np.float64)
+        target_y = np.zeros(count, dtype=np.float64)
+        intensity = np.zeros(count, dtype=np.float64)
+        found = np.zeros(count, dtype=bool)
+        table, table_x, table_y = self._summed()
+        stride = self.rows + 1
+
+        # Só as formigas com feromônio ativo em algum ponto da área do alcance são avaliadas
+        bx = self._square_bounds(xs, max_distances, self.cols)
+        by = self._square_bounds(ys, max_distances, self.rows)
+        x0, x1, y0, y1 = bx[:, 0], bx[:, -1], by[:, 0], by[:, -1]
+        total = table[x1, y1] - table[x0, y1] - table[x1, y0] + table[x0, y0]
+        occupied = np.flatnonzero(total > Pheromone.ACTIVE_THRESHOLD)
+        xs, ys, max_distances = xs[occupied], ys[occupied], max_distances[occupied]
+        bx, by = bx[occupied], by[occupied]
+
+        # Soma e distância até o centro de cada quadrado
+        corners = table.ravel().take(bx[:, :, None] * stride + by[:, None, :])
+        sums = corners[:, 1:, 1:] - corners[:, :-1, 1:]
+        sums -= corners[:, 1:, :-1]
+        sums += corners[:, :-1, :-1]
+        dx = (bx[:, :-1] + bx[:, 1:]) * (self.resolution / 2) - xs[:, None]
+        dy = (by[:, :-1] + by[:, 1:]) * (self.resolution / 2) - ys[:, None]
+        distance = np.sqrt(dx[:, :, None]**2 + dy[:, None, :]**2)
+        valid = (sums > Pheromone.ACTIVE_THRESHOLD) & (distance <= max_distances[:, None, None])
+
+        squares = self.SENSE_SQUARES
+        attractiveness = np.where(valid, sums / np.maximum(1, distance), -np.inf).reshape(len(xs), squares * squares)
+        best = np.argmax(attractiveness, axis=1)
+        has_square = valid.reshape(len(xs), squares * squares).any(axis=1)
+        ants = occupied[has_square]
+        best, bx, by = best[has_square], bx[has_square], by[has_square]
+
+        # Centro de massa do feromônio no quadrado escolhido
+        rows = np.arange(len(ants))
+        sx0, sx1 = bx[rows, best // squares], bx[rows, best // squares + 1]
+        sy0, sy1 = by[rows, best % squares], by[rows, best % squares + 1]
+        corners = np.stack([sx1 * stride + sy1, sx0 * stride + sy1, sx1 * stride + sy0, sx0 * stride + sy0])
+        total, weighted_x, weighted_y = (
+            values[0] - values[1] - values[2] + values[3]
+            for values in (table.ravel().take(corners), table_x.ravel().take(corners), table_y.ravel().take(corners))
+        )
+        target_x[ants] = weighted_x / total
+        target_y[ants] = weighted_y / total
+        intensity[ants] = total
+        found[ants] = True
+        return target_x, target_y, intensity, found
+
+        squares = self.SENSE_SQUARES
+        sx0 = bx[ants, square // squares]
+        sx1 = bx[ants, square // squares + 1]
+        sy0 = by[ants, square % squares]
+        sy1 = by[ants, square % squares + 1]
+
+        # Célula mais intensa do quadrado (a primeira na ordem x, y em caso de empate)
+        width = int((sx1 - sx0).max())
+        height = int((sy1 - sy0).max())
+        offset_x = np.arange(width)[None, :, None]
+        offset_y = np.arange(height)[None, None, :]
+        inside = (offset_x < (sx1 - sx0)[:, None, None]) & (offset_y < (sy1 - sy0)[:, None, None])
+        cells_x = np.minimum(sx0[:, None, None] + offset_x, self.cols - 1)
+        cells_y = np.minimum(sy0[:, None, None] + offset_y, self.rows - 1)
+        values = np.where(inside, self.grid[cells_x, cells_y], -np.inf).reshape(len(ants), width * height)
+        best = np.argmax(values, axis=1)
+
+        cx = sx0 + best // height
+        cy = sy0 + best % height
+        target_x[ants], target_y[ants] = self.cell_center(cx, cy)
+        intensity[ants] = self.grid[cx, cy]
+        found[ants] = True
+        return target_x, target_y, intensity, found
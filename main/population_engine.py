@@ -0,0 +1,711 @@
+import math
+
+import numpy as np
+
+from global_var import GlobalVar
+from navigation import resolve_moves
+from rng import counter_random_array
+
+# Busca em lote dos feromônios (PopulationEngine.nearest_pheromones): tamanho (em pixels) das células e folga das
+# distâncias mínimas até as células
+NEAREST_CELL_SIZE = 10
+NEAREST_TOLERANCE = 1e-6
+
+def _expand_ranges(starts, lengths):
+    """
+    Concatena os intervalos [start, start + length) em um único array de índices.
+    """
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(int(np.sum(lengths)))
+
+class PopulationEngine:
+    """
+    Motor vetorizado da população de formigas (estrutura de arrays). Ele guarda o estado das formigas normais e
+    exploradoras da colônia em arrays NumPy e executa um tick de movimento, limite do mundo, coleta de comida e entrega
+    na colônia com operações em lote, sem chamar Ant.move formiga por formiga.
+
+    Os objetos Ant/Ant_Scout da colônia continuam existindo como visões do estado: write_back() copia os arrays para os
+    objetos (usado pelo renderer e antes da evolução) e load() copia os objetos para os arrays (depois da evolução).
+
+    Diferenças em relação ao loop por objeto:
+        Os feromônios depositados em um tick só são vistos pelas formigas no tick seguinte.
+        Se várias formigas disputam a última unidade de uma fonte de comida, as primeiras da lista ganham e as
+        outras tentam novamente no próximo tick.
+        A rota de retorno é guardada como ponto inicial + quantidade de passos (o retorno é uma reta até a colônia ou,
+        com obstáculos, o caminho do campo de navegação, refeito a partir do ponto inicial quando necessário).
+
+    Atributos:
+        colony: A colônia cujas formigas são simuladas.
+        navigation: Campo de navegação usado no retorno com obstáculos (None = retorno em linha reta).
+        ants: Lista das formigas (normais seguidas das exploradoras), na mesma ordem dos arrays.
+        x, y: Coordenadas das formigas.
+        has_food: Se a formiga está carregando comida.
+        ag_speed, ag_pheromone_detection_range, ag_pheromone_strength: Atributos genéticos.
+        fitness_food_collected, fitness_steps_count: Contadores de fitness.
+        route_x, route_y: Posição onde a formiga pegou a comida (início da rota de retorno).
+        route_steps: Quantidade de passos dados no retorno para a colônia.
+        ant_ids: Identificador de cada formiga (Ant.id).
+        stream_ids: Identificador da sequência aleatória de cada formiga.
+        stream_keys, stream_positions: Chave e posição da sequência aleatória de cada formiga (os números são gerados
+            em lote a partir delas, iguais aos que a formiga usaria no loop por objeto).
+
+    Métodos:
+        load(): Copia o estado dos objetos da colônia para os arrays.
+        write_back(): Copia o estado dos arrays para os objetos da colônia.
+        write_back_slot(index): Copia o estado de uma formiga dos arrays para o objeto.
+        load_slot(index): Copia o estado de uma formiga do objeto para os arrays.
+        step(environment): Executa um tick da população e retorna a quantidade de entregas.
+        nearest_pheromones(grid, indices): Busca em lote os feromônios mais atrativos para as formigas.
+        route_points(index): Retorna os pontos da rota de retorno de uma formiga.
+        write_routes(indices): Copia as rotas de retorno dos arrays para os objetos das formigas.
+        route_line(index): Retorna a rota de retorno de uma formiga como trecho reto.
+        serve_food(environment, foods, ants, food_indices): Resolve os pedidos de comida das formigas.
+        close(): Libera os recursos do motor (sem efeito no motor serial).
+    """
+    def __init__(self, colony, navigation=None):
+        """
+        Construtor do motor vetorizado.
+
+        Parameters:
+            colony: A colônia cujas formigas serão simuladas.
+            navigation (opcional): Campo de navegação do retorno com obstáculos.
+        """
+        self.colony = colony
+        self.navigation = navigation
+        self.load()
+
+    def __len__(self):
+        return len(self.ants)
+
+    def load(self):
+        """
+        Copia o estado das formigas (objetos) da colônia para os arrays.
+        """
+        self.ants = self.colony.ants + self.colony.ants_scout
+        ants = self.ants
+
+        self.x = np.array([ant.x for ant in ants], dtype=np.float64)
+        self.y = np.array([ant.y for ant in ants], dtype=np.float64)
+        self.has_food = np.array([ant.has_food for ant in ants], dtype=bool)
+        self.ag_speed = np.array([ant.ag_speed for ant in ants], dtype=np.float64)
+        self.ag_pheromone_detection_range = np.array([ant.ag_pheromone_detection_range for ant in ants], dtype=np.float64)
+        self.ag_pheromone_strength = np.array([ant.ag_pheromone_strength for ant in ants], dtype=np.float64)
+        self.fitness_food_collected = np.array([ant.fitness_food_collected for ant in ants], dtype=np.int64)
+        self.fitness_steps_count = np.array([ant.fitness_steps_count for ant in ants], dtype=np.int64)
+
+        # Rotas em andamento são reduzidas ao primeiro ponto e à quantidade de passos
+        starts = [ant.food_return_route.first() or ant.position for ant in ants]
+        self.route_x = np.array([start[0] for start in starts], dtype=np.float64)
+        self.route_y = np.array([start[1] for start in starts], dtype=np.float64)
+        self.route_steps = np.array([len(ant.food_return_route) for ant in ants], dtype=np.int64)
+
+        self.ant_ids = np.array([ant.id for ant in ants], dtype=np.int64)
+        self.stream_ids = np.array([ant.rng.stream_id for ant in ants], dtype=np.int64)
+        self.stream_keys = np.array([ant.rng.key for ant in ants], dtype=np.uint64)
+        self.stream_positions = np.array([ant.rng.position for ant in ants], dtype=np.uint64)
+
+    def write_back(self):
+        """
+        Copia o estado dos arrays para os objetos das formigas (para o renderer e o algoritmo genético).
+        """
+        for i, ant in enumerate(self.ants):
+            ant.x = float(self.x[i])
+            ant.y = float(self.y[i])
+            ant.has_food = bool(self.has_food[i])
+            ant.exploring = not ant.has_food
+            ant.fitness_food_collected = int(self.fitness_food_collected[i])
+            ant.fitness_steps_count = int(self.fitness_steps_count[i])
+            if not ant.has_food:
+                ant.food_return_route.clear()
+            ant.rng.seek(int(self.stream_positions[i]))
+        self.write_routes(np.flatnonzero(self.has_food))
+
+    def write_back_slot(self, index):
+        """
+        Copia o estado de uma formiga dos arrays para o objeto (usado pela evolução contínua, que só lê algumas
+        formigas por tick).
+
+        Parameters:
+            index: Índice da formiga nos arrays.
+        """
+        ant = self.ants[index]
+        ant.x = float(self.x[index])
+        ant.y = float(self.y[index])
+        ant.has_food = bool(self.has_food[index])
+        ant.exploring = not ant.has_food
+        ant.fitness_food_collected = int(self.fitness_food_collected[index])
+        ant.fitness_steps_count = int(self.fitness_steps_count[index])
+        if ant.has_food:
+            self.write_routes([index])
+        else:
+            ant.food_return_route.clear()
+        ant.rng.seek(int(self.stream_positions[index]))
+
+    def load_slot(self, index):
+        """
+        Copia o estado de uma formiga do objeto para os arrays (depois de o objeto ser alterado fora do motor).
+
+        Parameters:
+            index: Índice da formiga nos arrays.
+        """
+        ant = self.ants[index]
+        self.x[index] = ant.x
+        self.y[index] = ant.y
+        self.has_food[index] = ant.has_food
+        self.ag_speed[index] = ant.ag_speed
+        self.ag_pheromone_detection_range[index] = ant.ag_pheromone_detection_range
+        self.ag_pheromone_strength[index] = ant.ag_pheromone_strength
+        self.fitness_food_collected[index] = ant.fitness_food_collected
+        self.fitness_steps_count[index] = ant.fitness_steps_count
+
+        start = ant.food_return_route.first() or ant.position
+        self.route_x[index], self.route_y[index] = start
+        self.route_steps[index] = len(ant.food_return_route)
+        self.stream_positions[index] = ant.rng.position
+        self.ant_ids[index] = ant.id
+
+    def route_points(self, index):
+        """
+        Retorna os pontos da rota de retorno de uma formiga (reta do ponto de coleta até a colônia ou, com obstáculos,
+        o caminho refeito pelo campo de navegação).
+
+        Parameters:
+            index: Índice da formiga nos arrays.
+
+        Returns:
+            list: Pontos (x, y) registrados durante o retorno.
+        """
+        if self.navigation is not None:
+            _, xs, ys = self.trace_routes([index])
+            return list(zip(xs.tolist(), ys.tolist()))
+        start_x, start_y, step_x, step_y, count = self.route_line(index)
+        return [(start_x + k * step_x, start_y + k * step_y) for k in range(count)]
+
+    def route_line(self, index):
+        """
+        Retorna a rota de retorno de uma formiga como trecho reto.
+
+        Parameters:
+            index: Índice da formiga nos arrays.
+
+        Returns:
+            tuple: (início x, início y, passo x, passo y, quantidade de pontos).
+        """
+        start_x, start_y = float(self.route_x[index]), float(self.route_y[index])
+        dx = self.colony.x - start_x
+        dy = self.colony.y - start_y
+        norm = max(abs(dx), abs(dy), 1)
+        speed = float(self.ag_speed[index])
+        return (start_x, start_y, speed * dx / norm, speed * dy / norm, int(self.route_steps[index]))
+
+    def trace_routes(self, indices):
+        """
+        Refaz pelo campo de navegação as rotas de retorno de várias formigas (ver NavigationField.trace).
+
+        Parameters:
+            indices: Índices das formigas nos arrays.
+
+        Returns:
+            tuple: Arrays (posição em indices, x, y) com os pontos, agrupados por formiga e na ordem do percurso.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        return self.navigation.trace(
+            self.route_x[indices], self.route_y[indices], self.ag_speed[indices], self.route_steps[indices]
+        )
+
+    def write_routes(self, indices):
+        """
+        Copia as rotas de retorno dos arrays para os objetos das formigas.
+
+        Parameters:
+            indices: Índices das formigas (carregando comida) nos arrays.
+        """
+        if self.navigation is None:
+            for i in indices:
+                self.ants[i].food_return_route.set_line(*self.route_line(i))
+            return
+
+        _, xs, ys = self.trace_routes(indices)
+        xs, ys = xs.tolist(), ys.tolist()
+        offset = 0
+        for i in indices:
+            route = self.ants[i].food_return_route
+            route.clear()
+            count = int(self.route_steps[i])
+            for k in range(offset, offset + count):
+                route.append(xs[k], ys[k])
+            offset += count
+
+    def step(self, environment):
+        """
+        Executa um tick da população: movimento (retorno ou exploração), limite do mundo, coleta de comida e entrega na
+        colônia.
+
+        Parameters:
+            environment: Representa o ambiente da simulação (contêm informações sobre a colônia, fontes de comida e feromônios).
+
+        Returns:
+            int: Quantidade de formigas que entregaram comida na colônia.
+        """
+        if len(self.ants) == 0:
+            return 0
+
+        self.fitness_steps_count += 1
+
+        carrying = self.has_food
+        dx, dy = self.direction_exploration(environment)
+
+        # Retorno para a colônia (a rota é registrada antes do passo)
+        navigation = self.navigation
+        if navigation is not None:
+            dx[carrying], dy[carrying] = navigation.directions(self.x[carrying], self.y[carrying])
+            old_x, old_y = self.x.copy(), self.y.copy()
+        else:
+            dx[carrying] = self.colony.x - self.x[carrying]
+            dy[carrying] = self.colony.y - self.y[carrying]
+        self.route_steps[carrying] += 1
+
+        # Normaliza e aplica o movimento
+        norm = np.maximum(np.maximum(np.abs(dx), np.abs(dy)), 1)
+        self.x += self.ag_speed * dx / norm
+        self.y += self.ag_speed * dy / norm
+
+        # Mantém dentro dos limites do mundo
+        np.clip(self.x, 0, GlobalVar.WORLD_WIDTH, out=self.x)
+        np.clip(self.y, 0, GlobalVar.WORLD_HEIGHT, out=self.y)
+
+        # Não entra em obstáculos
+        if navigation is not None:
+            obstacles = navigation.obstacles
+            resolve_moves(obstacles.blocked, obstacles.cell_size, old_x, old_y, self.x, self.y)
+
+        self.check_for_food(environment)
+        return self.deposit_food(environment)
+
+    def direction_exploration(self, environment):
+        """
+        Calcula a direção das formigas que estão explorando: segue o feromônio mais atrativo no alcance de detecção ou
+        anda aleatoriamente. Com o campo denso a detecção é feita em lote; com feromônios como objetos, só consulta os
+        feromônios das formigas que têm alguma célula ocupada no alcance.
+
+        Returns:
+            tuple: Arrays (dx, dy) com o deslocamento de todas as formigas.
+        """
+        # Passo aleatório de cada formiga: os dois próximos números da sua sequência (como rng.uniform(-10, 10))
+        positions = self.stream_positions
+        dx = -10 + 20 * counter_random_array(self.stream_keys, positions)
+        dy = -10 + 20 * counter_random_array(self.stream_keys, positions + np.uint64(1))
+        random_walk = ~self.has_food
+
+        field = environment.pheromone_field
+        if field is not None:
+            exploring = np.flatnonzero(~self.has_food)
+            environment.profiler.count("pheromone_queries", len(exploring))
+            target_x, target_y, _, found = field.sense_many(
+                self.x[exploring], self.y[exploring], self.ag_pheromone_detection_range[exploring]
+            )
+            following = exploring[found]
+            dx[following] = target_x[found] - self.x[following]
+            dy[following] = target_y[found] - self.y[following]
+            random_walk[following] = False
+        elif environment.pheromones:
+            exploring = np.flatnonzero(~self.has_food)
+            candidates = exploring[self.near_pheromone_cells(environment.pheromone_grid, exploring)]
+
+            profiler = environment.profiler
+            start = profiler.start()
+            target_x, target_y, found = self.nearest_pheromones(environment.pheromone_grid, candidates)
+            profiler.stop("pheromone_search", start)
+            profiler.count("pheromone_queries", len(candidates))
+            following = candidates[found]
+            dx[following] = target_x[found] - self.x[following]
+            dy[following] = target_y[found] - self.y[following]
+            random_walk[following] = False
+
+        # Só as formigas que andaram aleatoriamente consomem os números
+        positions[random_walk] += np.uint64(2)
+        return dx, dy
+
+    def nearest_pheromones(self, grid, indices):
+        """
+        Busca em lote de Environment.find_nearest_pheromone (feromônios como objetos): para cada formiga, o feromônio
+        mais atrativo (intensidade / distância) no alcance de detecção, o mais antigo em caso de empate.
+
+        Os feromônios são agrupados em células de NEAREST_CELL_SIZE pixels e as formigas em grupos (mesma célula e
+        mesma faixa de alcance). As células de feromônios são podadas com limites da atratividade (a maior intensidade
+        da célula dividida pela menor distância até ela):
+            Por grupo: descarta as células que não alcançam a atratividade garantida a todas as formigas do grupo (um
+                feromônio no alcance de todas, na maior distância possível até elas).
+            Por formiga: descarta as células que não alcançam a atratividade do representante do grupo (o feromônio
+                mais promissor) na distância real até a formiga.
+        Só os feromônios das células restantes são comparados formiga a formiga, e o resultado é o mesmo da busca uma
+        a uma (mesmas contas em ponto flutuante).
+
+        Parameters:
+            grid: Índice espacial (SpatialHash) dos feromônios.
+            indices: Índices das formigas.
+
+        Returns:
+            tuple: Arrays (x, y) do feromônio escolhido e máscara de quais formigas encontraram um feromônio.
+        """
+        count = len(indices)
+        target_x, target_y = np.zeros(count), np.zeros(count)
+        found = np.zeros(count, dtype=bool)
+        if count == 0 or not grid.cells:
+            return target_x, target_y, found
+
+        # Tabela dos feromônios (a intensidade é lida uma vez por feromônio)
+        items = [entry for bucket in grid.cells.values() for entry in bucket.items()]
+        size = len(items)
+        px = np.fromiter((pheromone.position[0] for pheromone, _ in items), dtype=np.float64, count=size)
+        py = np.fromiter((pheromone.position[1] for pheromone, _ in items), dtype=np.float64, count=size)
+        intensity = np.fromiter((pheromone.intensity for pheromone, _ in items), dtype=np.float64, count=size)
+        order = np.fromiter((order for _, order in items), dtype=np.int64, count=size)
+
+        x, y = self.x[indices], self.y[indices]
+        reach = self.ag_pheromone_detection_range[indices]
+        cell = NEAREST_CELL_SIZE
+        radius = int(reach.max() // cell) + 1
+
+        # Células em uma grade com margem (linhas contínuas no índice linear): as formigas até radius células das
+        # células ocupadas e as vizinhanças delas. Feromônios ordenados por célula
+        cell_x = np.floor(px / cell).astype(np.int64)
+        cell_y = np.floor(py / cell).astype(np.int64)
+        min_cx, min_cy = int(cell_x.min()) - 2 * radius, int(cell_y.min()) - 2 * radius
+        columns, rows = int(cell_x.max()) + 2 * radius + 1 - min_cx, int(cell_y.max()) + 2 * radius + 1 - min_cy
+        keys = (cell_x - min_cx) * rows + (cell_y - min_cy)
+        by_cell = np.argsort(keys, kind="stable")
+        px, py, intensity, order = px[by_cell], py[by_cell], intensity[by_cell], order[by_cell]
+        cells, cell_start, cell_count = np.unique(keys[by_cell], return_index=True, return_counts=True)
+        cell_max = np.maximum.reduceat(intensity, cell_start)
+
+        # Células das formigas que podem ter feromônios no alcance
+        ant_cx = np.floor(x / cell).astype(np.int64) - min_cx
+        ant_cy = np.floor(y / cell).astype(np.int64) - min_cy
+        inside = np.flatnonzero(
+            (ant_cx >= radius) & (ant_cx < columns - radius) & (ant_cy >= radius) & (ant_cy < rows - radius)
+        )
+        if not len(inside):
+            return target_x, target_y, found
+        # Grupos de formigas: mesma célula e mesma faixa de alcance (de uma célula de largura), para os limites de
+        # alcance de cada grupo serem próximos dos das suas formigas (tabela de consulta em vez de np.unique)
+        bands = radius
+        band = np.minimum(reach[inside] // cell, bands - 1).astype(np.int64)
+        ant_keys = (ant_cx[inside] * rows + ant_cy[inside]) * bands + band
+        groups = np.flatnonzero(np.bincount(ant_keys, minlength=columns * rows * bands))
+        lookup = np.zeros(columns * rows * bands, dtype=np.int64)
+        lookup[groups] = np.arange(len(groups))
+        ant_group = lookup[ant_keys]
+        group_cell = groups // bands
+        min_reach = np.full(len(groups), np.inf)
+        max_reach = np.zeros(len(groups))
+        np.minimum.at(min_reach, ant_group, reach[inside])
+        np.maximum.at(max_reach, ant_group, reach[inside])
+        group_radius = (max_reach // cell).astype(np.int64) + 1
+
+        # Pares (grupo, célula de feromônios) vizinhos: em cada coluna, as linhas vizinhas são um trecho contínuo das
+        # células ocupadas
+        offsets = np.arange(-radius, radius + 1)
+        column = group_cell[:, None] + offsets * rows
+        first = np.searchsorted(cells, (column - group_radius[:, None]).reshape(-1))
+        lengths = np.searchsorted(cells, (column + group_radius[:, None]).reshape(-1), side="right") - first
+        lengths[(np.abs(offsets) > group_radius[:, None]).reshape(-1)] = 0
+        pair_group = np.repeat(np.repeat(np.arange(len(groups)), len(offsets)), lengths)
+        pair_cell = _expand_ranges(first, lengths)
+
+        # Menor distância entre as células (a tolerância cobre o arredondamento do cálculo das células)
+        apart_x = np.maximum(np.abs(cells[pair_cell] // rows - group_cell[pair_group] // rows) - 1, 0)
+        apart_y = np.maximum(np.abs(cells[pair_cell] % rows - group_cell[pair_group] % rows) - 1, 0)
+        gap = np.maximum(cell * np.sqrt(apart_x**2 + apart_y**2) - NEAREST_TOLERANCE, 0)
+        near = gap <= max_reach[pair_group]
+        pair_group, pair_cell = pair_group[near], pair_cell[near]
+        bound = cell_max[pair_cell] / np.maximum(1, gap[near])
+
+        # Atratividade garantida de cada grupo: feromônios da célula mais promissora que estão no alcance de todas as
+        # formigas do grupo, na maior distância possível até elas
+        promising = np.full(len(groups), -np.inf)
+        np.maximum.at(promising, pair_group, bound)
+        chosen = np.flatnonzero(bound == promising[pair_group])
+        owner = np.repeat(pair_group[chosen], cell_count[pair_cell[chosen]])
+        pheromone = _expand_ranges(cell_start[pair_cell[chosen]], cell_count[pair_cell[chosen]])
+        left = (group_cell[owner] // rows + min_cx) * cell
+        top = (group_cell[owner] % rows + min_cy) * cell
+        far_x = np.maximum(np.abs(px[pheromone] - left), np.abs(px[pheromone] - (left + cell)))
+        far_y = np.maximum(np.abs(py[pheromone] - top), np.abs(py[pheromone] - (top + cell)))
+        far = np.sqrt(far_x**2 + far_y**2) + NEAREST_TOLERANCE
+        guaranteed = np.where(far <= min_reach[owner], intensity[pheromone] / np.maximum(1, far), -np.inf)
+        floor = np.full(len(groups), -np.inf)
+        np.maximum.at(floor, owner, guaranteed)
+
+        # Células restantes de cada grupo (trecho contínuo dos pares, que estão em ordem de grupo) e um feromônio
+        # representante por grupo (o de maior atratividade garantida, sem considerar o alcance)
+        kept = bound >= floor[pair_group]
+        pair_group, pair_cell = pair_group[kept], pair_cell[kept]
+        group_count = np.bincount(pair_group, minlength=len(groups))
+        group_start = np.cumsum(group_count) - group_count
+        score = intensity[pheromone] / np.maximum(1, far)
+        top_score = np.full(len(groups), -np.inf)
+        np.maximum.at(top_score, owner, score)
+        representative = np.zeros(len(groups), dtype=np.int64)
+        representative[owner[score == top_score[owner]]] = pheromone[score == top_score[owner]]
+
+        # Limite inferior de cada formiga (o representante na distância real) e poda das células formiga a formiga
+        rep = representative[ant_group]
+        distance = np.sqrt((x[inside] - px[rep])**2 + (y[inside] - py[rep])**2)
+        lower = np.where(distance <= reach[inside], intensity[rep] / np.maximum(1, distance), -np.inf)
+        lengths = group_count[ant_group]
+        owner = np.repeat(inside, lengths)
+        ant_pair = _expand_ranges(group_start[ant_group], lengths)
+        ant_cell = pair_cell[ant_pair]
+        left = (cells[ant_cell] // rows + min_cx) * cell
+        top = (cells[ant_cell] % rows + min_cy) * cell
+        gap_x = np.maximum(np.maximum(left - x[owner], x[owner] - (left + cell)), 0)
+        gap_y = np.maximum(np.maximum(top - y[owner], y[owner] - (top + cell)), 0)
+        gap = np.maximum(np.sqrt(gap_x**2 + gap_y**2) - NEAREST_TOLERANCE, 0)
+        useful = (gap <= reach[owner]) & (cell_max[ant_cell] / np.maximum(1, gap) >= np.repeat(lower, lengths))
+        owner, ant_cell = owner[useful], ant_cell[useful]
+
+        # Comparação formiga a formiga
+        owner = np.repeat(owner, cell_count[ant_cell])
+        pheromone = _expand_ranges(cell_start[ant_cell], cell_count[ant_cell])
+        distance = np.sqrt((x[owner] - px[pheromone])**2 + (y[owner] - py[pheromone])**2)
+        attractiveness = intensity[pheromone] / np.maximum(1, distance)
+        within = distance <= reach[owner]
+        owner, pheromone, attractiveness = owner[within], pheromone[within], attractiveness[within]
+
+        # A maior atratividade e, entre os empatados, o mais antigo (a ordem é única)
+        best = np.full(count, -np.inf)
+        np.maximum.at(best, owner, attractiveness)
+        tied = attractiveness == best[owner]
+        owner, pheromone = owner[tied], pheromone[tied]
+        oldest = np.full(count, np.iinfo(np.int64).max)
+        np.minimum.at(oldest, owner, order[pheromone])
+        winner = order[pheromone] == oldest[owner]
+        owner, pheromone = owner[winner], pheromone[winner]
+        target_x[owner] = px[pheromone]
+        target_y[owner] = py[pheromone]
+        found[owner] = True
+        return target_x, target_y, found
+
+    def near_pheromone_cells(self, grid, indices):
+        """
+        Teste conservador (por células) de quais formigas podem ter algum feromônio no alcance de detecção. Usa uma
+        tabela de somas acumuladas das células ocupadas do índice espacial.
+
+        Parameters:
+            grid: Índice espacial (SpatialHash) dos feromônios.
+            indices: Índices das formigas a serem testadas.
+
+        Returns:
+            ndarray: Máscara booleana (True = pode haver feromônio no alcance).
+        """
+        if len(indices) == 0 or not grid.cells:
+            return np.zeros(len(indices), dtype=bool)
+
+        cell_size = grid.cell_size
+        occupied = np.array(list(grid.cells.keys()), dtype=np.int64)
+        reach = np.ceil(self.ag_pheromone_detection_range[indices] / cell_size).astype(np.int64)
+
+        min_cx, min_cy = occupied.min(axis=0)
+        max_cx, max_cy = occupied.max(axis=0)
+        width = max_cx - min_cx + 1
+        height = max_cy - min_cy + 1
+
+        occupancy = np.zeros((width + 1, height + 1), dtype=np.int64)
+        occupancy[occupied[:, 0] - min_cx + 1, occupied[:, 1] - min_cy + 1] = 1
+        summed = occupancy.cumsum(axis=0).cumsum(axis=1)
+
+        cx = np.floor(self.x[indices] / cell_size).astype(np.int64) - min_cx
+        cy = np.floor(self.y[indices] / cell_size).astype(np.int64) - min_cy
+        x0 = np.clip(cx - reach, 0, width)
+        x1 = np.clip(cx + reach + 1, 0, width)
+        y0 = np.clip(cy - reach, 0, height)
+        y1 = np.clip(cy + reach + 1, 0, height)
+
+        total = summed[x1, y1] - summed[x0, y1] - summed[x1, y0] + summed[x0, y0]
+        return total > 0
+
+    def check_for_food(self, environment):
+        """
+        Coleta de comida em lote: cada formiga sem comida pega a fonte mais próxima dentro do raio de coleta (ver
+        nearest_food e serve_food).
+        """
+        if not environment.food_sources:
+            return
+
+        searching = np.flatnonzero(~self.has_food)
+        if len(searching) == 0:
+            return
+        environment.profiler.count("food_queries", len(searching))
+
+        foods = list(environment.food_sources)
+        food_x = np.array([food.position[0] for food in foods], dtype=np.float64)
+        food_y = np.array([food.position[1] for food in foods], dtype=np.float64)
+
+        pair_ant, pair_food = nearest_food(
+            self.x[searching], self.y[searching], food_x, food_y, GlobalVar.FOOD_PICKUP_RADIUS
+        )
+        if len(pair_ant):
+            self.serve_food(environment, foods, searching[pair_ant], pair_food)
+
+    def serve_food(self, environment, foods, ants, food_indices):
+        """
+        Resolve os pedidos de comida: cada fonte atende as formigas em ordem de índice até acabar o estoque (o resultado
+        não depende de como os pedidos foram calculados ou divididos).
+
+        Parameters:
+            environment: O ambiente da simulação.
+            foods: Lista das fontes de comida (na ordem dos índices).
+            ants: Índices das formigas que pediram comida (em ordem crescente).
+            food_indices: Índice da fonte mais próxima de cada formiga.
+        """
+        by_food = np.lexsort((ants, food_indices))
+        ants, food_indices = ants[by_food], food_indices[by_food]
+        group_start = np.ones(len(food_indices), dtype=bool)
+        group_start[1:] = food_indices[1:] != food_indices[:-1]
+        start_index = np.maximum.accumulate(np.where(group_start, np.arange(len(food_indices)), 0))
+        rank = np.arange(len(food_indices)) - start_index
+        stock = np.array([food.stock for food in foods], dtype=np.int64)
+        served = rank < stock[food_indices]
+        picked, food_indices = ants[served], food_indices[served]
+
+        self.has_food[picked] = True
+        self.fitness_food_collected[picked] += 1
+        self.route_x[picked] = self.x[picked]
+        self.route_y[picked] = self.y[picked]
+        self.route_steps[picked] = 0
+
+        taken = np.bincount(food_indices, minlength=len(foods))
+        for food_index in np.flatnonzero(taken).tolist():
+            for _ in range(int(taken[food_index])):
+                environment.take_food(foods[food_index])
+
+    def deposit_food(self, environment):
+        """
+        Entrega a comida das formigas que chegaram na colônia e libera feromônios nas rotas de retorno.
+
+        Returns:
+            int: Quantidade de entregas.
+        """
+        colony_x, colony_y = self.colony.x, self.colony.y
+        distance = np.sqrt((self.x - colony_x)**2 + (self.y - colony_y)**2)
+        delivered = np.flatnonzero(self.has_food & (distance < GlobalVar.COLONY_RADIUS))
+        if len(delivered) == 0:
+            return 0
+
+        min_distance = GlobalVar.COLONY_RADIUS * 2
+        field = environment.pheromone_field
+        if field is not None:
+            self.deposit_on_field(field, delivered, min_distance)
+            self.has_food[delivered] = False
+            self.route_steps[delivered] = 0
+            return len(delivered)
+
+        for i in delivered.tolist():
+            trail = [
+                pos for pos in self.route_points(i)
+                if math.sqrt((pos[0] - colony_x)**2 + (pos[1] - colony_y)**2) > min_distance
+            ]
+            if trail:
+                environment.add_pheromones(trail, float(self.ag_pheromone_strength[i]))
+
+        self.has_food[delivered] = False
+        self.route_steps[delivered] = 0
+        return len(delivered)
+
+    def deposit_on_field(self, field, delivered, min_distance):
+        """
+        Deposita no campo denso, em lote, os feromônios das rotas de retorno das formigas que entregaram comida.
+
+        Parameters:
+            field: Campo denso de feromônios.
+            delivered: Índices das formigas que entregaram comida.
+            min_distance: Distância mínima da colônia para depositar feromônio.
+        """
+        counts = self.route_steps[delivered]
+        total = int(counts.sum())
+        if total == 0:
+            return
+
+        if self.navigation is not None:
+            owner, xs, ys = self.trace_routes(delivered)
+        else:
+            start_x, start_y = self.route_x[delivered], self.route_y[delivered]
+            dx = self.colony.x - start_x
+            dy = self.colony.y - start_y
+            norm = np.maximum(np.maximum(np.abs(dx), np.abs(dy)), 1)
+            step_x = self.ag_speed[delivered] * dx / norm
+            step_y = self.ag_speed[delivered] * dy / norm
+
+            # Índice do passo (k) de cada ponto de todas as rotas
+            owner = np.repeat(np.arange(len(delivered)), counts)
+            k = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            xs = start_x[owner] + k * step_x[owner]
+            ys = start_y[owner] + k * step_y[owner]
+
+        far = np.sqrt((xs - self.colony.x)**2 + (ys - self.colony.y)**2) > min_distance
+        intensities = GlobalVar.FOOD_STORAGE_CAPACITY * self.ag_pheromone_strength[delivered][owner]
+        field.deposit_many(xs[far], ys[far], intensities[far])
+
+    def close(self):
+        """
+        Libera os recursos do motor (o motor serial não guarda nenhum; ver ParallelEngine).
+        """
+
+def nearest_food(ant_x, ant_y, food_x, food_y, radius):
+    """
+    Encontra a fonte de comida mais próxima (distância < raio) de cada formiga. As formigas são agrupadas por células do
+    tamanho do raio, assim só os pares de células vizinhas são comparados.
+
+    Parameters:
+        ant_x, ant_y: Posições das formigas.
+        food_x, food_y: Posições das fontes de comida.
+        radius: Raio de coleta.
+
+    Returns:
+        tuple: (índices das formigas em ordem crescente, índice da fonte mais próxima de cada uma; em caso de empate, a
+            mais antiga).
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(ant_x) == 0 or len(food_x) == 0:
+        return empty, empty
+
+    # Chave da célula de cada formiga (ordenadas para busca binária)
+    stride = np.int64(1 << 32)
+    ant_keys = np.floor(ant_x / radius).astype(np.int64) * stride + np.floor(ant_y / radius).astype(np.int64)
+    order = np.argsort(ant_keys, kind="stable")
+    sorted_keys = ant_keys[order]
+
+    # Chaves das 9 células ao redor de cada fonte de comida
+    food_cx = np.floor(food_x / radius).astype(np.int64)
+    food_cy = np.floor(food_y / radius).astype(np.int64)
+    offsets = np.array([-1, 0, 1], dtype=np.int64)
+    neighbor_keys = (
+        (food_cx[:, None, None] + offsets[None, :, None]) * stride + (food_cy[:, None, None] + offsets[None, None, :])
+    ).reshape(-1)
+    neighbor_food = np.repeat(np.arange(len(food_x)), 9)
+
+    low = np.searchsorted(sorted_keys, neighbor_keys, side="left")
+    high = np.searchsorted(sorted_keys, neighbor_keys, side="right")
+    counts = high - low
+    total = int(counts.sum())
+    if total == 0:
+        return empty, empty
+
+    # Expande os intervalos em pares (fonte, formiga)
+    pair_food = np.repeat(neighbor_food, counts)
+    starts = np.repeat(low - (np.cumsum(counts) - counts), counts)
+    pair_ant = order[starts + np.arange(total)]
+
+    distance = np.sqrt((ant_x[pair_ant] - food_x[pair_food])**2 + (ant_y[pair_ant] - food_y[pair_food])**2)
+    in_range = distance < radius
+    pair_food, pair_ant, distance = pair_food[in_range], pair_ant[in_range], distance[in_range]
+    if len(pair_ant) == 0:
+        return empty, empty
+
+    # Cada formiga escolhe a fonte mais próxima (em caso de empate, a mais antiga)
+    by_ant = np.lexsort((pair_food, distance, pair_ant))
+    pair_ant, pair_food = pair_ant[by_ant], pair_food[by_ant]
+    first = np.ones(len(pair_ant), dtype=bool)
+    first[1:] = pair_ant[1:] != pair_ant[:-1]
+    return pair_ant[first], pair_food[first]
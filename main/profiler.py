@@ -0,0 +1,194 @@
+import json
+import time
+from collections import deque
+
+class Profiler:
+    """
+    Instrumentação de desempenho por fase. Mede o tempo de cada fase de Environment.update e Renderer.render e conta
+    eventos (consultas de feromônio e comida, entregas) a cada tick. Os últimos ticks ficam em janelas deslizantes para
+    cálculo de percentis (exibidos no HUD) e cada tick pode ser gravado em um arquivo CSV ou JSON lines.
+
+    Quando desabilitado, start() retorna 0 e stop()/count()/end_tick() retornam imediatamente, então os pontos de
+    medição podem ficar no código sem custo relevante.
+
+    As fases do desenho de um quadro são registradas na linha do tick seguinte (o quadro é desenhado depois do update).
+
+    Atributos:
+        enabled: Se as medições estão ativas.
+        window: Quantidade de ticks mantidos para os percentis.
+        ticks: Quantidade de ticks registrados.
+        timings: Janelas {fase: deque de tempos em segundos}.
+        counters: Janelas {contador: deque de valores por tick}.
+
+    Métodos:
+        start(): Retorna o instante inicial de uma medição.
+        stop(phase, start): Soma o tempo desde start na fase do tick atual.
+        count(name, amount): Soma um valor ao contador do tick atual.
+        end_tick(gauges): Fecha o tick atual (janelas + arquivo).
+        percentile(name, p): Retorna um percentil de uma fase ou contador.
+        summary(): Retorna p50/p95/p99 de todas as fases e contadores.
+        hud_lines(): Retorna as linhas de texto para o HUD.
+        open_stream(path): Começa a gravar cada tick em um arquivo (.csv ou JSON lines).
+        close(): Fecha o arquivo de saída.
+    """
+    # Colunas fixas do arquivo CSV
+    PHASES = (
+        "move", "pheromone_search", "evolve", "update_pheromones", "update",
+        "draw_world", "draw_pheromones", "draw_ants", "draw_info", "render",
+    )
+    COUNTERS = ("pheromone_queries", "food_queries", "deliveries", "pheromones", "ants")
+
+    def __init__(self, enabled=False, window=300, output_path=None):
+        """
+        Construtor do profiler.
+
+        Parameters:
+            enabled (opcional): Se as medições começam ativas.
+            window (opcional): Quantidade de ticks usados nos percentis.
+            output_path (opcional): Arquivo onde gravar cada tick (.csv ou JSON lines).
+        """
+        self.enabled = enabled
+        self.window = window
+        self.ticks = 0
+        self.timings = {}
+        self.counters = {}
+        self._current_timings = {}
+        self._current_counters = {}
+        self._stream = None
+        self._csv = False
+        if enabled and output_path:
+            self.open_stream(output_path)
+
+    def start(self):
+        """
+        Retorna o instante inicial de uma medição (0 se desabilitado).
+        """
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def stop(self, phase, start):
+        """
+        Soma o tempo decorrido desde start na fase do tick atual.
+
+        Parameters:
+            phase: Nome da fase.
+            start: Valor retornado por start().
+        """
+        if not self.enabled:
+            return
+        current = self._current_timings
+        current[phase] = current.get(phase, 0.0) + time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        """
+        Soma um valor ao contador do tick atual.
+
+        Parameters:
+            name: Nome do contador.
+            amount (opcional): Valor a ser somado.
+        """
+        if not self.enabled:
+            return
+        current = self._current_counters
+        current[name] = current.get(name, 0) + amount
+
+    def end_tick(self, **gauges):
+        """
+        Fecha o tick atual: guarda os tempos e contadores nas janelas e grava a linha no arquivo de saída.
+
+        Parameters:
+            gauges: Valores medidos no fim do tick (ex.: pheromones=1200).
+        """
+        if not self.enabled:
+            return
+
+        counters = self._current_counters
+        counters.update(gauges)
+        timings = self._current_timings
+
+        for name, value in timings.items():
+            self._window_for(self.timings, name).append(value)
+        for name, value in counters.items():
+            self._window_for(self.counters, name).append(value)
+
+        if self._stream is not None:
+            self._write_row(timings, counters)
+
+        self.ticks += 1
+        self._current_timings = {}
+        self._current_counters = {}
+
+    def _window_for(self, windows, name):
+        window = windows.get(name)
+        if window is None:
+            window = windows[name] = deque(maxlen=self.window)
+        return window
+
+    def percentile(self, name, p):
+        """
+        Retorna o percentil p (0 a 100) de uma fase ou contador na janela (None se não houver dados).
+        """
+        values = self.timings.get(name) or self.counters.get(name)
+        if not values:
+            return None
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self):
+        """
+        Retorna {nome: {"p50", "p95", "p99"}} para todas as fases (em segundos) e contadores.
+        """
+        return {
+            name: {f"p{p}": self.percentile(name, p) for p in (50, 95, 99)}
+            for name in list(self.timings) + list(self.counters)
+        }
+
+    def hud_lines(self):
+        """
+        Retorna as linhas de texto com os percentis das fases (em ms) e contadores para o HUD.
+        """
+        if not self.enabled:
+            return []
+
+        lines = []
+        for name in self.PHASES:
+            if name in self.timings:
+                p50, p95 = self.percentile(name, 50), self.percentile(name, 95)
+                lines.append(f"{name}: p50 {p50 * 1e3:.2f}ms p95 {p95 * 1e3:.2f}ms")
+        for name in self.COUNTERS:
+            if name in self.counters:
+                lines.append(f"{name}: p50 {self.percentile(name, 50)} p95 {self.percentile(name, 95)}")
+        return lines
+
+    def open_stream(self, path):
+        """
+        Começa a gravar cada tick em um arquivo. A extensão .csv grava colunas fixas; qualquer outra grava JSON lines.
+
+        Parameters:
+            path: Caminho do arquivo de saída.
+        """
+        self.close()
+        self._stream = open(path, "w", buffering=1 << 16)
+        self._csv = path.endswith(".csv")
+        if self._csv:
+            self._stream.write(",".join(("tick",) + self.PHASES + self.COUNTERS) + "\n")
+
+    def _write_row(self, timings, counters):
+        if self._csv:
+            values = [str(self.ticks)]
+            values.extend(f"{timings.get(name, 0.0):.9f}" for name in self.PHASES)
+            values.extend(str(counters.get(name, 0)) for name in self.COUNTERS)
+            self._stream.write(",".join(values) + "\n")
+        else:
+            row = {"tick": self.ticks, "timings": timings, "counters": counters}
+            self._stream.write(json.dumps(row) + "\n")
+
+    def close(self):
+        """
+        Fecha o arquivo de saída (se houver).
+        """
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
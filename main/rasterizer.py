@@ -0,0 +1,429 @@
+import numpy as np
+import pygame
+
+# Custo relativo de uma operação por pixel da tela no caminho denso em relação a um pixel (esparso) ou trecho (denso) de
+# círculo, que são escritos em posições aleatórias (medido: perto de 10x mais caros)
+DENSE_PIXEL_COST = 0.1
+
+class Rasterizer:
+    """
+    Desenho em lote de muitos círculos pequenos (formigas e feromônios) escrevendo direto nos pixels da tela com NumPy
+    (pygame.surfarray), em vez de uma chamada a pygame.draw.circle ou Surface.blit por objeto.
+
+    Os pixels de cada círculo vêm de um carimbo desenhado uma única vez por raio com o próprio pygame.draw.circle, então o
+    formato é o mesmo do desenho um a um. A sobreposição segue a ordem dos círculos:
+        Círculos opacos (formigas): quando vários cobrem o mesmo pixel, vale o último da lista (como se fossem desenhados
+            em ordem).
+        Círculos translúcidos de uma cor (feromônios): as opacidades que cobrem cada pixel são combinadas
+            (1 - Π(1 - alpha)), o que equivale a desenhar um sobre o outro, e o resultado é desenhado com um único blit.
+
+    Há dois caminhos com o mesmo resultado, e cada quadro usa o que tem menos trabalho:
+        Esparso: cada círculo é expandido nos seus pixels (custo proporcional à quantidade de círculos).
+        Denso: cada círculo só marca o seu ponto de referência (ou o início e o fim dos seus trechos horizontais) em
+            grades do tamanho da tela, e operações sobre as grades inteiras completam os carimbos (máximo do índice do
+            círculo, que resolve o último da lista, ou soma das opacidades). Só a marcação depende da quantidade de
+            círculos; o restante é proporcional aos pixels da tela.
+
+    Atributos:
+        stamps: Cache dos carimbos (deslocamentos dos pixels) por formato.
+        runs: Cache dos carimbos como trechos horizontais contínuos (caminho denso).
+        unions: Cache das uniões dos carimbos por conjunto de formatos.
+        layer: Superfície translúcida reaproveitada entre os quadros (feromônios).
+
+    Métodos:
+        stamp(radius, size): Retorna os deslocamentos dos pixels de um círculo.
+        draw_circles(surface, xs, ys, radii, palette, indices): Desenha círculos opacos.
+        draw_alpha_circles(surface, left, top, radii, sizes, alphas, color): Desenha círculos translúcidos de uma cor.
+    """
+    def __init__(self):
+        """
+        Construtor do rasterizador.
+        """
+        self.stamps = {}
+        self.runs = {}
+        self.unions = {}
+        self.layer = None
+
+    def stamp(self, radius, size=None):
+        """
+        Retorna os deslocamentos dos pixels que pygame.draw.circle pinta para um raio.
+
+        Parameters:
+            radius: Raio do círculo (inteiro, como o pygame usa).
+            size (opcional): Lado da imagem onde o círculo é desenhado com centro em (radius, radius) (os pixels fora
+                dela são cortados, como nas imagens dos feromônios). None = sem corte, deslocamentos a partir do centro.
+
+        Returns:
+            tuple: Arrays (dx, dy).
+        """
+        key = (radius, size)
+        offsets = self.stamps.get(key)
+        if offsets is None:
+            if size is None:
+                side, center = 2 * radius + 3, radius + 1
+            else:
+                side, center = size, radius
+            surface = pygame.Surface((max(1, side), max(1, side)))
+            surface.fill((0, 0, 0))
+            pygame.draw.circle(surface, (255, 255, 255), (center, center), radius)
+            dx, dy = np.nonzero(pygame.surfarray.array2d(surface)[:side, :side])
+            if size is None:
+                dx, dy = dx - center, dy - center
+            offsets = (dx.astype(np.int64), dy.astype(np.int64))
+            self.stamps[key] = offsets
+        return offsets
+
+    def stamp_runs(self, key):
+        """
+        Retorna o carimbo de um formato como trechos horizontais contínuos.
+
+        Parameters:
+            key: Argumentos de stamp().
+
+        Returns:
+            list: Tuplas (dy, primeiro dx, último dx).
+        """
+        runs = self.runs.get(key)
+        if runs is None:
+            dx, dy = self.stamp(*key)
+            runs = []
+            for row in np.unique(dy).tolist():
+                columns = np.sort(dx[dy == row])
+                breaks = np.flatnonzero(np.diff(columns) > 1)
+                starts = np.concatenate(([0], breaks + 1))
+                ends = np.concatenate((breaks, [len(columns) - 1]))
+                runs.extend((row, int(columns[start]), int(columns[end])) for start, end in zip(starts, ends))
+            self.runs[key] = runs
+        return runs
+
+    def _shapes(self, radii, sizes=None):
+        """
+        Agrupa os círculos por formato.
+
+        Returns:
+            tuple: (argumentos de stamp() de cada formato, índice do formato de cada círculo).
+        """
+        radii = np.maximum(np.asarray(radii, dtype=np.int64), 0)
+        base = int(radii.max()) + 1
+        codes = radii if sizes is None else np.maximum(np.asarray(sizes, dtype=np.int64), 0) * base + radii
+
+        # Poucos formatos de valores pequenos: tabela de consulta em vez de ordenar (np.unique)
+        keys = np.flatnonzero(np.bincount(codes))
+        if len(keys) == 1:
+            inverse = np.zeros(len(codes), dtype=np.int64)
+        else:
+            lookup = np.zeros(int(keys[-1]) + 1, dtype=np.int64)
+            lookup[keys] = np.arange(len(keys))
+            inverse = lookup[codes]
+        if sizes is None:
+            return [(key,) for key in keys.tolist()], inverse
+        return [(key % base, key // base) for key in keys.tolist()], inverse
+
+    def _union(self, keys):
+        """
+        União dos carimbos de vários formatos.
+
+        Returns:
+            tuple: Deslocamentos (dx, dy) da união e a matriz (formatos x pixels da união) de quais pixels cada formato
+                pinta.
+        """
+        union = self.unions.get(tuple(keys))
+        if union is not None:
+            return union
+        stamps = [self.stamp(*key) for key in keys]
+        dx = np.concatenate([stamp[0] for stamp in stamps])
+        dy = np.concatenate([stamp[1] for stamp in stamps])
+        union, position = np.unique(np.column_stack((dx, dy)).reshape(-1, 2), axis=0, return_inverse=True)
+        member = np.zeros((len(keys), len(union)), dtype=bool)
+        member[np.repeat(np.arange(len(keys)), [len(stamp[0]) for stamp in stamps]), position.reshape(-1)] = True
+        self.unions[tuple(keys)] = union[:, 0], union[:, 1], member
+        return self.unions[tuple(keys)]
+
+    def _use_dense(self, width, height, count, keys, maximum):
+        """
+        Escolhe o caminho com menos trabalho estimado: pixels de círculo (esparso) ou trechos de círculo mais operações
+        sobre a tela (denso).
+        """
+        union = len(self._union(keys)[0])
+        if maximum:
+            # Máximo: uma escrita por círculo e, por formato, as tabelas das janelas e uma operação por trecho
+            entries, operations = 1, 0
+            for key in keys:
+                runs = self.stamp_runs(key)
+                sizes = {last - first + 1 for _, first, last in runs}
+                operations += max(sizes).bit_length() + len(sizes) + len(runs) + 1
+        else:
+            # Soma: início e fim de cada trecho e uma soma acumulada
+            entries = 2 * max(len(self.stamp_runs(key)) for key in keys)
+            operations = 3
+        return count * entries + DENSE_PIXEL_COST * operations * width * height < count * union
+
+    def _expand(self, width, height, xs, ys, shapes):
+        """
+        Expande os círculos em pixels (índice linear y * width + x), na ordem dos círculos (caminho esparso).
+
+        Parameters:
+            width, height: Tamanho da superfície.
+            xs, ys: Pontos de referência dos círculos (os deslocamentos dos carimbos são somados a eles).
+            shapes: Formatos dos círculos (ver _shapes).
+
+        Returns:
+            tuple: Matriz (círculos x pixels da união dos carimbos) com os índices lineares e a máscara dos pixels
+                pintados dentro da superfície.
+        """
+        keys, inverse = shapes
+        dx, dy, member = self._union(keys)
+        pixels = (ys * width + xs)[:, None] + (dy * width + dx)[None, :]
+        mask = member[inverse]
+
+        # Só os círculos perto das bordas precisam do teste pixel a pixel
+        border = np.flatnonzero(
+            (xs + dx.min() < 0) | (xs + dx.max() >= width) | (ys + dy.min() < 0) | (ys + dy.max() >= height)
+        )
+        if len(border):
+            px = xs[border, None] + dx[None, :]
+            py = ys[border, None] + dy[None, :]
+            mask[border] &= (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        return pixels, mask
+
+    def _accumulate(self, width, height, xs, ys, shapes, values, maximum):
+        """
+        Aplica os carimbos em uma grade do tamanho da tela (caminho denso). O trabalho por círculo é constante (ou
+        proporcional à sua altura) e o restante é proporcional aos pixels da tela:
+            Máximo: os círculos de cada formato escrevem o seu valor no ponto de referência, em uma grade por formato, e
+                cada trecho horizontal do carimbo é uma janela deslizante sobre a grade (calculada com tabelas de
+                janelas de tamanho potência de 2) deslocada até a linha do trecho.
+            Soma: cada trecho soma o valor no seu início e o subtrai logo depois do seu fim (array de diferenças), e
+                uma soma acumulada da grade dá o total de cada pixel (exata com os valores de draw_alpha_circles, que
+                são múltiplos de uma potência de 2).
+
+        Parameters:
+            width, height: Tamanho da superfície.
+            xs, ys: Pontos de referência dos círculos.
+            shapes: Formatos dos círculos (ver _shapes).
+            values: Valor de cada círculo (crescente na ordem dos círculos quando maximum é True).
+            maximum: True = máximo dos valores que cobrem cada pixel (-1 = nenhum); False = soma (0 = nenhum).
+
+        Returns:
+            ndarray: Matriz (height x width) com o resultado de cada pixel.
+        """
+        keys, inverse = shapes
+        reach = 1
+        for key in keys:
+            dx, dy = self.stamp(*key)
+            if len(dx):
+                reach = max(reach, int(np.abs(dx).max()), int(np.abs(dy).max()))
+
+        # Grade com margem (círculos parcialmente fora da tela) e linhas extras em cima e embaixo, para os trechos e
+        # as janelas nunca saírem dos arrays; as linhas da grade são contínuas na memória (índice linear)
+        pad = reach + 1
+        stride = width + 2 * pad
+        length = (height + 4 * pad + 2) * stride
+        start = (2 * pad + 1) * stride
+
+        # Círculos longe da tela são levados para a primeira ou a última coluna (linha) da margem, de onde os seus
+        # trechos não alcançam a tela (sem máscara de visibilidade)
+        positions = start + pad + np.clip(ys, -pad, height + pad - 1) * stride + np.clip(xs, -pad, width + pad - 1)
+        if not maximum:
+            return self._accumulate_sum(keys, inverse, positions, values, stride, length, start, height, pad, width)
+
+        result = np.full(height * stride, -1, dtype=values.dtype)
+        for shape, key in enumerate(keys):
+            # Índices repetidos: o NumPy mantém o último valor atribuído, que é o maior (valores crescentes)
+            grid = np.full(length, -1, dtype=values.dtype)
+            if len(keys) == 1:
+                grid[positions] = values
+            else:
+                selected = np.flatnonzero(inverse == shape)
+                grid[positions[selected]] = values[selected]
+
+            # O pixel q é coberto pelo trecho (dy, first, last) dos círculos com referência entre
+            # q - dy * stride - last e q - dy * stride - first
+            runs = self.stamp_runs(key)
+            windows = self._windows(grid, {last - first + 1 for _, first, last in runs})
+            for row, first, last in runs:
+                offset = start - row * stride - last
+                window = windows[last - first + 1]
+                np.maximum(result, window[offset:offset + len(result)], out=result)
+
+        return result.reshape(height, stride)[:, pad:pad + width]
+
+    def _accumulate_sum(self, keys, inverse, positions, values, stride, length, start, height, pad, width):
+        """
+        Soma do caminho denso (ver _accumulate) com um array de diferenças.
+        """
+        columns = max(len(self.stamp_runs(key)) for key in keys)
+        # Trechos que faltam em um formato somam e subtraem o valor no mesmo índice (sem efeito)
+        starts = np.zeros((len(keys), columns), dtype=np.int64)
+        stops = np.zeros((len(keys), columns), dtype=np.int64)
+        for shape, key in enumerate(keys):
+            runs = self.stamp_runs(key)
+            starts[shape, :len(runs)] = [row * stride + first for row, first, _ in runs]
+            stops[shape, :len(runs)] = [row * stride + last + 1 for row, _, last in runs]
+        if len(keys) > 1:
+            starts, stops = starts[inverse], stops[inverse]
+
+        repeated = np.repeat(values, columns)
+        differences = np.bincount(
+            np.concatenate(((positions[:, None] + starts).reshape(-1), (positions[:, None] + stops).reshape(-1))),
+            weights=np.concatenate((repeated, -repeated)),
+            minlength=length,
+        )
+        totals = np.cumsum(differences[:start + height * stride])[start:]
+        return totals.reshape(height, stride)[:, pad:pad + width]
+
+    def _windows(self, grid, sizes):
+        """
+        Janelas deslizantes de máximo: windows[size][i] = máximo de grid[i:i + size] (o fim do array fica com -1).
+
+        Returns:
+            dict: Tamanho da janela -> array.
+        """
+        # tables[k][i] = máximo de grid[i:i + 2**k]
+        tables = [grid]
+        while 2 ** len(tables) <= max(sizes):
+            previous, half = tables[-1], 2 ** (len(tables) - 1)
+            table = np.empty(len(grid), dtype=grid.dtype)
+            np.maximum(previous[:-half], previous[half:], out=table[:-half])
+            table[-half:] = -1
+            tables.append(table)
+
+        windows = {}
+        for size in sizes:
+            level = size.bit_length() - 1
+            shift = size - 2 ** level
+            if shift == 0:
+                windows[size] = tables[level]
+                continue
+            # Duas janelas de tamanho 2**level que se sobrepõem
+            window = np.empty(len(grid), dtype=grid.dtype)
+            np.maximum(tables[level][:-shift], tables[level][shift:], out=window[:-shift])
+            window[-shift:] = -1
+            windows[size] = window
+        return windows
+
+    def draw_circles(self, surface, xs, ys, radii, palette, indices):
+        """
+        Desenha círculos opacos (vale o último da lista onde eles se sobrepõem).
+
+        Parameters:
+            surface: Superfície de destino.
+            xs, ys: Centros (pixels).
+            radii: Raios (pixels; truncados como no pygame.draw.circle).
+            palette: Array (K x 3) com as cores usadas.
+            indices: Índice (em palette) da cor de cada círculo.
+        """
+        if len(radii) == 0:
+            return
+        width, height = surface.get_size()
+        xs, ys = np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64)
+        palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.int64)
+        shapes = self._shapes(radii)
+        dense = self._use_dense(width, height, len(xs), shapes[0], True)
+
+        if surface.get_bytesize() != 4:
+            target = pygame.surfarray.pixels3d(surface)
+            if dense:
+                owners = self._accumulate(width, height, xs, ys, shapes, np.arange(len(xs), dtype=np.int32), True)
+                # Pixels sem círculo (-1) leem a última cor, mas não são escritos
+                colors = palette[indices[owners]]
+                np.copyto(target.transpose(1, 0, 2), colors, where=(owners >= 0)[:, :, None])
+            else:
+                pixels, mask = self._expand(width, height, xs, ys, shapes)
+                painted = pixels[mask]
+                colors = np.broadcast_to(palette[indices][:, None, :], (*pixels.shape, 3))[mask]
+                target[painted % width, painted // width] = colors
+            del target
+            return
+
+        # Cores no formato de pixel da superfície (uma escrita de 32 bits por pixel)
+        target = pygame.surfarray.pixels2d(surface)
+        rows = target.T
+        mapped = self._map_colors(surface, palette).view(rows.dtype)[indices]
+        if dense:
+            # Cada pixel fica com o maior índice (último círculo) entre os que o cobrem
+            owners = self._accumulate(width, height, xs, ys, shapes, np.arange(len(xs), dtype=np.int32), True)
+            np.copyto(rows, mapped[owners], where=owners >= 0)
+        else:
+            # Índices repetidos: o NumPy mantém o último valor atribuído (o último círculo)
+            pixels, mask = self._expand(width, height, xs, ys, shapes)
+            painted = pixels[mask]
+            values = np.broadcast_to(mapped[:, None], pixels.shape)[mask]
+            if rows.flags.c_contiguous:
+                rows.reshape(-1)[painted] = values
+            else:
+                rows[painted // width, painted % width] = values
+        del rows, target
+
+    def _map_colors(self, surface, colors):
+        """
+        Converte cores (K x 3) para o formato de pixel de 32 bits da superfície.
+        """
+        shifts, losses = surface.get_shifts(), surface.get_losses()
+        mapped = np.full(len(colors), surface.get_masks()[3], dtype=np.uint32)
+        for channel in range(3):
+            mapped |= (colors[:, channel].astype(np.uint32) >> losses[channel]) << shifts[channel]
+        return mapped
+
+    def draw_alpha_circles(self, surface, left, top, radii, sizes, alphas, color):
+        """
+        Desenha círculos translúcidos de uma cor (imagens sizes x sizes com o círculo de raio radii, posicionadas no
+        canto superior esquerdo (left, top)) com um único blit.
+
+        Parameters:
+            surface: Superfície de destino.
+            left, top: Canto superior esquerdo de cada imagem (pixels).
+            radii: Raios dos círculos.
+            sizes: Lados das imagens.
+            alphas: Opacidade (0 a 255) de cada círculo.
+            color: Cor (r, g, b) dos círculos.
+        """
+        if len(radii) == 0:
+            return
+        width, height = surface.get_size()
+        left, top = np.asarray(left, dtype=np.int64), np.asarray(top, dtype=np.int64)
+        shapes = self._shapes(radii, sizes)
+        opacity = np.minimum(np.asarray(alphas, dtype=np.float64) / 255, 1 - 1e-9)
+        # Transparência acumulada de cada pixel: Π(1 - alpha) = exp(Σ log(1 - alpha)). Os logaritmos são arredondados
+        # para múltiplos de 2**-30: as somas (até 2**22 em módulo) ficam exatas em qualquer ordem, e os dois caminhos
+        # dão o mesmo resultado
+        weights = np.round(np.log1p(-opacity) * 2 ** 30) / 2 ** 30
+
+        # Linhas que os círculos podem tocar (a camada só é limpa e desenhada nelas)
+        first_row = max(0, int(top.min()))
+        last_row = min(height, int(top.max()) + int(np.max(sizes)) + 1)
+        if first_row >= last_row:
+            return
+        rows = last_row - first_row
+        if self.layer is None or self.layer.get_size() != (width, height):
+            self.layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        area = pygame.Rect(0, first_row, width, rows)
+
+        if self._use_dense(width, rows, len(left), shapes[0], False):
+            totals = self._accumulate(width, rows, left, top - first_row, shapes, weights, False)
+            self.layer.fill((*color, 0), area)
+            alpha = pygame.surfarray.pixels_alpha(self.layer)
+            alpha[:, first_row:last_row] = np.rint(255 * (1 - np.exp(totals))).astype(np.uint8).T
+            del alpha
+            surface.blit(self.layer, area.topleft, area)
+            return
+
+        pixels, mask = self._expand(width, height, left, top, shapes)
+        weights = np.broadcast_to(weights[:, None], pixels.shape)[mask]
+        pixels = pixels[mask]
+        if len(pixels) == 0:
+            return
+        self.layer.fill((*color, 0), area)
+        alpha = pygame.surfarray.pixels_alpha(self.layer)
+
+        if 4 * len(pixels) < rows * width:
+            # Poucos pixels: soma só nos pixels tocados
+            touched, inverse = np.unique(pixels, return_inverse=True)
+            transmittance = np.exp(np.bincount(inverse.reshape(-1), weights=weights))
+            alpha[touched % width, touched // width] = np.rint(255 * (1 - transmittance)).astype(np.uint8)
+        else:
+            transmittance = np.exp(np.bincount(pixels - first_row * width, weights=weights, minlength=rows * width))
+            alpha[:, first_row:last_row] = np.rint(255 * (1 - transmittance)).astype(np.uint8).reshape(rows, width).T
+        del alpha
+        surface.blit(self.layer, area.topleft, area)
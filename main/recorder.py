@@ -0,0 +1,319 @@
+import json
+import os
+
+import numpy as np
+
+from global_var import GlobalVar
+
+# Registro de uma formiga em um tick
+ANT_DTYPE = np.dtype([("id", "<u4"), ("x", "<f4"), ("y", "<f4"), ("has_food", "u1")])
+# Registros dos instantâneos de feromônios (objetos) e comida
+PHEROMONE_DTYPE = np.dtype([("x", "<f4"), ("y", "<f4"), ("intensity", "<f4")])
+FOOD_DTYPE = np.dtype([("x", "<f4"), ("y", "<f4"), ("stock", "<i4")])
+
+INDEX_FILE = "index.json"
+VERSION = 1
+
+class TrajectoryRecorder:
+    """
+    Gravador da trajetória das formigas. Registrado em Environment.tick_listeners, grava a cada intervalo de ticks o id
+    (Ant.id), x, y e has_food de todas as formigas em arquivos de blocos (chunks) mapeados em memória, e a
+    cada snapshot_interval ticks os feromônios e a comida em arquivos só de acréscimo. Um índice pequeno (index.json)
+    descreve os blocos e instantâneos, assim o leitor acessa qualquer intervalo de ticks sem carregar tudo.
+
+    Estrutura da pasta:
+        index.json: Versão, blocos de formigas, instantâneos e estatísticas das gerações.
+        ants_NNNNN.bin: Bloco com chunk_ticks ticks x formigas registros ANT_DTYPE.
+        pheromones.bin / food.bin: Registros PHEROMONE_DTYPE / FOOD_DTYPE dos instantâneos.
+        field.bin: Instantâneos do campo denso de feromônios (float32), quando ele é usado.
+
+    Atributos:
+        path: Pasta da gravação.
+        interval: Intervalo (em ticks) entre registros das formigas.
+        snapshot_interval: Intervalo (em ticks) entre instantâneos de feromônios e comida (0 = sem instantâneos).
+        chunk_ticks: Quantidade de ticks por bloco.
+        index: Índice da gravação (gravado em index.json).
+
+    Métodos:
+        attach(environment): Registra o gravador no ambiente.
+        record(environment): Grava o tick atual.
+        close(): Fecha o bloco atual e grava o índice.
+    """
+    def __init__(self, path, interval=None, snapshot_interval=None, chunk_ticks=None):
+        """
+        Construtor do gravador.
+
+        Parameters:
+            path: Pasta da gravação (criada se não existir; uma gravação anterior na pasta é substituída).
+            interval (opcional): Intervalo (em ticks) entre registros das formigas (padrão = GlobalVar.RECORDER_INTERVAL).
+            snapshot_interval (opcional): Intervalo (em ticks) entre instantâneos de feromônios e comida (padrão =
+                GlobalVar.RECORDER_SNAPSHOT_INTERVAL; 0 = sem instantâneos).
+            chunk_ticks (opcional): Quantidade de ticks por bloco (padrão = GlobalVar.RECORDER_CHUNK_TICKS).
+        """
+        self.path = path
+        self.interval = interval or GlobalVar.RECORDER_INTERVAL
+        self.snapshot_interval = (
+            snapshot_interval if snapshot_interval is not None else GlobalVar.RECORDER_SNAPSHOT_INTERVAL
+        )
+        self.chunk_ticks = chunk_ticks or GlobalVar.RECORDER_CHUNK_TICKS
+
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name == INDEX_FILE or name.endswith(".bin"):
+                os.remove(os.path.join(path, name))
+
+        self.index = {
+            "version": VERSION,
+            "interval": self.interval,
+            "chunks": [],
+            "snapshots": [],
+            "generations": [],
+        }
+        self._chunk = None
+        self._chunk_info = None
+        self._generations_seen = 0
+
+    def __call__(self, environment):
+        self.record(environment)
+
+    def attach(self, environment):
+        """
+        Registra o gravador no ambiente (e grava o estado inicial).
+        """
+        environment.tick_listeners.append(self)
+        self.record(environment, force=True)
+        return self
+
+    def record(self, environment, force=False):
+        """
+        Grava o tick atual (formigas, instantâneos e novas estatísticas de geração) conforme os intervalos.
+
+        Parameters:
+            environment: O ambiente da simulação.
+            force (opcional): Grava as formigas e o instantâneo mesmo fora dos intervalos.
+        """
+        tick = environment.tick
+        if force or tick % self.interval == 0:
+            self.record_ants(environment, tick)
+        if self.snapshot_interval and (force or tick % self.snapshot_interval == 0):
+            self.record_snapshot(environment, tick)
+
+        history = environment.colony.generation_history
+        for stats in history[self._generations_seen:]:
+            self.index["generations"].append(dict(stats, tick=tick))
+        self._generations_seen = len(history)
+
+    def record_ants(self, environment, tick):
+        """
+        Grava o estado de todas as formigas no bloco atual (abre um novo bloco quando o atual está cheio ou a quantidade
+        de formigas mudou).
+        """
+        engine = environment.population_engine
+        if engine is not None:
+            # Direto dos arrays do motor, sem passar pelos objetos
+            count = len(engine)
+        else:
+            ants = environment.colony.ants + environment.colony.ants_scout
+            count = len(ants)
+
+        info = self._chunk_info
+        if info is None or len(info["ticks"]) == self.chunk_ticks or info["ants"] != count:
+            self._open_chunk(tick, count)
+            info = self._chunk_info
+
+        row = self._chunk[len(info["ticks"])]
+        if engine is not None:
+            row["x"] = engine.x
+            row["y"] = engine.y
+            row["has_food"] = engine.has_food
+            row["id"] = engine.ant_ids
+        else:
+            row["x"] = [ant.x for ant in ants]
+            row["y"] = [ant.y for ant in ants]
+            row["has_food"] = [ant.has_food for ant in ants]
+            row["id"] = [ant.id for ant in ants]
+
+        info["ticks"].append(tick)
+
+    def _open_chunk(self, tick, count):
+        self._close_chunk()
+        name = f"ants_{len(self.index['chunks']):05d}.bin"
+        self._chunk_info = {"file": name, "ants": count, "ticks": []}
+        self.index["chunks"].append(self._chunk_info)
+        self._chunk = np.memmap(
+            os.path.join(self.path, name), dtype=ANT_DTYPE, mode="w+", shape=(self.chunk_ticks, max(count, 1))
+        )
+
+    def _close_chunk(self):
+        if self._chunk is None:
+            return
+        self._chunk.flush()
+        used = len(self._chunk_info["ticks"]) * self._chunk.shape[1] * ANT_DTYPE.itemsize
+        del self._chunk
+        self._chunk = None
+        # Remove a parte não usada do bloco
+        os.truncate(os.path.join(self.path, self._chunk_info["file"]), used)
+        self._write_index()
+
+    def record_snapshot(self, environment, tick):
+        """
+        Acrescenta um instantâneo dos feromônios e da comida.
+        """
+        snapshot = {"tick": tick}
+
+        field = environment.pheromone_field
+        if field is not None:
+            grid = field.grid.astype("<f4")
+            snapshot["field"] = {"offset": self._append("field.bin", grid), "shape": list(grid.shape)}
+        else:
+            pheromones = np.array(
+                [(p.position[0], p.position[1], p.intensity) for p in environment.pheromones], dtype=PHEROMONE_DTYPE
+            )
+            snapshot["pheromones"] = {"offset": self._append("pheromones.bin", pheromones), "count": len(pheromones)}
+
+        food = np.array([(f.position[0], f.position[1], f.stock) for f in environment.food_sources], dtype=FOOD_DTYPE)
+        snapshot["food"] = {"offset": self._append("food.bin", food), "count": len(food)}
+
+        self.index["snapshots"].append(snapshot)
+
+    def _append(self, name, array):
+        # Acrescenta o array no fim do arquivo e retorna a posição (em bytes) onde ele começa
+        with open(os.path.join(self.path, name), "ab") as file:
+            offset = file.tell()
+            file.write(np.ascontiguousarray(array).tobytes())
+        return offset
+
+    def _write_index(self):
+        temporary = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(temporary, "w") as file:
+            json.dump(self.index, file)
+        os.replace(temporary, os.path.join(self.path, INDEX_FILE))
+
+    def close(self):
+        """
+        Fecha o bloco atual e grava o índice.
+        """
+        self._close_chunk()
+        self._write_index()
+
+class TrajectoryReader:
+    """
+    Leitor de uma gravação do TrajectoryRecorder. Os blocos são mapeados em memória sob demanda, então só os ticks
+    pedidos são lidos do disco.
+
+    Atributos:
+        path: Pasta da gravação.
+        index: Índice da gravação.
+        generations: Estatísticas das gerações (com o tick em que foram registradas).
+
+    Métodos:
+        ticks(): Retorna os ticks gravados.
+        ants(start, stop): Retorna os registros das formigas dos ticks no intervalo [start, stop).
+        ant_track(ant_id, start, stop): Retorna a trajetória de uma formiga.
+        snapshot(tick): Retorna o último instantâneo de feromônios e comida até o tick.
+    """
+    def __init__(self, path):
+        """
+        Construtor do leitor.
+
+        Parameters:
+            path: Pasta da gravação.
+        """
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE)) as file:
+            self.index = json.load(file)
+        if self.index.get("version") != VERSION:
+            raise ValueError(f"Versão de gravação não suportada: {self.index.get('version')}")
+        self.generations = self.index["generations"]
+
+    def _chunk_array(self, chunk):
+        return np.memmap(
+            os.path.join(self.path, chunk["file"]), dtype=ANT_DTYPE, mode="r", shape=(len(chunk["ticks"]), chunk["ants"])
+        )
+
+    def ticks(self):
+        """
+        Retorna a lista dos ticks gravados.
+        """
+        return [tick for chunk in self.index["chunks"] for tick in chunk["ticks"]]
+
+    def ants(self, start=None, stop=None):
+        """
+        Retorna os registros das formigas dos ticks no intervalo [start, stop).
+
+        Returns:
+            tuple: (ticks, registros). Os registros são um array (ticks x formigas) de ANT_DTYPE quando a quantidade de
+                formigas é a mesma em todo o intervalo, senão uma lista com um array por tick.
+        """
+        ticks, parts = [], []
+        for chunk in self.index["chunks"]:
+            if not chunk["ticks"]:
+                continue
+            if (start is not None and chunk["ticks"][-1] < start) or (stop is not None and chunk["ticks"][0] >= stop):
+                continue
+
+            chunk_ticks = np.array(chunk["ticks"])
+            selected = np.ones(len(chunk_ticks), dtype=bool)
+            if start is not None:
+                selected &= chunk_ticks >= start
+            if stop is not None:
+                selected &= chunk_ticks < stop
+            rows = np.flatnonzero(selected)
+            if len(rows) == 0:
+                continue
+
+            array = self._chunk_array(chunk)
+            ticks.extend(chunk_ticks[rows].tolist())
+            parts.append(array[rows[0]:rows[-1] + 1])
+
+        if not parts:
+            return ticks, np.empty((0, 0), dtype=ANT_DTYPE)
+        if len({part.shape[1] for part in parts}) == 1:
+            return ticks, np.concatenate(parts)
+        return ticks, [row for part in parts for row in part]
+
+    def ant_track(self, ant_id, start=None, stop=None):
+        """
+        Retorna a trajetória (ticks, x, y, has_food) de uma formiga pelo id.
+        """
+        ticks, records = self.ants(start, stop)
+        rows = records if isinstance(records, list) else list(records)
+        track_ticks, xs, ys, carrying = [], [], [], []
+        for tick, row in zip(ticks, rows):
+            match = np.flatnonzero(row["id"] == ant_id)
+            if len(match):
+                record = row[match[0]]
+                track_ticks.append(tick)
+                xs.append(float(record["x"]))
+                ys.append(float(record["y"]))
+                carrying.append(bool(record["has_food"]))
+        return track_ticks, np.array(xs), np.array(ys), np.array(carrying, dtype=bool)
+
+    def snapshot(self, tick):
+        """
+        Retorna o último instantâneo até o tick.
+
+        Returns:
+            dict: tick, food (array FOOD_DTYPE) e pheromones (array PHEROMONE_DTYPE) ou field (array 2D), ou None se
+                não houver instantâneo até o tick.
+        """
+        snapshots = [snapshot for snapshot in self.index["snapshots"] if snapshot["tick"] <= tick]
+        if not snapshots:
+            return None
+        snapshot = snapshots[-1]
+
+        result = {"tick": snapshot["tick"], "food": self._read("food.bin", FOOD_DTYPE, snapshot["food"]["count"],
+                                                                snapshot["food"]["offset"])}
+        if "field" in snapshot:
+            shape = tuple(snapshot["field"]["shape"])
+            result["field"] = self._read("field.bin", np.dtype("<f4"), int(np.prod(shape)),
+                                         snapshot["field"]["offset"]).reshape(shape)
+        else:
+            info = snapshot["pheromones"]
+            result["pheromones"] = self._read("pheromones.bin", PHEROMONE_DTYPE, info["count"], info["offset"])
+        return result
+
+    def _read(self, name, dtype, count, offset):
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=(count,), offset=offset)
@@ -1,4 +1,5 @@
 import pygame
+from camera import Camera
 from global_var import GlobalVar
 
 class Renderer:
@@ -8,98 +9,413 @@ class Renderer:
 
     Atributos:
         screen: Superfície principal onde os elementos são desenhados.
+        offscreen: Se desenha em uma superfície fora da tela (benchmarks).
         clock: Objeto para controlar a taxa de quadros (FPS).
         font: Fonte usada para o textos na tela.
+        pheromone_sprites: Cache das imagens de feromônio por (diâmetro, raio, opacidade).
+        commands: Comandos de controle recebidos pelo teclado e ainda não processados.
+        status_texts: Textos extras exibidos nas informações (ex.: velocidade da simulação).
+        progress: Fração (0 a 1) exibida na barra de progresso do replay (None = sem barra).
+        rasterizer: Desenho em lote das formigas e feromônios (criado no primeiro uso com GlobalVar.RENDER_BULK).
+        camera: Câmera que define a parte visível do mundo (arrastar com o botão direito move, a roda do mouse e as
+            teclas +/- mudam o zoom, F mostra o mundo inteiro e C centraliza na colônia).
 
     Métodos:
         render: Renderiza o estado atual do ambiente na tela.
+        visible_food(environment): Retorna as fontes de comida visíveis.
+        visible_pheromones(environment): Retorna os feromônios visíveis.
+        render_ants(environment): Renderiza as formigas visíveis.
+        render_ants_bulk(environment): Renderiza as formigas visíveis escrevendo os pixels em lote.
+        get_pheromone_sprite: Retorna a imagem em cache de um feromônio.
+        render_pheromones: Renderiza os feromônios.
+        render_pheromones_bulk: Renderiza os feromônios escrevendo os pixels em lote.
+        render_pheromone_field: Renderiza o campo denso de feromônios.
+        render_obstacles(obstacles): Renderiza os obstáculos.
         render_info: Renderiza informações de status na tela.
-        check_quit(): Verifica se o programa deve encerrar.
+        render_progress(fraction): Renderiza a barra de progresso do replay.
+        progress_fraction(position): Retorna a fração da barra de progresso em uma posição da tela.
+        check_quit(): Verifica se o programa deve encerrar (registra os comandos do teclado e controla a câmera).
+        handle_camera_event(event): Aplica um evento de controle da câmera.
+        poll_commands(): Retorna e limpa os comandos de controle recebidos.
     """
     
-    def __init__(self):
+    def __init__(self, surface=None):
         """
         Inicializa o sistema de renderização.
+
+        Parameters:
+            surface (opcional): Superfície onde desenhar fora da tela (sem janela, sem flip e sem limite de FPS).
         """
         pygame.init()
-        self.screen = pygame.display.set_mode((GlobalVar.WINDOW_WIDTH, GlobalVar.WINDOW_HEIGHT))
-        pygame.display.set_caption("Simulação de Formigas Evolutivas")
+        self.offscreen = surface is not None
+        if self.offscreen:
+            self.screen = surface
+        else:
+            self.screen = pygame.display.set_mode((GlobalVar.WINDOW_WIDTH, GlobalVar.WINDOW_HEIGHT))
+            pygame.display.set_caption("Simulação de Formigas Evolutivas")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont('Arial', 16)
+        self.pheromone_sprites = {}
+        self.rasterizer = None
+        self.commands = []
+        self.status_texts = []
+        self.progress = None
+        self.camera = Camera(*self.screen.get_size())
+        self.colony_position = (self.camera.x, self.camera.y)
+        self._dragging = False
     
     def render(self, environment):
         """
-        Renderiza o estado atual do ambiente que inclui a colônia; comidas; feromônios; formigas; informações.
+        Renderiza o estado atual do ambiente que inclui a colônia; comidas; feromônios; formigas; informações. Só o que
+        está dentro da área visível da câmera é desenhado (comida e feromônios pelos índices espaciais, formigas do
+        motor vetorizado por uma máscara sobre os arrays).
 
         Parameters:
             environment: Representa o ambiente da simulação (contêm informações sobre a colônia, fontes de comida e feromônios).
         """
+        profiler = environment.profiler
+        render_start = profiler.start()
+        camera = self.camera
+        
+        start = profiler.start()
         self.screen.fill(GlobalVar.WINDOW_BACKGROUND_COLOR)
         
         # Desenha colônia
+        self.colony_position = environment.colony.position
         pygame.draw.circle(
             self.screen, 
             GlobalVar.COLONY_COLOR, 
-            environment.colony.position, 
-            GlobalVar.COLONY_RADIUS
+            camera.world_to_screen(self.colony_position), 
+            max(1, GlobalVar.COLONY_RADIUS * camera.zoom)
         )
         
         # Desenha comida
-        for food in environment.food_sources:
+        for food in self.visible_food(environment):
             pygame.draw.circle(
                 self.screen,
                 food.get_color(),
-                food.position,
-                food.get_size()
+                camera.world_to_screen(food.position),
+                max(1, food.get_size() * camera.zoom)
             )
         
+        if environment.obstacles is not None:
+            self.render_obstacles(environment.obstacles)
+        
+        profiler.stop("draw_world", start)
+        
         # Desenha feromônios
-        for pheromone in environment.pheromones:
-            # Intensidade determina o tamanho e a opacidade do feromônio
-            size = max(1, min(3, pheromone.intensity / 5))
-            alpha = int(min(255, pheromone.intensity * 80))
-            
-            # Cria uma superfície com canal alpha para transparência
-            pheromone_surface = pygame.Surface((int(size*2), int(size*2)), pygame.SRCALPHA)
-            pygame.draw.circle(
-                pheromone_surface,
-                (*GlobalVar.PHEROMONE_COLOR, alpha),  # Cor com canal alpha
-                (int(size), int(size)),
-                int(size)
-            )
-            self.screen.blit(pheromone_surface, (
-                int(pheromone.position[0] - size),
-                int(pheromone.position[1] - size)
-            ))
+        start = profiler.start()
+        if environment.pheromone_field is not None:
+            self.render_pheromone_field(environment.pheromone_field)
+        else:
+            self.render_pheromones(self.visible_pheromones(environment))
+        
+        profiler.stop("draw_pheromones", start)
         
         # Desenha formigas
-        for ant in environment.colony.ants:
+        start = profiler.start()
+        self.render_ants(environment)
+        profiler.stop("draw_ants", start)
+        
+        # Desenha informações na tela
+        start = profiler.start()
+        self.render_info(environment)
+        profiler.stop("draw_info", start)
+        
+        if self.progress is not None:
+            self.render_progress(self.progress)
+        
+        if self.offscreen:
+            profiler.stop("render", render_start)
+            return
+        
+        pygame.display.flip()
+        profiler.stop("render", render_start)
+        self.clock.tick(GlobalVar.FPS)
+    
+    def visible_food(self, environment):
+        """
+        Retorna as fontes de comida dentro da área visível (pelo índice espacial quando o ambiente tem um).
+        """
+        left, top, right, bottom = self.camera.visible_rect(5 + GlobalVar.FOOD_STORAGE_CAPACITY)
+        if environment.food_grid is not None:
+            return environment.food_grid.query_rect(left, top, right, bottom)
+        return [
+            food for food in environment.food_sources
+            if left <= food.position[0] <= right and top <= food.position[1] <= bottom
+        ]
+    
+    def visible_pheromones(self, environment):
+        """
+        Retorna os feromônios dentro da área visível (pelo índice espacial quando o ambiente tem um).
+        """
+        left, top, right, bottom = self.camera.visible_rect(3)
+        if environment.pheromone_grid is not None:
+            return environment.pheromone_grid.query_rect(left, top, right, bottom)
+        return [
+            pheromone for pheromone in environment.pheromones
+            if left <= pheromone.position[0] <= right and top <= pheromone.position[1] <= bottom
+        ]
+    
+    def render_ants(self, environment):
+        """
+        Desenha as formigas visíveis. Com o motor vetorizado as posições, cores e tamanhos vêm direto dos arrays (sem
+        copiar o estado de todas as formigas para os objetos).
+
+        Parameters:
+            environment: Representa o ambiente da simulação (contêm informações sobre a colônia, fontes de comida e feromônios).
+        """
+        colony = environment.colony
+        engine = environment.population_engine
+        count = len(engine) if engine is not None else len(colony.ants) + len(colony.ants_scout)
+        if GlobalVar.RENDER_BULK and count >= GlobalVar.RENDER_BULK_MIN_COUNT:
+            self.render_ants_bulk(environment)
+            return
+        
+        camera = self.camera
+        zoom = camera.zoom
+        left, top, right, bottom = camera.visible_rect(5)
+        
+        if engine is not None:
+            import numpy as np
+            
+            x, y = engine.x, engine.y
+            visible = np.flatnonzero((x >= left) & (x <= right) & (y >= top) & (y <= bottom))
+            screen_x = ((x[visible] - camera.x) * zoom + camera.width / 2).astype(np.int64)
+            screen_y = ((y[visible] - camera.y) * zoom + camera.height / 2).astype(np.int64)
             # Tamanho da formiga baseado em sua velocidade
-            ant_size = max(2, min(5, ant.ag_speed / 2 + 1))
+            sizes = np.clip(engine.ag_speed[visible] / 2 + 1, 2, 5) * zoom
+            # Cores de Ant.get_color e Ant_Scout.get_color (as exploradoras ficam depois das formigas normais)
+            color_index = (visible >= len(colony.ants)) * 2 + engine.has_food[visible]
+            colors = (
+                GlobalVar.ANT_COLOR, GlobalVar.ANT_WITH_FOOD_COLOR,
+                GlobalVar.ANT_SCOUT_COLOR, GlobalVar.ANT_SCOUT_WITH_FOOD_COLOR,
+            )
             
-            pygame.draw.circle(
-                self.screen,
-                ant.get_color(),
-                ant.get_display_position(),
-                ant_size
+            for px, py, size, color in zip(screen_x.tolist(), screen_y.tolist(), sizes.tolist(), color_index.tolist()):
+                pygame.draw.circle(self.screen, colors[color], (px, py), max(1, size))
+            return
+        
+        for ants in (colony.ants, colony.ants_scout):
+            for ant in ants:
+                if not (left <= ant.x <= right and top <= ant.y <= bottom):
+                    continue
+                # Tamanho da formiga baseado em sua velocidade
+                ant_size = max(2, min(5, ant.ag_speed / 2 + 1))
+                
+                pygame.draw.circle(
+                    self.screen,
+                    ant.get_color(),
+                    camera.world_to_screen((ant.x, ant.y)),
+                    max(1, ant_size * zoom)
+                )
+    
+    def get_rasterizer(self):
+        """
+        Retorna o rasterizador (criado no primeiro uso).
+        """
+        if self.rasterizer is None:
+            from rasterizer import Rasterizer
+            self.rasterizer = Rasterizer()
+        return self.rasterizer
+    
+    def render_ants_bulk(self, environment):
+        """
+        Desenha as formigas visíveis com poucas operações NumPy (ver Rasterizer.draw_circles): mesmas posições, tamanhos
+        (pela velocidade) e cores (get_color) do desenho uma a uma.
+
+        Parameters:
+            environment: Representa o ambiente da simulação.
+        """
+        import numpy as np
+        
+        camera = self.camera
+        left, top, right, bottom = camera.visible_rect(5)
+        colony = environment.colony
+        engine = environment.population_engine
+        
+        if engine is not None:
+            x, y, speed = engine.x, engine.y, engine.ag_speed
+            inside = (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+            # Cores de Ant.get_color e Ant_Scout.get_color (as exploradoras ficam depois das formigas normais)
+            palette = (
+                GlobalVar.ANT_COLOR, GlobalVar.ANT_WITH_FOOD_COLOR,
+                GlobalVar.ANT_SCOUT_COLOR, GlobalVar.ANT_SCOUT_WITH_FOOD_COLOR,
             )
+            if inside.all():
+                # Todas visíveis (caso comum com o mundo inteiro na tela): sem copiar os arrays
+                scout = np.arange(len(x)) >= len(colony.ants)
+                has_food = engine.has_food
+            else:
+                visible = np.flatnonzero(inside)
+                x, y, speed = x[visible], y[visible], speed[visible]
+                scout = visible >= len(colony.ants)
+                has_food = engine.has_food[visible]
+            indices = scout * 2 + has_food
+        else:
+            ants = colony.ants + colony.ants_scout
+            count = len(ants)
+            x = np.fromiter((ant.x for ant in ants), dtype=np.float64, count=count)
+            y = np.fromiter((ant.y for ant in ants), dtype=np.float64, count=count)
+            speed = np.fromiter((ant.ag_speed for ant in ants), dtype=np.float64, count=count)
+            visible = np.flatnonzero((x >= left) & (x <= right) & (y >= top) & (y <= bottom))
+            x, y, speed = x[visible], y[visible], speed[visible]
+            colors = {}
+            indices = np.array(
+                [colors.setdefault(ants[i].get_color(), len(colors)) for i in visible.tolist()], dtype=np.int64
+            )
+            palette = list(colors)
+        
+        zoom = camera.zoom
+        screen_x = ((x - camera.x) * zoom + camera.width / 2).astype(np.int64)
+        screen_y = ((y - camera.y) * zoom + camera.height / 2).astype(np.int64)
+        # Tamanho da formiga baseado em sua velocidade
+        radii = np.maximum(1, np.clip(speed / 2 + 1, 2, 5) * zoom).astype(np.int64)
+        self.get_rasterizer().draw_circles(self.screen, screen_x, screen_y, radii, palette, indices)
     
-        for ant_scout in environment.colony.ants_scout:
-            # Tamanho da formiga baseado em sua velocidade
-            ant_size = max(2, min(5, ant_scout.ag_speed / 2 + 1))
+    def get_pheromone_sprite(self, size, alpha):
+        """
+        Retorna a imagem (com canal alpha) de um feromônio, criando-a apenas na primeira vez que a combinação de
+        tamanho e opacidade aparece.
+
+        Parameters:
+            size: Raio do feromônio (em pixels).
+            alpha: Opacidade (0 a 255).
+
+        Returns:
+            Surface: A imagem do feromônio.
+        """
+        step = GlobalVar.PHEROMONE_SPRITE_ALPHA_STEP
+        key = (int(size * 2), int(size), alpha // step * step)
+        sprite = self.pheromone_sprites.get(key)
+        if sprite is None:
+            diameter, radius, sprite_alpha = key
+            sprite = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*GlobalVar.PHEROMONE_COLOR, sprite_alpha), (radius, radius), radius)
+            self.pheromone_sprites[key] = sprite
+        return sprite
+    
+    def render_pheromones(self, pheromones):
+        """
+        Desenha os feromônios usando as imagens em cache (opcionalmente com uma única chamada a Surface.blits).
+
+        Parameters:
+            pheromones: Feromônios a serem desenhados.
+        """
+        camera = self.camera
+        zoom = camera.zoom
+        offset_x = camera.width / 2 - camera.x * zoom
+        offset_y = camera.height / 2 - camera.y * zoom
+        
+        if GlobalVar.RENDER_BULK and len(pheromones) >= GlobalVar.RENDER_BULK_MIN_COUNT:
+            self.render_pheromones_bulk(pheromones, zoom, offset_x, offset_y)
+            return
+        
+        blits = []
+        for pheromone in pheromones:
+            # Intensidade determina o tamanho e a opacidade do feromônio
+            intensity = pheromone.intensity
+            size = max(1, min(3, intensity / 5) * zoom)
+            alpha = int(min(255, intensity * 80))
             
-            pygame.draw.circle(
-                self.screen,
-                ant_scout.get_color(),
-                ant_scout.get_display_position(),
-                ant_size
-            )
+            position = pheromone.position
+            blits.append((
+                self.get_pheromone_sprite(size, alpha),
+                (int(position[0] * zoom + offset_x - size), int(position[1] * zoom + offset_y - size))
+            ))
         
-        # Desenha informações na tela
-        self.render_info(environment)
-                
-        pygame.display.flip()
-        self.clock.tick(GlobalVar.FPS)
+        if GlobalVar.RENDER_BATCH_BLITS:
+            self.screen.blits(blits, doreturn=False)
+        else:
+            for sprite, destination in blits:
+                self.screen.blit(sprite, destination)
+    
+    def render_pheromones_bulk(self, pheromones, zoom, offset_x, offset_y):
+        """
+        Desenha os feromônios com poucas operações NumPy e um único blit (ver Rasterizer.draw_alpha_circles): mesmos
+        tamanhos e opacidades das imagens de get_pheromone_sprite.
+        """
+        import numpy as np
+        
+        count = len(pheromones)
+        if count == 0:
+            return
+        intensity = np.fromiter((pheromone.intensity for pheromone in pheromones), dtype=np.float64, count=count)
+        x = np.fromiter((pheromone.position[0] for pheromone in pheromones), dtype=np.float64, count=count)
+        y = np.fromiter((pheromone.position[1] for pheromone in pheromones), dtype=np.float64, count=count)
+        
+        # Intensidade determina o tamanho e a opacidade do feromônio
+        size = np.maximum(1, np.minimum(3, intensity / 5) * zoom)
+        step = GlobalVar.PHEROMONE_SPRITE_ALPHA_STEP
+        alpha = np.minimum(255, intensity * 80).astype(np.int64) // step * step
+        self.get_rasterizer().draw_alpha_circles(
+            self.screen,
+            (x * zoom + offset_x - size).astype(np.int64),
+            (y * zoom + offset_y - size).astype(np.int64),
+            size.astype(np.int64),
+            (size * 2).astype(np.int64),
+            alpha,
+            GlobalVar.PHEROMONE_COLOR,
+        )
+    
+    def render_pheromone_field(self, field):
+        """
+        Desenha o campo denso de feromônios: as células visíveis da grade viram uma imagem (opacidade pela intensidade)
+        ampliada para a tela.
+
+        Parameters:
+            field: Campo denso de feromônios.
+        """
+        import numpy as np
+
+        camera = self.camera
+        resolution = field.resolution
+        left, top, right, bottom = camera.visible_rect()
+        first_col = max(0, int(left // resolution))
+        last_col = min(field.cols, int(right // resolution) + 1)
+        first_row = max(0, int(top // resolution))
+        last_row = min(field.rows, int(bottom // resolution) + 1)
+        if first_col >= last_col or first_row >= last_row:
+            return
+
+        cols, rows = last_col - first_col, last_row - first_row
+        field_surface = pygame.Surface((cols, rows), pygame.SRCALPHA)
+        field_surface.fill((*GlobalVar.PHEROMONE_COLOR, 0))
+        alpha = pygame.surfarray.pixels_alpha(field_surface)
+        alpha[:] = np.minimum(255, field.grid[first_col:last_col, first_row:last_row] * 80).astype(np.uint8)
+        del alpha
+
+        scaled_size = (round(cols * resolution * camera.zoom), round(rows * resolution * camera.zoom))
+        destination = camera.world_to_screen((first_col * resolution, first_row * resolution))
+        self.screen.blit(pygame.transform.scale(field_surface, scaled_size), destination)
+    
+    def render_obstacles(self, obstacles):
+        """
+        Desenha os obstáculos: as células visíveis da grade de obstáculos viram uma imagem ampliada para a tela.
+
+        Parameters:
+            obstacles: Grade de obstáculos.
+        """
+        camera = self.camera
+        cell_size = obstacles.cell_size
+        left, top, right, bottom = camera.visible_rect()
+        first_col = max(0, int(left // cell_size))
+        last_col = min(obstacles.cols, int(right // cell_size) + 1)
+        first_row = max(0, int(top // cell_size))
+        last_row = min(obstacles.rows, int(bottom // cell_size) + 1)
+        if first_col >= last_col or first_row >= last_row:
+            return
+
+        cols, rows = last_col - first_col, last_row - first_row
+        obstacle_surface = pygame.Surface((cols, rows), pygame.SRCALPHA)
+        obstacle_surface.fill((*GlobalVar.OBSTACLE_COLOR, 0))
+        alpha = pygame.surfarray.pixels_alpha(obstacle_surface)
+        alpha[:] = obstacles.blocked[first_col:last_col, first_row:last_row] * 255
+        del alpha
+
+        scaled_size = (round(cols * cell_size * camera.zoom), round(rows * cell_size * camera.zoom))
+        destination = camera.world_to_screen((first_col * cell_size, first_row * cell_size))
+        self.screen.blit(pygame.transform.scale(obstacle_surface, scaled_size), destination)
     
     def render_info(self, environment):
         """
@@ -115,15 +431,26 @@ class Renderer:
             f"Comida coletada: {environment.total_food_collected}",
             f"Próxima evolução: {GlobalVar.AG_FOOD_COLLECT_TO_EVOLVE - environment.food_delivery_count} comidas",
             f"Formigas: {len(environment.colony.ants)}",
-            f"Fontes de comida: {len(environment.food_sources)}"
+            f"Fontes de comida: {len(environment.food_sources)}",
+            *self.status_texts
         ]
         
-        # Estatísticas da população
-        if environment.colony.ants:
+        # Percentis do profiler (quando habilitado)
+        info_texts.extend(environment.profiler.hud_lines())
+        
+        # Estatísticas da população (com o motor vetorizado, média direto dos arrays das formigas normais)
+        engine = environment.population_engine
+        num_ants = len(environment.colony.ants)
+        if num_ants and engine is not None:
+            avg_speed = float(engine.ag_speed[:num_ants].mean())
+            avg_sense = float(engine.ag_pheromone_detection_range[:num_ants].mean())
+            avg_strength = float(engine.ag_pheromone_strength[:num_ants].mean())
+        elif num_ants:
             avg_speed = environment.colony.calculate_average(environment.colony.ants, "ag_speed")
             avg_sense = environment.colony.calculate_average(environment.colony.ants, "ag_pheromone_detection_range")
             avg_strength = environment.colony.calculate_average(environment.colony.ants, "ag_pheromone_strength")
-            
+        
+        if num_ants:
             info_texts.extend([
                 f"Velocidade média: {avg_speed:.2f}",
                 f"Detecção média: {avg_sense:.2f}",
@@ -137,12 +464,105 @@ class Renderer:
             self.screen.blit(text_surface, (10, y_offset))
             y_offset += 20
     
+    # Altura (em pixels) da barra de progresso do replay
+    PROGRESS_HEIGHT = 8
+
+    def render_progress(self, fraction):
+        """
+        Desenha a barra de progresso do replay na parte de baixo da tela.
+
+        Parameters:
+            fraction: Fração (0 a 1) já reproduzida.
+        """
+        width, height = self.screen.get_size()
+        top = height - self.PROGRESS_HEIGHT
+        pygame.draw.rect(self.screen, (40, 28, 20), (0, top, width, self.PROGRESS_HEIGHT))
+        pygame.draw.rect(self.screen, (255, 255, 255), (0, top, int(width * fraction), self.PROGRESS_HEIGHT))
+
+    def progress_fraction(self, position):
+        """
+        Retorna a fração (0 a 1) da barra de progresso na posição da tela, ou None se a posição está fora da barra.
+        """
+        width, height = self.screen.get_size()
+        if position[1] < height - self.PROGRESS_HEIGHT * 2:
+            return None
+        return min(1.0, max(0.0, position[0] / width))
+
+    # Teclas de controle da simulação: pausa, passo único e velocidades (1x/10x/100x/máxima). As teclas de busca só
+    # são usadas no replay (a simulação ao vivo ignora o comando "seek").
+    KEY_COMMANDS = {
+        pygame.K_SPACE: ("pause", None),
+        pygame.K_RIGHT: ("step", None),
+        pygame.K_s: ("step", None),
+        pygame.K_1: ("speed", 1),
+        pygame.K_2: ("speed", 10),
+        pygame.K_3: ("speed", 100),
+        pygame.K_0: ("speed", None),
+        pygame.K_m: ("speed", None),
+        pygame.K_LEFT: ("seek", -1),
+        pygame.K_PAGEUP: ("seek", -1000),
+        pygame.K_PAGEDOWN: ("seek", 1000),
+        pygame.K_HOME: ("seek", None),
+    }
+
     def check_quit(self):
         """
-        Retorna False se o programa deve encerrar, True caso contrário.
+        Retorna False se o programa deve encerrar, True caso contrário. As teclas de controle e os cliques (comando
+        "click" com a posição) são guardados em commands. Shift + clique adiciona e Ctrl + clique remove obstáculos
+        (comando "obstacle" com a posição no mundo e se bloqueia).
         """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            if event.type == pygame.KEYDOWN and event.key in self.KEY_COMMANDS:
+                self.commands.append(self.KEY_COMMANDS[event.key])
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mods = pygame.key.get_mods()
+                if mods & (pygame.KMOD_SHIFT | pygame.KMOD_CTRL):
+                    position = self.camera.screen_to_world(event.pos)
+                    self.commands.append(("obstacle", (position, not mods & pygame.KMOD_CTRL)))
+                else:
+                    self.commands.append(("click", event.pos))
+            self.handle_camera_event(event)
                 
-        return True
\ No newline at end of file
+        return True
+    
+    def handle_camera_event(self, event):
+        """
+        Aplica um evento de controle da câmera: arrastar com o botão direito (ou do meio) move, a roda do mouse muda o
+        zoom no ponto do cursor, +/- mudam o zoom no centro, F mostra o mundo inteiro e C centraliza na colônia.
+
+        Parameters:
+            event: Evento do pygame.
+        """
+        camera = self.camera
+        step = GlobalVar.CAMERA_ZOOM_STEP
+        
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button in (2, 3):
+            self._dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+            self._dragging = False
+        elif event.type == pygame.MOUSEMOTION and self._dragging:
+            camera.pan(-event.rel[0], -event.rel[1])
+        elif event.type == pygame.MOUSEWHEEL and event.y:
+            camera.zoom_at(step if event.y > 0 else 1 / step, pygame.mouse.get_pos())
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                camera.zoom_at(step)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                camera.zoom_at(1 / step)
+            elif event.key == pygame.K_f:
+                camera.fit()
+            elif event.key == pygame.K_c:
+                camera.center_on(self.colony_position)
+    
+    def poll_commands(self):
+        """
+        Retorna os comandos de controle recebidos desde a última chamada e limpa a lista.
+
+        Returns:
+            list: Pares (comando, valor), por exemplo ("speed", 10) ou ("pause", None).
+        """
+        commands = self.commands
+        self.commands = []
+        return commands
@@ -0,0 +1,641 @@
+import bisect
+import json
+import struct
+
+import numpy as np
+
+from ant_scout import Ant_Scout
+from colony import Colony
+from food_source import FoodSource
+from global_var import GlobalVar
+from pheromone import Pheromone, PheromoneClock
+from profiler import Profiler
+from recorder import FOOD_DTYPE
+
+MAGIC = b"ANTRPLY1"
+INDEX_MAGIC = b"ANTRIDX1"
+VERSION = 1
+
+class ReplayRecorder:
+    """
+    Gravador do replay. Registrado em Environment.tick_listeners, grava a cada tick um quadro no arquivo (só
+    acréscimo): a cada keyframe_interval ticks um quadro-chave com o estado completo (formigas, genes, comida,
+    feromônios) e nos outros ticks um delta compacto em relação ao tick anterior.
+
+    Formato do arquivo:
+        MAGIC | quadros | índice JSON | posição do índice (uint64) | INDEX_MAGIC
+        Cada quadro: tamanho do cabeçalho (uint32) | cabeçalho JSON | arrays (na ordem do cabeçalho)
+
+    Conteúdo do delta:
+        delta: Deslocamento (int8) de cada formiga em 1/REPLAY_POSITION_SCALE pixel.
+        jump_index, jump: Formigas cujo deslocamento não cabe em int8 e a posição absoluta delas.
+        flip: Formigas que pegaram ou entregaram comida.
+        gene_index, genes: Formigas com genes novos (evolução).
+        food: Fontes de comida (só quando mudaram).
+        deposits: Feromônios depositados no tick (x, y, intensidade) ou, com o campo denso, deposit_cells e
+            deposit_intensity (repetidos na reprodução, então o campo é idêntico ao da simulação).
+
+    Um quadro-chave também é gravado quando o conjunto de formigas muda (nova geração com novos objetos).
+
+    Atributos:
+        path: Arquivo do replay.
+        keyframe_interval: Intervalo (em ticks) entre quadros-chave.
+        scale: Subdivisões do pixel nas posições gravadas.
+        frames: Índice dos quadros gravados ([tick, posição no arquivo, é quadro-chave]).
+
+    Métodos:
+        attach(environment): Registra o gravador no ambiente (e grava o primeiro quadro-chave).
+        record(environment): Grava o quadro do tick atual.
+        close(): Grava o índice e fecha o arquivo.
+    """
+    def __init__(self, path, keyframe_interval=None):
+        """
+        Construtor do gravador.
+
+        Parameters:
+            path: Arquivo do replay (substituído se existir).
+            keyframe_interval (opcional): Intervalo entre quadros-chave (padrão = GlobalVar.REPLAY_KEYFRAME_INTERVAL).
+        """
+        self.path = path
+        self.keyframe_interval = keyframe_interval or GlobalVar.REPLAY_KEYFRAME_INTERVAL
+        self.scale = GlobalVar.REPLAY_POSITION_SCALE
+        self.frames = []
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+
+        self._last_keyframe = None
+        self._obstacle_version = None
+        self._ants_lists = None
+        self._position = None
+        self._has_food = None
+        self._genes = None
+        self._evolution = None
+        self._food = None
+        self._pheromone_tick = None
+
+    def __call__(self, environment):
+        self.record(environment)
+
+    def attach(self, environment):
+        """
+        Registra o gravador no ambiente e grava o estado atual como quadro-chave.
+        """
+        if environment.pheromone_field is not None:
+            environment.pheromone_field.deposit_log = []
+        environment.tick_listeners.append(self)
+        self.write_keyframe(environment)
+        return self
+
+    def record(self, environment):
+        """
+        Grava o quadro do tick atual (quadro-chave ou delta).
+        """
+        if environment.tick - self._last_keyframe >= self.keyframe_interval or self._ants_changed(environment):
+            self.write_keyframe(environment)
+        else:
+            self.write_delta(environment)
+
+    def _ant_lists(self, environment):
+        engine = environment.population_engine
+        if engine is not None:
+            return (engine.ants,)
+        return (environment.colony.ants, environment.colony.ants_scout)
+
+    def _ants_changed(self, environment):
+        # A evolução por gerações cria novas listas (e novos objetos) de formigas
+        lists = self._ant_lists(environment)
+        if any(current is not previous for current, previous in zip(lists, self._ants_lists)):
+            return True
+        return sum(len(ants) for ants in lists) != len(self._position)
+
+    def _ants(self, environment):
+        engine = environment.population_engine
+        if engine is not None:
+            return engine.ants
+        return environment.colony.ants + environment.colony.ants_scout
+
+    def _positions(self, environment):
+        # Posições quantizadas (inteiros em 1/scale pixel) e se cada formiga carrega comida
+        engine = environment.population_engine
+        if engine is not None:
+            x, y, has_food = engine.x, engine.y, engine.has_food.copy()
+        else:
+            ants = self._ants(environment)
+            x = np.fromiter((ant.x for ant in ants), dtype=np.float64, count=len(ants))
+            y = np.fromiter((ant.y for ant in ants), dtype=np.float64, count=len(ants))
+            has_food = np.fromiter((ant.has_food for ant in ants), dtype=bool, count=len(ants))
+
+        position = np.empty((len(x), 2), dtype=np.int32)
+        position[:, 0] = np.rint(x * self.scale)
+        position[:, 1] = np.rint(y * self.scale)
+        return position, has_food
+
+    def _gene_array(self, environment):
+        engine = environment.population_engine
+        if engine is not None:
+            return np.column_stack(
+                (engine.ag_speed, engine.ag_pheromone_detection_range, engine.ag_pheromone_strength)
+            ).astype(np.float32)
+        ants = self._ants(environment)
+        return np.array(
+            [(ant.ag_speed, ant.ag_pheromone_detection_range, ant.ag_pheromone_strength) for ant in ants],
+            dtype=np.float32
+        ).reshape(len(ants), 3)
+
+    def _food_array(self, environment):
+        return np.array(
+            [(food.position[0], food.position[1], food.stock) for food in environment.food_sources], dtype=FOOD_DTYPE
+        )
+
+    def _header(self, environment, keyframe):
+        colony = environment.colony
+        return {
+            "tick": environment.tick,
+            "keyframe": keyframe,
+            "generation": colony.generation,
+            "total_food_collected": environment.total_food_collected,
+            "food_delivery_count": environment.food_delivery_count,
+            "pheromone_clock": environment.pheromone_clock.tick,
+        }
+
+    def write_keyframe(self, environment):
+        """
+        Grava um quadro-chave com o estado completo.
+        """
+        colony = environment.colony
+        ants = self._ants(environment)
+        position, has_food = self._positions(environment)
+        genes = self._gene_array(environment)
+        food = self._food_array(environment)
+
+        header = self._header(environment, True)
+        header["colony"] = [colony.x, colony.y]
+        header["scale"] = self.scale
+        arrays = {
+            "id": np.array([ant.id for ant in ants], dtype=np.uint32),
+            "scout": np.array([isinstance(ant, Ant_Scout) for ant in ants], dtype=bool),
+            "position": position,
+            "has_food": has_food,
+            "genes": genes,
+            "food": food,
+        }
+
+        field = environment.pheromone_field
+        if field is not None:
+            header["field"] = {
+                "resolution": field.resolution, "decay_rate": field.decay_rate, "diffusion": field.diffusion,
+            }
+            arrays["field"] = field.grid
+            field.deposit_log.clear()
+        else:
+            header["decay_rate"] = environment.pheromone_clock.decay_rate
+            pheromones = list(environment.pheromones)
+            arrays["pheromones"] = np.array(
+                [(p.position[0], p.position[1], p.initial_intensity) for p in pheromones], dtype=np.float64
+            ).reshape(len(pheromones), 3)
+            arrays["pheromone_tick"] = np.array([p.deposit_tick for p in pheromones], dtype=np.int64)
+
+        self._write_obstacles(environment, header, arrays)
+        self._write_frame(header, arrays)
+        self._last_keyframe = environment.tick
+        self._ants_lists = self._ant_lists(environment)
+        self._position = position
+        self._has_food = has_food
+        self._genes = genes
+        self._evolution = (colony.generation, colony.steady_state_replacements)
+        self._food = food
+        self._pheromone_tick = environment.pheromone_clock.tick
+
+    def write_delta(self, environment):
+        """
+        Grava um delta em relação ao tick anterior.
+        """
+        colony = environment.colony
+        arrays = {}
+
+        position, has_food = self._positions(environment)
+        delta = position - self._position
+        jumps = np.flatnonzero(np.abs(delta).max(axis=1) > 127) if len(delta) else np.empty(0, dtype=np.int64)
+        if len(jumps):
+            delta[jumps] = 0
+            arrays["jump_index"] = jumps.astype(np.uint32)
+            arrays["jump"] = position[jumps]
+        arrays["delta"] = delta.astype(np.int8)
+
+        flips = np.flatnonzero(has_food != self._has_food)
+        if len(flips):
+            arrays["flip"] = flips.astype(np.uint32)
+
+        # Os genes só mudam na evolução (nova geração ou substituições contínuas)
+        evolution = (colony.generation, colony.steady_state_replacements)
+        if evolution != self._evolution:
+            genes = self._gene_array(environment)
+            changed = np.flatnonzero((genes != self._genes).any(axis=1))
+            if len(changed):
+                arrays["gene_index"] = changed.astype(np.uint32)
+                arrays["genes"] = genes[changed]
+            self._genes = genes
+            self._evolution = evolution
+
+        food = self._food_array(environment)
+        if not np.array_equal(food, self._food):
+            arrays["food"] = food
+            self._food = food
+
+        header = self._header(environment, False)
+        field = environment.pheromone_field
+        if field is not None:
+            log = field.deposit_log
+            if log:
+                cx = np.concatenate([np.asarray(entry[0]) for entry in log])
+                cy = np.concatenate([np.asarray(entry[1]) for entry in log])
+                intensity = np.concatenate(
+                    [np.broadcast_to(np.asarray(entry[2], dtype=np.float64), np.shape(entry[0])) for entry in log]
+                )
+                arrays["deposit_cells"] = np.column_stack((cx, cy)).astype(np.int32)
+                arrays["deposit_intensity"] = intensity
+                log.clear()
+        else:
+            # Os feromônios novos estão no fim do dicionário (ordem de inserção)
+            deposits = []
+            for pheromone in reversed(environment.pheromones):
+                if pheromone.deposit_tick < self._pheromone_tick:
+                    break
+                deposits.append((pheromone.position[0], pheromone.position[1], pheromone.initial_intensity))
+            if deposits:
+                deposits.reverse()
+                arrays["deposits"] = np.array(deposits, dtype=np.float64)
+                header["deposit_tick"] = self._pheromone_tick
+            self._pheromone_tick = environment.pheromone_clock.tick
+
+        self._write_obstacles(environment, header, arrays, changed_only=True)
+        self._write_frame(header, arrays)
+        self._position = position
+        self._has_food = has_food
+
+    def _write_obstacles(self, environment, header, arrays, changed_only=False):
+        # A grade de obstáculos vai nos quadros-chave e nos deltas dos ticks em que foi editada
+        obstacles = environment.obstacles
+        version = None if obstacles is None else (id(obstacles), obstacles.version)
+        if obstacles is not None and (not changed_only or version != self._obstacle_version):
+            header["obstacle_cell_size"] = obstacles.cell_size
+            arrays["obstacles"] = obstacles.blocked
+        self._obstacle_version = version
+
+    def _write_frame(self, header, arrays):
+        arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+        header["arrays"] = [
+            [name, np.lib.format.dtype_to_descr(array.dtype), list(array.shape)] for name, array in arrays.items()
+        ]
+        header_bytes = json.dumps(header).encode("utf-8")
+
+        file = self.file
+        self.frames.append([header["tick"], file.tell(), header["keyframe"]])
+        file.write(struct.pack("<I", len(header_bytes)))
+        file.write(header_bytes)
+        for array in arrays.values():
+            file.write(array.tobytes())
+
+    def close(self):
+        """
+        Grava o índice dos quadros no fim do arquivo e fecha o arquivo.
+        """
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        index = {"version": VERSION, "keyframe_interval": self.keyframe_interval, "frames": self.frames}
+        self.file.write(json.dumps(index).encode("utf-8"))
+        self.file.write(struct.pack("<Q", index_offset))
+        self.file.write(INDEX_MAGIC)
+        self.file.close()
+
+class ReplayAnt:
+    """
+    Formiga do replay: só o que o Renderer usa para desenhar.
+    """
+    __slots__ = ("x", "y", "has_food", "ag_speed", "ag_pheromone_detection_range", "ag_pheromone_strength", "is_scout")
+
+    def get_color(self):
+        if self.is_scout:
+            return GlobalVar.ANT_SCOUT_WITH_FOOD_COLOR if self.has_food else GlobalVar.ANT_SCOUT_COLOR
+        return GlobalVar.ANT_WITH_FOOD_COLOR if self.has_food else GlobalVar.ANT_COLOR
+
+    def get_display_position(self):
+        return (int(self.x), int(self.y))
+
+class ReplayColony:
+    """
+    Colônia do replay (posição, geração e as formigas para desenho).
+    """
+    calculate_average = Colony.calculate_average
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.generation = 1
+        self.ants = []
+        self.ants_scout = []
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+class ReplayState:
+    """
+    Estado da simulação reconstruído do replay. Tem os atributos do Environment que o Renderer usa, então é desenhado
+    da mesma forma que a simulação ao vivo (sem executar Environment.update).
+
+    Atributos:
+        tick: Tick do estado.
+        colony: Colônia (ReplayColony).
+        food_sources: Fontes de comida (FoodSource).
+        pheromones: Feromônios (objetos) quando o replay não usa o campo denso.
+        pheromone_field: Campo denso de feromônios (None quando os feromônios são objetos).
+        obstacles: Grade de obstáculos (None = sem obstáculos).
+        total_food_collected, food_delivery_count: Contadores exibidos nas informações.
+        profiler: Profiler desabilitado (o Renderer mede as fases nele).
+        food_grid, pheromone_grid, population_engine: Sempre None (o Renderer filtra as listas pela área visível).
+
+    Métodos:
+        apply_delta(header, arrays): Avança um tick aplicando um delta.
+        finish(): Remove os feromônios inativos e atualiza as formigas para desenho.
+        sync_ant_views(): Sem efeito (compatível com Environment).
+    """
+    def __init__(self, header, arrays):
+        """
+        Cria o estado a partir de um quadro-chave.
+        """
+        self.scale = header["scale"]
+        self.colony = ReplayColony(*header["colony"])
+        self.ids = np.array(arrays["id"])
+        self.scout = np.array(arrays["scout"])
+        self.position = np.array(arrays["position"], dtype=np.int32)
+        self.has_food = np.array(arrays["has_food"], dtype=bool)
+        self.genes = np.array(arrays["genes"], dtype=np.float32)
+        self.food_sources = []
+        self._set_food(arrays["food"])
+        self.profiler = Profiler(False)
+        self.food_grid = None
+        self.pheromone_grid = None
+        self.population_engine = None
+        self.obstacles = None
+        self._set_obstacles(header, arrays)
+
+        self.pheromones = []
+        self.pheromone_field = None
+        if "field" in header:
+            from pheromone_field import PheromoneField
+
+            info = header["field"]
+            grid = arrays["field"]
+            field = PheromoneField(1, 1, info["resolution"], info["decay_rate"], info["diffusion"])
+            field.cols, field.rows = grid.shape
+            field.grid = np.array(grid, dtype=np.float64)
+            self.pheromone_field = field
+        else:
+            self.clock = PheromoneClock(header["decay_rate"])
+            for (x, y, intensity), tick in zip(arrays["pheromones"].tolist(), arrays["pheromone_tick"].tolist()):
+                self._add_pheromone(x, y, intensity, tick)
+
+        self._set_scalars(header)
+
+    def _set_scalars(self, header):
+        self.tick = header["tick"]
+        self.colony.generation = header["generation"]
+        self.total_food_collected = header["total_food_collected"]
+        self.food_delivery_count = header["food_delivery_count"]
+        if self.pheromone_field is None:
+            self.clock.tick = header["pheromone_clock"]
+
+    def _set_food(self, food):
+        self.food_sources = [
+            FoodSource((float(x), float(y)), int(stock)) for x, y, stock in zip(food["x"], food["y"], food["stock"])
+        ]
+
+    def _set_obstacles(self, header, arrays):
+        if "obstacles" not in arrays:
+            return
+        from navigation import ObstacleMap
+
+        cell_size = header["obstacle_cell_size"]
+        blocked = arrays["obstacles"]
+        obstacles = ObstacleMap(blocked.shape[0] * cell_size, blocked.shape[1] * cell_size, cell_size)
+        obstacles.blocked[:] = blocked
+        self.obstacles = obstacles
+
+    def _add_pheromone(self, x, y, intensity, tick):
+        # O feromônio é criado com o tick do depósito (o decaimento preguiçoso calcula a intensidade atual)
+        clock = self.clock
+        current = clock.tick
+        clock.tick = tick
+        self.pheromones.append(Pheromone((x, y), intensity, clock))
+        clock.tick = current
+
+    def apply_delta(self, header, arrays):
+        """
+        Avança um tick aplicando um delta (chame finish() antes de desenhar).
+        """
+        self.position += arrays["delta"]
+        if "jump_index" in arrays:
+            self.position[arrays["jump_index"]] = arrays["jump"]
+        if "flip" in arrays:
+            self.has_food[arrays["flip"]] ^= True
+        if "gene_index" in arrays:
+            self.genes[arrays["gene_index"]] = arrays["genes"]
+        if "food" in arrays:
+            self._set_food(arrays["food"])
+        self._set_obstacles(header, arrays)
+
+        field = self.pheromone_field
+        if field is not None:
+            # Mesmas operações da simulação: depósitos do tick e depois o decaimento/difusão
+            if "deposit_cells" in arrays:
+                cells = arrays["deposit_cells"]
+                np.add.at(field.grid, (cells[:, 0], cells[:, 1]), arrays["deposit_intensity"])
+            field.update()
+        elif "deposits" in arrays:
+            tick = header["deposit_tick"]
+            for x, y, intensity in arrays["deposits"].tolist():
+                self._add_pheromone(x, y, intensity, tick)
+
+        self._set_scalars(header)
+
+    def finish(self):
+        """
+        Remove os feromônios inativos e atualiza as formigas usadas no desenho.
+        """
+        if self.pheromone_field is None:
+            self.pheromones = [pheromone for pheromone in self.pheromones if pheromone.is_active()]
+
+        count = len(self.position)
+        ants = self.colony.ants + self.colony.ants_scout
+        if len(ants) != count:
+            ants = [ReplayAnt() for _ in range(count)]
+
+        xs = (self.position[:, 0] / self.scale).tolist()
+        ys = (self.position[:, 1] / self.scale).tolist()
+        has_food = self.has_food.tolist()
+        genes = self.genes.tolist()
+        scout = self.scout.tolist()
+        for i, ant in enumerate(ants):
+            ant.x = xs[i]
+            ant.y = ys[i]
+            ant.has_food = has_food[i]
+            ant.ag_speed, ant.ag_pheromone_detection_range, ant.ag_pheromone_strength = genes[i]
+            ant.is_scout = scout[i]
+
+        self.colony.ants = [ant for ant in ants if not ant.is_scout]
+        self.colony.ants_scout = [ant for ant in ants if ant.is_scout]
+
+    def sync_ant_views(self):
+        pass
+
+class ReplayReader:
+    """
+    Leitor do replay. O arquivo é mapeado em memória; a busca vai para o quadro-chave anterior e aplica só os deltas
+    até o tick pedido (no máximo keyframe_interval deltas). Arquivos sem índice (gravação interrompida) são percorridos
+    para reconstruí-lo.
+
+    Atributos:
+        path: Arquivo do replay.
+        frames: Índice dos quadros ([tick, posição no arquivo, é quadro-chave]).
+        ticks: Tick de cada quadro.
+        state: Estado atual (ReplayState).
+        frame: Índice do quadro do estado atual.
+
+    Métodos:
+        seek(tick): Vai para o último quadro até o tick.
+        seek_frame(index): Vai para um quadro pelo índice.
+        advance(count): Avança count quadros.
+    """
+    def __init__(self, path):
+        """
+        Construtor do leitor.
+
+        Parameters:
+            path: Arquivo do replay.
+        """
+        self.path = path
+        self.buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self.buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} não é um replay da simulação.")
+
+        self.frames = self._read_index()
+        if not self.frames:
+            raise ValueError(f"{path} não tem quadros.")
+        self.ticks = [frame[0] for frame in self.frames]
+        self.keyframes = [i for i, frame in enumerate(self.frames) if frame[2]]
+        self.state = None
+        self.frame = None
+
+    @property
+    def first_tick(self):
+        return self.ticks[0]
+
+    @property
+    def last_tick(self):
+        return self.ticks[-1]
+
+    def _read_index(self):
+        buffer = self.buffer
+        size = len(buffer)
+        footer = len(INDEX_MAGIC) + 8
+        if size >= len(MAGIC) + footer and bytes(buffer[size - len(INDEX_MAGIC):]) == INDEX_MAGIC:
+            (index_offset,) = struct.unpack("<Q", bytes(buffer[size - footer:size - len(INDEX_MAGIC)]))
+            index = json.loads(bytes(buffer[index_offset:size - footer]).decode("utf-8"))
+            if index.get("version") != VERSION:
+                raise ValueError(f"Versão de replay não suportada: {index.get('version')}")
+            return index["frames"]
+
+        # Sem índice: percorre os quadros completos
+        frames = []
+        offset = len(MAGIC)
+        while offset + 4 <= size:
+            try:
+                header, end = self._read_header(offset)
+            except ValueError:
+                break
+            if end > size:
+                break
+            frames.append([header["tick"], offset, header["keyframe"]])
+            offset = end
+        return frames
+
+    def _read_header(self, offset):
+        # Retorna o cabeçalho do quadro e a posição do fim do quadro
+        (header_size,) = struct.unpack("<I", bytes(self.buffer[offset:offset + 4]))
+        start = offset + 4
+        header = json.loads(bytes(self.buffer[start:start + header_size]).decode("utf-8"))
+        end = start + header_size
+        for _, descr, shape in header["arrays"]:
+            end += np.lib.format.descr_to_dtype(descr).itemsize * int(np.prod(shape, dtype=np.int64))
+        return header, end
+
+    def read_frame(self, index):
+        """
+        Lê um quadro (os arrays são vistas do arquivo mapeado, sem cópia).
+
+        Returns:
+            tuple: (cabeçalho, dicionário de arrays).
+        """
+        offset = self.frames[index][1]
+        (header_size,) = struct.unpack("<I", bytes(self.buffer[offset:offset + 4]))
+        position = offset + 4
+        header = json.loads(bytes(self.buffer[position:position + header_size]).decode("utf-8"))
+        position += header_size
+
+        arrays = {}
+        for name, descr, shape in header.pop("arrays"):
+            dtype = np.lib.format.descr_to_dtype(descr)
+            shape = tuple(shape)
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=self.buffer, offset=position)
+            position += dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        return header, arrays
+
+    def seek(self, tick):
+        """
+        Vai para o último quadro até o tick (ou o primeiro quadro, se o tick for anterior).
+
+        Returns:
+            ReplayState: O estado no quadro.
+        """
+        return self.seek_frame(max(0, bisect.bisect_right(self.ticks, tick) - 1))
+
+    def seek_frame(self, index):
+        """
+        Vai para um quadro pelo índice (limitado aos quadros existentes).
+
+        Returns:
+            ReplayState: O estado no quadro.
+        """
+        index = min(max(0, index), len(self.frames) - 1)
+        keyframe = self.keyframes[bisect.bisect_right(self.keyframes, index) - 1]
+
+        # Continua do estado atual se ele está entre o quadro-chave e o destino
+        if self.state is None or not keyframe <= self.frame <= index:
+            header, arrays = self.read_frame(keyframe)
+            self.state = ReplayState(header, arrays)
+            self.frame = keyframe
+
+        while self.frame < index:
+            self.frame += 1
+            header, arrays = self.read_frame(self.frame)
+            self.state.apply_delta(header, arrays)
+
+        self.state.finish()
+        return self.state
+
+    def advance(self, count=1):
+        """
+        Avança count quadros a partir do atual.
+
+        Returns:
+            ReplayState: O estado no novo quadro.
+        """
+        return self.seek_frame((self.frame or 0) + count)
+
+    def at_end(self):
+        """
+        Retorna True se o estado atual é o último quadro.
+        """
+        return self.frame == len(self.frames) - 1
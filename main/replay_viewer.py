@@ -0,0 +1,147 @@
+import argparse
+import time
+
+import pygame
+
+from global_var import GlobalVar
+from renderer import Renderer
+from replay import ReplayReader
+
+class ReplayViewer:
+    """
+    Reprodutor de replays: desenha os quadros gravados com o Renderer (sem executar Environment.update).
+
+    Controles: espaço (pausa), seta direita / S (avança um tick), seta esquerda (volta um tick), Page Up / Page Down
+    (volta / avança 1000 ticks), Home (início), 1 / 2 / 3 / 0 (1x, 10x, 100x, máxima) e clique na barra de progresso
+    (vai para o ponto clicado).
+
+    Atributos:
+        reader: Leitor do replay.
+        renderer: Exibe os quadros na tela.
+        state: Estado do quadro atual.
+        running: Se o reprodutor está em execução.
+        paused: Se a reprodução está pausada.
+        ticks_per_frame: Ticks avançados por quadro da tela (None = velocidade máxima).
+        render_time: Tempo (em segundos) gasto no último desenho da tela.
+
+    Métodos:
+        run(): Executa o loop da reprodução.
+        handle_command(command, value): Aplica um comando de controle (pausa, passo, velocidade, busca).
+        seek(tick): Vai para um tick.
+        step_frame(): Avança os ticks de um quadro da tela.
+        speed_label(): Retorna a descrição da velocidade atual.
+    """
+    def __init__(self, path):
+        """
+        Abre o replay e cria o sistema de renderização.
+
+        Parameters:
+            path: Arquivo do replay.
+        """
+        self.reader = ReplayReader(path)
+        self.renderer = Renderer()
+        self.state = self.reader.seek_frame(0)
+        self.running = True
+        self.paused = False
+        self.ticks_per_frame = 1
+        self.render_time = 0.0
+
+    def run(self):
+        """
+        Executa o loop da reprodução até a janela ser fechada.
+        """
+        reader = self.reader
+        while self.running:
+            if not self.renderer.check_quit():
+                self.running = False
+                break
+
+            for command, value in self.renderer.poll_commands():
+                self.handle_command(command, value)
+
+            self.step_frame()
+
+            duration = max(1, reader.last_tick - reader.first_tick)
+            self.renderer.progress = (self.state.tick - reader.first_tick) / duration
+            self.renderer.status_texts = [
+                f"Replay: tick {self.state.tick} / {reader.last_tick} ({self.speed_label()})"
+            ]
+            start = time.perf_counter()
+            self.renderer.render(self.state)
+            self.render_time = time.perf_counter() - start
+
+        pygame.quit()
+
+    def handle_command(self, command, value):
+        """
+        Aplica um comando de controle.
+
+        Parameters:
+            command: "pause", "step", "speed", "seek" (value = ticks relativos, None = início) ou "click" (value =
+                posição na tela).
+            value: Valor do comando.
+        """
+        if command == "pause":
+            self.paused = not self.paused
+        elif command == "step":
+            self.paused = True
+            self.state = self.reader.advance(1)
+        elif command == "speed":
+            self.ticks_per_frame = value
+            self.paused = False
+        elif command == "seek":
+            self.seek(self.reader.first_tick if value is None else self.state.tick + value)
+        elif command == "click":
+            fraction = self.renderer.progress_fraction(value)
+            if fraction is not None:
+                reader = self.reader
+                self.seek(reader.first_tick + round(fraction * (reader.last_tick - reader.first_tick)))
+
+    def seek(self, tick):
+        """
+        Vai para um tick (o último quadro gravado até ele).
+        """
+        self.state = self.reader.seek(tick)
+
+    def step_frame(self):
+        """
+        Avança os ticks de um quadro da tela conforme a velocidade atual (pausa no fim do replay).
+        """
+        reader = self.reader
+        if self.paused:
+            return
+        if reader.at_end():
+            self.paused = True
+            return
+
+        if self.ticks_per_frame is None:
+            # Velocidade máxima: avança em lotes até esgotar o orçamento do quadro
+            frame_time = 1.0 / GlobalVar.FPS
+            deadline = time.perf_counter() + max(frame_time * GlobalVar.SIM_MIN_BUDGET_FRACTION,
+                                                 frame_time - self.render_time)
+            while not reader.at_end() and time.perf_counter() < deadline:
+                self.state = reader.advance(10)
+        else:
+            self.state = reader.advance(self.ticks_per_frame)
+
+        if reader.at_end():
+            self.paused = True
+
+    def speed_label(self):
+        """
+        Retorna a descrição da velocidade atual.
+        """
+        if self.paused:
+            return "pausado"
+        if self.ticks_per_frame is None:
+            return "máxima"
+        return f"{self.ticks_per_frame}x"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz um replay gravado da simulação.")
+    parser.add_argument("replay", help="Arquivo do replay.")
+    args = parser.parse_args(argv)
+    ReplayViewer(args.replay).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import random
+
+from global_var import GlobalVar
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Constantes do SplitMix64
+MASK = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+TO_UNIT = 1.0 / (1 << 53)
+
+# Identificadores das sequências (as formigas usam FIRST_ANT_STREAM em diante)
+ENVIRONMENT_STREAM = 0
+COLONY_STREAM = 1
+FIRST_ANT_STREAM = 2
+
+# Tamanho a partir do qual os blocos são gerados com NumPy
+NUMPY_BLOCK_THRESHOLD = 32
+
+def mix64(z):
+    """
+    Função de mistura do SplitMix64 (inteiro de 64 bits).
+    """
+    z = ((z ^ (z >> 30)) * MIX_1) & MASK
+    z = ((z ^ (z >> 27)) * MIX_2) & MASK
+    return z ^ (z >> 31)
+
+def stream_key(seed, stream_id):
+    """
+    Retorna a chave de uma sequência (depende só da semente e do identificador da sequência).
+    """
+    return mix64((mix64(seed & MASK) + stream_id * GOLDEN_GAMMA) & MASK)
+
+def counter_random(key, counter):
+    """
+    Retorna o número aleatório (float em [0, 1)) da posição counter da sequência key. O valor é calculado direto da
+    posição (gerador baseado em contador), então não depende de quantos números as outras sequências já usaram.
+    """
+    return (mix64((key + (counter + 1) * GOLDEN_GAMMA) & MASK) >> 11) * TO_UNIT
+
+def counter_random_block(key, start, count):
+    """
+    Retorna os números das posições start até start + count - 1 da sequência key (com NumPy em blocos maiores; o
+    resultado é idêntico ao de counter_random).
+
+    Returns:
+        list: Os números gerados.
+    """
+    if np is None or count < NUMPY_BLOCK_THRESHOLD:
+        return [counter_random(key, counter) for counter in range(start, start + count)]
+
+    z = np.arange(start + 1, start + count + 1, dtype=np.uint64)
+    z *= _GOLDEN_GAMMA
+    z += np.uint64(key)
+    return _mix_to_unit(z).tolist()
+
+def counter_random_array(keys, counters):
+    """
+    Versão vetorizada de counter_random: um número para cada par (chave, posição) dos arrays uint64.
+
+    Returns:
+        ndarray: Os números gerados (float64).
+    """
+    z = counters + np.uint64(1)
+    z *= _GOLDEN_GAMMA
+    z += keys
+    return _mix_to_unit(z)
+
+def _mix_to_unit(z):
+    # mix64 aplicado no próprio array (uint64) e conversão para float em [0, 1)
+    z ^= z >> _SHIFT_30
+    z *= _MIX_1
+    z ^= z >> _SHIFT_27
+    z *= _MIX_2
+    z ^= z >> _SHIFT_31
+    z >>= _SHIFT_11
+    return z.astype(np.float64) * TO_UNIT
+
+if np is not None:
+    _GOLDEN_GAMMA, _MIX_1, _MIX_2 = np.uint64(GOLDEN_GAMMA), np.uint64(MIX_1), np.uint64(MIX_2)
+    _SHIFT_11, _SHIFT_27, _SHIFT_30, _SHIFT_31 = np.uint64(11), np.uint64(27), np.uint64(30), np.uint64(31)
+
+class RandomStream:
+    """
+    Sequência independente de números aleatórios (uma por formiga, uma da colônia e uma do ambiente). Os números são
+    calculados a partir da semente, do identificador da sequência e da posição, e entregues a partir de blocos
+    pré-gerados. Tem a mesma interface que o módulo random para os métodos usados na simulação.
+
+    Atributos:
+        stream_id: Identificador da sequência.
+        key: Chave da sequência (derivada da semente e do identificador).
+        position: Posição do próximo número da sequência.
+
+    Métodos:
+        seek(position): Muda a posição do próximo número.
+        random(): Retorna um float em [0, 1).
+        uniform(a, b): Retorna um float entre a e b.
+        randint(a, b): Retorna um inteiro entre a e b (inclusive).
+        choice(seq): Escolhe um elemento da sequência.
+        sample(population, k): Escolhe k elementos distintos da população.
+        random_array(shape): Retorna um array NumPy com os próximos números da sequência.
+    """
+    def __init__(self, seed, stream_id, block_size=None):
+        """
+        Construtor da sequência.
+
+        Parameters:
+            seed: Semente da simulação.
+            stream_id: Identificador da sequência.
+            block_size (opcional): Tamanho máximo dos blocos pré-gerados (padrão = GlobalVar.RANDOM_BLOCK_SIZE).
+        """
+        self.stream_id = stream_id
+        self.key = stream_key(seed, stream_id)
+        self.max_block_size = block_size or GlobalVar.RANDOM_BLOCK_SIZE
+
+        # Os blocos começam pequenos e dobram até o máximo (formigas que usam poucos números ocupam pouca memória)
+        self._block_size = 4
+        self._block = []
+        self._block_start = 0
+        self._index = 0
+
+    @property
+    def position(self):
+        """
+        Retorna a posição do próximo número da sequência.
+        """
+        return self._block_start + self._index
+
+    def seek(self, position):
+        """
+        Muda a posição do próximo número da sequência (usado pelo motor vetorizado, que gera os números em lote).
+        """
+        if position != self.position:
+            self._block = []
+            self._block_start = position
+            self._index = 0
+
+    def _refill(self):
+        start = self.position
+        self._block = counter_random_block(self.key, start, self._block_size)
+        self._block_start = start
+        self._index = 0
+        self._block_size = min(self._block_size * 2, self.max_block_size)
+
+    def random(self):
+        """
+        Retorna um float em [0, 1).
+        """
+        index = self._index
+        if index >= len(self._block):
+            self._refill()
+            index = 0
+        self._index = index + 1
+        return self._block[index]
+
+    def uniform(self, a, b):
+        """
+        Retorna um float entre a e b.
+        """
+        # Mesmo código de random() (evita uma chamada no caminho mais usado)
+        index = self._index
+        if index >= len(self._block):
+            self._refill()
+            index = 0
+        self._index = index + 1
+        return a + (b - a) * self._block[index]
+
+    def randint(self, a, b):
+        """
+        Retorna um inteiro entre a e b (inclusive).
+        """
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        """
+        Escolhe um elemento da sequência.
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def sample(self, population, k):
+        """
+        Escolhe k elementos distintos da população (ordem da escolha).
+        """
+        n = len(population)
+        if k > n:
+            raise ValueError("A amostra é maior que a população.")
+
+        if 2 * k > n:
+            # Embaralhamento parcial (Fisher-Yates) quando a amostra é grande
+            pool = list(population)
+            for i in range(k):
+                j = i + int(self.random() * (n - i))
+                pool[i], pool[j] = pool[j], pool[i]
+            return pool[:k]
+
+        chosen = []
+        selected = set()
+        while len(chosen) < k:
+            index = int(self.random() * n)
+            if index not in selected:
+                selected.add(index)
+                chosen.append(population[index])
+        return chosen
+
+    def random_array(self, shape):
+        """
+        Retorna um array NumPy com os próximos números da sequência (os mesmos que random() retornaria um a um), gerados
+        de uma vez. Usado nas operações em lote do algoritmo genético.
+
+        Parameters:
+            shape: Formato do array (inteiro ou tupla).
+
+        Returns:
+            ndarray: Os números gerados (float64).
+        """
+        count = int(np.prod(shape))
+        start = self.position
+        values = counter_random_array(
+            np.full(count, self.key, dtype=np.uint64), np.arange(start, start + count, dtype=np.uint64)
+        )
+        self.seek(start + count)
+        return values.reshape(shape)
+
+class RandomStreams:
+    """
+    Fábrica das sequências aleatórias da simulação. Com a mesma semente, cada sequência produz sempre os mesmos números,
+    independente da ordem de atualização das formigas ou de como a população é dividida.
+
+    Atributos:
+        seed: Semente da simulação.
+
+    Métodos:
+        stream(stream_id): Cria a sequência de um identificador.
+    """
+    def __init__(self, seed=None):
+        """
+        Construtor da fábrica.
+
+        Parameters:
+            seed (opcional): Semente da simulação (None = sorteada com o módulo random).
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+
+    def stream(self, stream_id):
+        """
+        Cria a sequência de um identificador.
+
+        Returns:
+            RandomStream: A sequência criada.
+        """
+        return RandomStream(self.seed, stream_id)
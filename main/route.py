@@ -0,0 +1,174 @@
+import math
+from array import array
+
+class ReturnRoute:
+    """
+    Rota de retorno compacta da formiga. Os pontos registrados a cada passo são guardados em um buffer pré-alocado
+    (array de floats) como trechos retos com espaçamento constante: (início x, início y, passo x, passo y, quantidade).
+    Como o retorno para a colônia é uma reta, uma rota inteira normalmente ocupa um único trecho.
+
+    Atributos:
+        buffer: Array com os trechos (5 valores por trecho).
+        runs: Quantidade de trechos em uso no buffer.
+        tolerance: Diferença máxima para considerar um ponto como continuação do trecho atual.
+
+    Métodos:
+        append(x, y): Registra um ponto da rota.
+        set_line(start_x, start_y, step_x, step_y, count): Substitui a rota por um único trecho reto.
+        clear(): Esvazia a rota (mantém o buffer alocado).
+        first(): Retorna o primeiro ponto da rota.
+        points(): Retorna todos os pontos registrados.
+        resample(spacing): Retorna pontos com espaçamento fixo ao longo da rota.
+    """
+    RUN_SIZE = 5
+
+    def __init__(self, capacity=4, tolerance=1e-6):
+        """
+        Construtor da rota.
+
+        Parameters:
+            capacity (opcional): Quantidade inicial de trechos pré-alocados.
+            tolerance (opcional): Diferença máxima (em pixels) para um ponto continuar o trecho atual.
+        """
+        self.buffer = array('d', bytes(8 * self.RUN_SIZE * capacity))
+        self.runs = 0
+        self.tolerance = tolerance
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __iter__(self):
+        return iter(self.points())
+
+    def _new_run(self, x, y):
+        """
+        Abre um novo trecho começando no ponto (aumenta o buffer se necessário).
+        """
+        offset = self.runs * self.RUN_SIZE
+        if offset + self.RUN_SIZE > len(self.buffer):
+            self.buffer.extend(array('d', bytes(8 * max(len(self.buffer), self.RUN_SIZE))))
+
+        self.buffer[offset:offset + self.RUN_SIZE] = array('d', (x, y, 0.0, 0.0, 1.0))
+        self.runs += 1
+
+    def append(self, x, y):
+        """
+        Registra um ponto da rota. Se o ponto continua o trecho atual (mesma direção e espaçamento) apenas o contador
+        do trecho é incrementado.
+
+        Parameters:
+            x, y: Coordenadas do ponto.
+        """
+        self._length += 1
+        if self.runs == 0:
+            self._new_run(x, y)
+            return
+
+        buffer = self.buffer
+        offset = (self.runs - 1) * self.RUN_SIZE
+        start_x, start_y, step_x, step_y, count = buffer[offset:offset + self.RUN_SIZE]
+
+        if count == 1:
+            # Segundo ponto do trecho define o passo
+            buffer[offset + 2] = x - start_x
+            buffer[offset + 3] = y - start_y
+            buffer[offset + 4] = 2.0
+            return
+
+        expected_x = start_x + count * step_x
+        expected_y = start_y + count * step_y
+        if abs(x - expected_x) <= self.tolerance and abs(y - expected_y) <= self.tolerance:
+            buffer[offset + 4] = count + 1
+        else:
+            self._new_run(x, y)
+
+    def set_line(self, start_x, start_y, step_x, step_y, count):
+        """
+        Substitui a rota por um único trecho reto.
+
+        Parameters:
+            start_x, start_y: Primeiro ponto do trecho.
+            step_x, step_y: Deslocamento entre pontos consecutivos.
+            count: Quantidade de pontos.
+        """
+        self.clear()
+        if count <= 0:
+            return
+
+        self._new_run(start_x, start_y)
+        self.buffer[2] = step_x
+        self.buffer[3] = step_y
+        self.buffer[4] = count
+        self._length = count
+
+    def clear(self):
+        """
+        Esvazia a rota mantendo o buffer alocado.
+        """
+        self.runs = 0
+        self._length = 0
+
+    def first(self):
+        """
+        Retorna o primeiro ponto (x, y) da rota ou None se estiver vazia.
+        """
+        if self.runs == 0:
+            return None
+        return (self.buffer[0], self.buffer[1])
+
+    def points(self):
+        """
+        Retorna todos os pontos registrados na rota.
+
+        Returns:
+            list: Pontos (x, y) na ordem em que foram registrados.
+        """
+        points = []
+        buffer = self.buffer
+        for run in range(self.runs):
+            offset = run * self.RUN_SIZE
+            start_x, start_y, step_x, step_y, count = buffer[offset:offset + self.RUN_SIZE]
+            points.extend((start_x + k * step_x, start_y + k * step_y) for k in range(int(count)))
+        return points
+
+    def resample(self, spacing):
+        """
+        Retorna pontos com espaçamento fixo ao longo da rota (a forma da trilha é mantida, mas com menos pontos quando
+        o espaçamento é maior que o passo da formiga).
+
+        Parameters:
+            spacing: Distância (em pixels) entre pontos consecutivos.
+
+        Returns:
+            list: Pontos (x, y) começando no primeiro ponto da rota.
+        """
+        vertices = []
+        buffer = self.buffer
+        for run in range(self.runs):
+            offset = run * self.RUN_SIZE
+            start_x, start_y, step_x, step_y, count = buffer[offset:offset + self.RUN_SIZE]
+            vertices.append((start_x, start_y))
+            if count > 1:
+                vertices.append((start_x + (count - 1) * step_x, start_y + (count - 1) * step_y))
+
+        if not vertices:
+            return []
+
+        points = [vertices[0]]
+        carried = 0.0  # Distância percorrida desde o último ponto gerado
+        for (x0, y0), (x1, y1) in zip(vertices, vertices[1:]):
+            length = math.sqrt((x1 - x0)**2 + (y1 - y0)**2)
+            if length == 0:
+                continue
+
+            position = spacing - carried
+            while position <= length:
+                t = position / length
+                points.append((x0 + t * (x1 - x0), y0 + t * (y1 - y0)))
+                position += spacing
+            carried = length - (position - spacing)
+        return points
@@ -1,19 +1,37 @@
+import time
+
 import pygame
 
 from environment import Environment
+from global_var import GlobalVar
 from renderer import Renderer
 
 class Simulation:
     """
     Classe da similução, ela integra o environment com o renderer e controla a execução  da simulação.
 
+    A simulação usa passo fixo desacoplado da renderização: a cada quadro são executados N ticks do environment. N é
+    escolhido pelo teclado (1x, 10x, 100x) ou, na velocidade máxima, ajustado automaticamente para caber no orçamento
+    de tempo do quadro (1 / FPS menos o tempo gasto desenhando).
+
     Atributos:
         environment: Representa o ambiente da simulação (contêm informações sobre a colônia, fontes de comida e feromônios).
         renderer: Exibe os elementos na tela.
         running: Se a simulação está ou não em execução.
+        paused: Se a simulação está pausada.
+        ticks_per_frame: Ticks executados por quadro (None = velocidade máxima).
+        pending_steps: Ticks a serem executados enquanto pausada (passo único).
+        last_frame_ticks: Quantidade de ticks executados no último quadro.
+        render_time: Tempo (em segundos) gasto no último desenho da tela.
+        replay: Gravador do replay (None quando GlobalVar.REPLAY_OUTPUT não está definido).
+        metrics: Servidor de métricas e controle (None quando GlobalVar.METRICS_PORT não está definido).
 
     Métodos:
         run(): Executa o loop da simulação.
+        handle_command(command, value): Aplica um comando de controle (pausa, passo, velocidade, snapshot).
+        step_frame(): Executa os ticks de um quadro.
+        frame_budget(): Retorna o tempo disponível para os ticks do quadro.
+        speed_label(): Retorna a descrição da velocidade atual.
     """
     def __init__(self):
         """
@@ -22,20 +40,121 @@ class Simulation:
         self.environment = Environment()
         self.renderer = Renderer()
         self.running = True
-    
+
+        self.paused = False
+        self.ticks_per_frame = 1
+        self.pending_steps = 0
+        self.last_frame_ticks = 0
+        self.render_time = 0.0
+
+        self.replay = None
+        if GlobalVar.REPLAY_OUTPUT:
+            from replay import ReplayRecorder
+            self.replay = ReplayRecorder(GlobalVar.REPLAY_OUTPUT).attach(self.environment)
+
+        self.metrics = None
+        if GlobalVar.METRICS_PORT is not None:
+            from metrics_server import MetricsServer
+            self.metrics = MetricsServer().attach(self.environment)
+
     def run(self):
         """
-        Executa o loop principal e verifica se o programa deve encerrar, atualiza o estado 
+        Executa o loop principal e verifica se o programa deve encerrar, atualiza o estado
         do ambiente (movimento das formigas, evolução, etc.) e fica renderizando a tela.
         """
         while self.running:
             is_quit = self.renderer.check_quit()
-            
+
             if is_quit == False:
                 self.running = False
             else:
-                self.environment.update()
+                commands = self.renderer.poll_commands()
+                if self.metrics is not None:
+                    commands += self.metrics.poll_commands()
+                for command, value in commands:
+                    self.handle_command(command, value)
+
+                self.step_frame()
+
+                self.renderer.status_texts = [f"Velocidade: {self.speed_label()} ({self.last_frame_ticks} ticks/quadro)"]
+                start = time.perf_counter()
                 self.renderer.render(self.environment)
-        
+                self.render_time = time.perf_counter() - start
+
+        if self.replay is not None:
+            self.replay.close()
+        if self.metrics is not None:
+            self.metrics.close()
+        self.environment.close()
         pygame.quit()
 
+    def handle_command(self, command, value):
+        """
+        Aplica um comando de controle.
+
+        Parameters:
+            command: "pause" (alterna a pausa), "step" (ticks enquanto pausada), "speed" (ticks por quadro),
+                "snapshot" (checkpoint pelo servidor de métricas) ou "obstacle" (adiciona/remove obstáculos).
+            value: Para "pause", True / False (None = alterna); para "step", a quantidade de ticks (None = 1); para
+                "speed", a quantidade de ticks por quadro (None = velocidade máxima); para "snapshot", o arquivo; para
+                "obstacle", a posição no mundo e se bloqueia (True) ou libera (False).
+        """
+        if command == "pause":
+            self.paused = not self.paused if value is None else value
+        elif command == "step":
+            self.paused = True
+            self.pending_steps += value or 1
+        elif command == "speed":
+            self.ticks_per_frame = value
+            self.paused = False
+        elif command == "snapshot" and self.metrics is not None:
+            self.metrics.snapshot(self.environment, value)
+        elif command == "obstacle":
+            position, blocked = value
+            self.environment.edit_obstacles(position, blocked=blocked)
+        if self.metrics is not None:
+            self.metrics.set_status(paused=self.paused, speed=self.ticks_per_frame)
+
+    def step_frame(self):
+        """
+        Executa os ticks de um quadro conforme a velocidade atual.
+        """
+        ticks = 0
+
+        if self.paused:
+            while self.pending_steps > 0:
+                self.environment.update()
+                self.pending_steps -= 1
+                ticks += 1
+        elif self.ticks_per_frame is None:
+            # Velocidade máxima: executa ticks até esgotar o orçamento do quadro (pelo menos um)
+            deadline = time.perf_counter() + self.frame_budget()
+            while True:
+                self.environment.update()
+                ticks += 1
+                if time.perf_counter() >= deadline:
+                    break
+        else:
+            for _ in range(self.ticks_per_frame):
+                self.environment.update()
+            ticks = self.ticks_per_frame
+
+        self.last_frame_ticks = ticks
+
+    def frame_budget(self):
+        """
+        Retorna o tempo (em segundos) disponível para a simulação no quadro: a duração de um quadro menos o tempo do
+        último desenho (com um mínimo para a simulação sempre avançar).
+        """
+        frame_time = 1.0 / GlobalVar.FPS
+        return max(frame_time * GlobalVar.SIM_MIN_BUDGET_FRACTION, frame_time - self.render_time)
+
+    def speed_label(self):
+        """
+        Retorna a descrição da velocidade atual.
+        """
+        if self.paused:
+            return "pausada"
+        if self.ticks_per_frame is None:
+            return "máxima"
+        return f"{self.ticks_per_frame}x"
@@ -0,0 +1,265 @@
+import math
+
+class SpatialHash:
+    """
+    Índice espacial de grade uniforme. O espaço é dividido em células quadradas e cada item é guardado na célula que
+    contém sua posição, assim as buscas por alcance só visitam as células que cobrem o raio de busca.
+
+    Cada item recebe um número de ordem de inserção, usado para desempatar resultados da mesma forma que uma busca
+    linear na lista original (o primeiro inserido vence).
+
+    Atributos:
+        cell_size: Tamanho (em pixels) do lado de cada célula.
+        cells: Dicionário {(cx, cy): {item: ordem}} com os itens de cada célula.
+        item_cells: Dicionário {item: (cx, cy)} com a célula de cada item.
+
+    Métodos:
+        cell_of(position): Retorna a célula que contém a posição.
+        insert(item, position): Adiciona um item ao índice.
+        remove(item): Remove um item do índice.
+        clear(): Remove todos os itens.
+        order(item): Retorna o número de ordem de inserção do item.
+        query(position, radius): Retorna os itens das células que cobrem o círculo (candidatos).
+        within(position, radius): Retorna os itens dentro do raio.
+        query_rect(left, top, right, bottom): Retorna os itens dentro de um retângulo.
+        nearest(position, max_distance): Retorna o item mais próximo da posição.
+    """
+    def __init__(self, cell_size):
+        """
+        Construtor do índice espacial.
+
+        Parameters:
+            cell_size: Tamanho (em pixels) do lado de cada célula.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def cell_of(self, position):
+        """
+        Retorna a célula (cx, cy) que contém a posição.
+
+        Parameters:
+            position: Coordenadas (x, y).
+        """
+        return (math.floor(position[0] / self.cell_size), math.floor(position[1] / self.cell_size))
+
+    def insert(self, item, position):
+        """
+        Adiciona um item ao índice na célula da posição.
+
+        Parameters:
+            item: Objeto a ser indexado (precisa ser hashable).
+            position: Coordenadas (x, y) do item.
+        """
+        cell = self.cell_of(position)
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = {}
+
+        bucket[item] = self._next_order
+        self.item_cells[item] = cell
+        self._next_order += 1
+
+    def remove(self, item):
+        """
+        Remove um item do índice (sem efeito se o item não estiver indexado).
+
+        Parameters:
+            item: Objeto a ser removido.
+        """
+        cell = self.item_cells.pop(item, None)
+        if cell is None:
+            return
+
+        bucket = self.cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self.cells[cell]
+
+    def clear(self):
+        """
+        Remove todos os itens do índice.
+        """
+        self.cells.clear()
+        self.item_cells.clear()
+
+    def order(self, item):
+        """
+        Retorna o número de ordem de inserção do item.
+        """
+        return self.cells[self.item_cells[item]][item]
+
+    def query(self, position, radius):
+        """
+        Retorna os itens das células que cobrem o círculo de busca. O resultado é um superconjunto dos itens dentro do
+        raio, a distância exata deve ser verificada por quem chama.
+
+        Parameters:
+            position: Centro (x, y) da busca.
+            radius: Raio da busca.
+
+        Returns:
+            list: Pares (item, ordem) dos itens candidatos.
+        """
+        x, y = position
+        min_cx = math.floor((x - radius) / self.cell_size)
+        max_cx = math.floor((x + radius) / self.cell_size)
+        min_cy = math.floor((y - radius) / self.cell_size)
+        max_cy = math.floor((y + radius) / self.cell_size)
+
+        candidates = []
+        cells = self.cells
+        # Evita percorrer células vazias quando o raio cobre mais células do que existem ocupadas
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            for (cx, cy), bucket in cells.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                    candidates.extend(bucket.items())
+            return candidates
+
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket.items())
+        return candidates
+
+    def within(self, position, radius):
+        """
+        Retorna os itens cuja posição está dentro do raio (distância <= raio), em ordem de inserção.
+
+        Parameters:
+            position: Centro (x, y) da busca.
+            radius: Raio da busca.
+
+        Returns:
+            list: Itens dentro do raio.
+        """
+        x, y = position
+        found = []
+        for item, order in self.query(position, radius):
+            item_x, item_y = item.position
+            if math.sqrt((item_x - x)**2 + (item_y - y)**2) <= radius:
+                found.append((order, item))
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
+
+    def query_rect(self, left, top, right, bottom):
+        """
+        Retorna os itens cuja posição está dentro do retângulo (usado para desenhar só o que está visível), em ordem de
+        inserção.
+
+        Parameters:
+            left, top, right, bottom: Limites do retângulo.
+
+        Returns:
+            list: Itens dentro do retângulo.
+        """
+        min_cx = math.floor(left / self.cell_size)
+        max_cx = math.floor(right / self.cell_size)
+        min_cy = math.floor(top / self.cell_size)
+        max_cy = math.floor(bottom / self.cell_size)
+
+        cells = self.cells
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            buckets = [
+                bucket for (cx, cy), bucket in cells.items() if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+            ]
+        else:
+            buckets = [cells[cell] for cell in (
+                (cx, cy) for cx in range(min_cx, max_cx + 1) for cy in range(min_cy, max_cy + 1)
+            ) if cell in cells]
+
+        found = []
+        for bucket in buckets:
+            for item, order in bucket.items():
+                x, y = item.position
+                if left <= x <= right and top <= y <= bottom:
+                    found.append((order, item))
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
+
+    def nearest(self, position, max_distance=None):
+        """
+        Retorna o item mais próximo da posição. A busca percorre anéis de células ao redor da posição e para assim que
+        nenhuma célula ainda não visitada pode conter um item mais próximo. Os itens precisam ter o atributo position.
+
+        Parameters:
+            position: Centro (x, y) da busca.
+            max_distance (opcional): Distância máxima considerada (None = sem limite).
+
+        Returns:
+            O item mais próximo (o mais antigo em caso de empate) ou None se nenhum for encontrado.
+        """
+        if not self.item_cells:
+            return None
+
+        if max_distance is not None:
+            candidates = self.query(position, max_distance)
+            best = self._closest(position, candidates)
+            if best is not None and best[1] <= max_distance:
+                return best[0]
+            return None
+
+        center_x, center_y = self.cell_of(position)
+        best = None
+        ring = 0
+        while True:
+            # Anel maior que o número de células ocupadas: é mais barato percorrer todas as células
+            if 8 * ring > len(self.cells):
+                candidates = []
+                for bucket in self.cells.values():
+                    candidates.extend(bucket.items())
+                best = self._closest(position, candidates)
+                return best[0]
+
+            candidates = []
+            for cell in self._ring_cells(center_x, center_y, ring):
+                bucket = self.cells.get(cell)
+                if bucket:
+                    candidates.extend(bucket.items())
+
+            ring_best = self._closest(position, candidates)
+            if ring_best is not None and (best is None or ring_best[1:] < best[1:]):
+                best = ring_best
+
+            # Itens fora dos anéis visitados estão a pelo menos ring * cell_size de distância
+            if best is not None and best[1] < ring * self.cell_size:
+                return best[0]
+            ring += 1
+
+    def _ring_cells(self, center_x, center_y, ring):
+        """
+        Retorna as células na borda do quadrado de raio ring (em células) ao redor da célula central.
+        """
+        if ring == 0:
+            return [(center_x, center_y)]
+
+        cells = []
+        for cx in range(center_x - ring, center_x + ring + 1):
+            cells.append((cx, center_y - ring))
+            cells.append((cx, center_y + ring))
+        for cy in range(center_y - ring + 1, center_y + ring):
+            cells.append((center_x - ring, cy))
+            cells.append((center_x + ring, cy))
+        return cells
+
+    def _closest(self, position, candidates):
+        """
+        Retorna (item, distância, ordem) do candidato mais próximo ou None se não houver candidatos.
+        """
+        x, y = position
+        best = None
+        for item, order in candidates:
+            item_x, item_y = item.position
+            distance = math.sqrt((item_x - x)**2 + (item_y - y)**2)
+            if best is None or distance < best[1] or (distance == best[1] and order < best[2]):
+                best = (item, distance, order)
+        return best
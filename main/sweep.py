@@ -0,0 +1,302 @@
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from global_var import GlobalVar
+from headless import HeadlessSimulation
+
+class ParameterSpec:
+    """
+    Valores possíveis de uma configuração do GlobalVar em uma varredura: uma lista de valores ("NOME=0.1,0.2,0.3") ou um
+    intervalo ("NOME=0.1:0.5", só para amostragem aleatória; inteiros se os dois limites forem inteiros).
+
+    Atributos:
+        name: Nome da configuração no GlobalVar.
+        values: Lista de valores (None para intervalos).
+        low, high: Limites do intervalo (None para listas de valores).
+
+    Métodos:
+        parse(text): Cria a especificação a partir do texto NOME=valores (classmethod).
+        sample(rng): Sorteia um valor.
+    """
+    def __init__(self, name, values=None, low=None, high=None):
+        """
+        Construtor da especificação.
+
+        Parameters:
+            name: Nome da configuração no GlobalVar.
+            values (opcional): Lista de valores.
+            low, high (opcional): Limites do intervalo.
+        """
+        if not hasattr(GlobalVar, name):
+            raise ValueError(f"Configuração desconhecida: {name}")
+        self.name = name
+        self.values = values
+        self.low = low
+        self.high = high
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Cria a especificação a partir do texto NOME=v1,v2,... ou NOME=mínimo:máximo (valores interpretados como JSON
+        quando possível).
+        """
+        name, _, values = text.partition("=")
+        if not values:
+            raise ValueError(f"Formato inválido (use NOME=v1,v2 ou NOME=min:max): {text}")
+
+        if ":" in values and "," not in values:
+            low, _, high = values.partition(":")
+            return cls(name, low=parse_value(low), high=parse_value(high))
+        return cls(name, values=[parse_value(value) for value in values.split(",")])
+
+    @property
+    def is_range(self):
+        return self.values is None
+
+    def sample(self, rng):
+        """
+        Sorteia um valor (da lista ou do intervalo).
+
+        Parameters:
+            rng: Gerador de números aleatórios (random.Random).
+        """
+        if not self.is_range:
+            return rng.choice(self.values)
+        if isinstance(self.low, int) and isinstance(self.high, int):
+            return rng.randint(self.low, self.high)
+        return rng.uniform(self.low, self.high)
+
+def parse_value(text):
+    """
+    Interpreta um valor como JSON quando possível (números, true/false, null), senão como texto.
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+def grid_configurations(specs):
+    """
+    Retorna todas as combinações (produto cartesiano) dos valores das especificações.
+
+    Returns:
+        list: Dicionários {nome: valor}.
+    """
+    ranges = [spec.name for spec in specs if spec.is_range]
+    if ranges:
+        raise ValueError(f"Intervalos só podem ser usados com amostragem aleatória (--samples): {', '.join(ranges)}")
+
+    names = [spec.name for spec in specs]
+    return [dict(zip(names, values)) for values in itertools.product(*(spec.values for spec in specs))]
+
+def random_configurations(specs, samples, seed=0):
+    """
+    Sorteia combinações de valores das especificações (reprodutível pela semente).
+
+    Returns:
+        list: Dicionários {nome: valor}.
+    """
+    rng = random.Random(seed)
+    return [{spec.name: spec.sample(rng) for spec in specs} for _ in range(samples)]
+
+def run_id(overrides, seed, max_ticks=None, max_generations=None, food_target=None):
+    """
+    Identificador estável de uma execução (configurações, semente e critérios de parada), usado para retomar varreduras
+    interrompidas. Execuções com critérios de parada diferentes não são confundidas.
+    """
+    key = json.dumps({
+        "overrides": overrides, "seed": seed,
+        "max_ticks": max_ticks, "max_generations": max_generations, "food_target": food_target,
+    }, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def run_configuration(job):
+    """
+    Executa uma simulação sem interface gráfica com as configurações do job (chamado nos processos do pool).
+
+    Parameters:
+        job: Dicionário com run_id, overrides, seed e os critérios de parada (max_ticks, max_generations, food_target).
+
+    Returns:
+        dict: Resultado da execução com as curvas por geração (generation_history) ou o erro.
+    """
+    result = {"run_id": job["run_id"], "overrides": job["overrides"], "seed": job["seed"]}
+    try:
+        settings = dict(job["overrides"], RANDOM_SEED=job["seed"], PRINT_STATISTICS=False)
+        with GlobalVar.override(**settings):
+            simulation = HeadlessSimulation(job["max_ticks"], job["max_generations"], job["food_target"])
+            simulation.run()
+    except Exception as error:
+        result["error"] = repr(error)
+        return result
+
+    environment = simulation.environment
+    result.update({
+        "ticks": simulation.ticks,
+        "elapsed": simulation.elapsed,
+        "generation": environment.colony.generation,
+        "total_food_collected": environment.total_food_collected,
+        "history": environment.colony.generation_history,
+    })
+    return result
+
+def load_results(path):
+    """
+    Lê os resultados já gravados (JSON lines). Linhas incompletas (execução interrompida na escrita) são ignoradas.
+
+    Returns:
+        list: Resultados lidos.
+    """
+    if not os.path.exists(path):
+        return []
+
+    results = []
+    with open(path) as file:
+        for line in file:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+def run_sweep(configurations, seeds, output_path, max_ticks=None, max_generations=None, food_target=None,
+              workers=None):
+    """
+    Executa todas as combinações de configurações e sementes em um pool de processos. Cada resultado é gravado no
+    arquivo (JSON lines) assim que termina; execuções já gravadas sem erro são puladas, então uma varredura
+    interrompida continua de onde parou.
+
+    Parameters:
+        configurations: Lista de dicionários {nome: valor}.
+        seeds: Sementes usadas em cada combinação.
+        output_path: Arquivo JSON lines dos resultados.
+        max_ticks, max_generations, food_target (opcional): Critérios de parada de cada execução.
+        workers (opcional): Quantidade de processos (padrão = quantidade de núcleos).
+
+    Returns:
+        list: Todos os resultados do arquivo (anteriores + novos).
+    """
+    done = {result["run_id"] for result in load_results(output_path) if "error" not in result}
+
+    jobs = []
+    for overrides in configurations:
+        for seed in seeds:
+            identifier = run_id(overrides, seed, max_ticks, max_generations, food_target)
+            if identifier in done:
+                continue
+            done.add(identifier)
+            jobs.append({
+                "run_id": identifier, "overrides": overrides, "seed": seed,
+                "max_ticks": max_ticks, "max_generations": max_generations, "food_target": food_target,
+            })
+
+    total = len(jobs)
+    print(f"{total} execuções pendentes ({len(configurations) * len(seeds) - total} já concluídas)")
+
+    if jobs:
+        with open(output_path, "a") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_configuration, job) for job in jobs]
+            for finished, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                file.write(json.dumps(result) + "\n")
+                file.flush()
+
+                status = result.get("error") or f"comida {result['total_food_collected']}, geração {result['generation']}"
+                print(f"[{finished}/{total}] {format_overrides(result['overrides'])} semente {result['seed']}: {status}")
+
+    return load_results(output_path)
+
+def format_overrides(overrides):
+    """
+    Formata as configurações de uma execução em uma linha.
+    """
+    return " ".join(f"{name}={value}" for name, value in sorted(overrides.items()))
+
+def write_table(results, path):
+    """
+    Grava as curvas por geração de todas as execuções em uma tabela CSV (uma linha por execução e geração).
+
+    Parameters:
+        results: Resultados da varredura.
+        path: Arquivo CSV de saída.
+    """
+    results = [result for result in results if "error" not in result]
+    parameters = sorted({name for result in results for name in result["overrides"]})
+    metrics = ["best_fitness", "food_collected", "avg_speed", "avg_sense", "avg_strength"]
+
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["run_id", "seed"] + parameters + ["generation"] + metrics)
+        for result in results:
+            prefix = [result["run_id"], result["seed"]] + [result["overrides"].get(name) for name in parameters]
+            for stats in result["history"]:
+                writer.writerow(prefix + [stats["generation"]] + [stats[metric] for metric in metrics])
+
+def summarize(results, top=10):
+    """
+    Imprime as melhores combinações pela média (entre as sementes) da comida coletada e do melhor fitness final.
+    """
+    groups = {}
+    for result in results:
+        if "error" in result:
+            continue
+        key = json.dumps(result["overrides"], sort_keys=True)
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key, runs in groups.items():
+        food = sum(run["total_food_collected"] for run in runs) / len(runs)
+        fitness = [run["history"][-1]["best_fitness"] for run in runs if run["history"]]
+        best_fitness = sum(fitness) / len(fitness) if fitness else 0.0
+        rows.append((food, best_fitness, len(runs), json.loads(key)))
+
+    rows.sort(key=lambda row: (row[0], row[1]), reverse=True)
+    for food, best_fitness, count, overrides in rows[:top]:
+        print(f"comida {food:.1f}, fitness {best_fitness:.2f} ({count} sementes): {format_overrides(overrides)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Varredura de configurações do GlobalVar em paralelo (simulações sem interface gráfica)."
+    )
+    parser.add_argument("params", nargs="+", metavar="NOME=VALORES",
+                        help="Valores de uma configuração: v1,v2,... (grade ou sorteio) ou min:max (só sorteio).")
+    parser.add_argument("--samples", type=int, help="Sorteia N combinações em vez de usar a grade completa.")
+    parser.add_argument("--sample-seed", type=int, default=0, help="Semente do sorteio das combinações.")
+    parser.add_argument("--seeds", type=int, default=1, help="Quantidade de sementes por combinação.")
+    parser.add_argument("--ticks", type=int, help="Quantidade máxima de ticks de cada execução.")
+    parser.add_argument("--generations", type=int, help="Geração a ser atingida em cada execução.")
+    parser.add_argument("--food", type=int, help="Quantidade de comida coletada a ser atingida em cada execução.")
+    parser.add_argument("--workers", type=int, help="Quantidade de processos (padrão = quantidade de núcleos).")
+    parser.add_argument("--output", default="sweep.jsonl", help="Arquivo JSON lines dos resultados (retomável).")
+    parser.add_argument("--table", metavar="ARQUIVO", help="Grava as curvas por geração em uma tabela CSV.")
+    args = parser.parse_args(argv)
+
+    if args.ticks is None and args.generations is None and args.food is None:
+        parser.error("informe --ticks, --generations ou --food")
+
+    try:
+        specs = [ParameterSpec.parse(text) for text in args.params]
+        if args.samples:
+            configurations = random_configurations(specs, args.samples, args.sample_seed)
+        else:
+            configurations = grid_configurations(specs)
+    except ValueError as error:
+        parser.error(str(error))
+
+    results = run_sweep(
+        configurations, list(range(args.seeds)), args.output,
+        args.ticks, args.generations, args.food, args.workers
+    )
+
+    if args.table:
+        write_table(results, args.table)
+    summarize(results)
+
+if __name__ == "__main__":
+    main()